@@ -1,24 +1,80 @@
 # -*- coding: utf-8 -*-
-from flask import Flask, render_template, request, redirect, url_for, session, jsonify
+from flask import Flask, render_template, request, redirect, url_for, session, jsonify, stream_with_context, g
+from flask import abort, send_from_directory
+from flask import before_render_template, template_rendered
+from flask.sessions import SecureCookieSessionInterface
+from werkzeug.exceptions import HTTPException
+from werkzeug.wsgi import ClosingIterator
+from markupsafe import Markup
+import click
 import pickle
 import numpy as np
 import os
+import sys
+import csv
+import io
+import json
+import hashlib
+import resource
+import secrets
+import sqlite3
+import tempfile
+import atexit
+import fcntl
+import re
+import mimetypes
+import bisect
+import math
+import numbers
+import functools
+import signal
+import gzip
+import time
+import threading
+import queue
 import warnings
 import traceback
+from collections import Counter, OrderedDict
+from contextlib import nullcontext
+from types import MappingProxyType
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
 warnings.filterwarnings('ignore')
 
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
 app = Flask(__name__)
 app.secret_key = 'vynox-secret-key'
 
-# Try to load the trained model
-try:
-    with open('PRS.pkl', 'rb') as f:
-        model = pickle.load(f)
-    print("✓ ML model loaded successfully")
-except Exception as e:
-    print(f"⚠ Warning: Could not load PRS.pkl: {e}")
-    print("⚠ Using overall score calculation instead")
-    model = None
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_PATH = os.environ.get('PRS_MODEL_PATH', os.path.join(BASE_DIR, 'PRS.pkl'))
+
+def read_model(path=MODEL_PATH):
+    """Unpickle a model file along with its version (content hash, mtime, size)"""
+    with open(path, 'rb') as f:
+        stat = os.fstat(f.fileno())
+        data = f.read()
+    version = {
+        'sha256': hashlib.sha256(data).hexdigest(),
+        'mtime': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(stat.st_mtime)),
+        'bytes': len(data),
+        'signature': [stat.st_mtime_ns, stat.st_size],
+        'loaded_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+    }
+    return pickle.loads(data), version
+
+def load_model(path=MODEL_PATH):
+    """The trained readiness model and its version, or (None, None) if it is unavailable"""
+    try:
+        loaded, version = read_model(path)
+        print("✓ ML model loaded successfully", file=sys.stderr)
+        return loaded, version
+    except Exception as e:
+        print(f"⚠ Warning: Could not load PRS.pkl: {e}", file=sys.stderr)
+        print("⚠ Using overall score calculation instead", file=sys.stderr)
+        return None, None
 
 # Domain information - All 8 domains
 DOMAINS = {
@@ -222,6 +278,142 @@ COMPANY_INFO = {
     'address': 'Tech Innovation Hub, Bangalore, India'
 }
 
+# Team members shown on the about page
+TEAM_MEMBERS = [
+    {
+        'name': 'Swathi',
+        'role': 'Team Lead',
+        'skills': 'Project Management, System Architecture, Leadership',
+        'bio': 'Oversees project execution and team coordination. Ensures seamless integration of all system components.',
+        'avatar': 'SW',
+        'color': '#8b5cf6'
+    },
+    {
+        'name': 'Santhosh',
+        'role': 'Creative Lead',
+        'skills': 'UI/UX Design, Brand Identity, Visual Design',
+        'bio': 'Designs intuitive user interfaces and creates engaging visual experiences. Focuses on user-centered design.',
+        'avatar': 'SA',
+        'color': '#10b981'
+    },
+    {
+        'name': 'Vishwa',
+        'role': 'Tech Lead',
+        'skills': 'Full-Stack Development, Technical Strategy, Code Quality',
+        'bio': 'Leads technical development and ensures code quality. Implements best practices and mentors team members.',
+        'avatar': 'VI',
+        'color': '#3b82f6'
+    }
+]
+
+# Optional versioned JSON file that replaces DOMAINS, PROJECT_SUGGESTIONS and
+# LEARNING_RESOURCES, so domains can be added without a code change. POST
+# /api/catalog/reload with PRS_ADMIN_TOKEN re-reads it in one worker, as long
+# as the domain keys stay the same.
+CATALOG_PATH = os.environ.get('PRS_CATALOG_PATH', '')
+CATALOG_VERSION = 1
+PREDICTION_KEYS = ('0', '1')
+DOMAIN_FIELDS = ('name', 'skills', 'description', 'levels', 'icon', 'color')
+LEVEL_KEYS = ('beginner', 'intermediate', 'advanced')
+RESOURCE_FIELDS = ('name', 'url', 'type')
+
+def load_content_tables(path):
+    """Read DOMAINS, PROJECT_SUGGESTIONS and LEARNING_RESOURCES from a catalog file"""
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    if data.get('version') != CATALOG_VERSION:
+        raise ValueError(f"Unsupported catalog version {data.get('version')!r} in {path}")
+    return data['domains'], data['project_suggestions'], data['learning_resources']
+
+def validate_content_tables(domains, project_suggestions, learning_resources):
+    """Raise ValueError listing every missing domain, prediction or field"""
+    problems = []
+    if '1' not in domains:
+        problems.append("domain '1' (the default domain) is missing")
+    for key, info in domains.items():
+        if not key.isdigit():
+            problems.append(f"domain key {key!r} must be numeric (it is a model feature)")
+        if not isinstance(info, dict):
+            problems.append(f"domain {key}: expected an object")
+        else:
+            problems += [f"domain {key}: missing '{field}'" for field in DOMAIN_FIELDS if field not in info]
+            if not isinstance(info.get('levels', {}), dict):
+                problems.append(f"domain {key}: 'levels' must be an object")
+            else:
+                problems += [f"domain {key}: missing level '{level}'"
+                             for level in LEVEL_KEYS if level not in info.get('levels', {})]
+        for prediction in PREDICTION_KEYS:
+            if not project_suggestions.get(prediction, {}).get(key):
+                problems.append(f"project suggestions: missing prediction {prediction} for domain {key}")
+        if not learning_resources.get(key):
+            problems.append(f"learning resources: missing domain {key}")
+        for i, resource in enumerate(learning_resources.get(key, [])):
+            if not isinstance(resource, dict):
+                problems.append(f"learning resources: domain {key} entry {i} is not an object")
+                continue
+            problems += [f"learning resources: domain {key} entry {i} missing '{field}'"
+                         for field in RESOURCE_FIELDS if field not in resource]
+    if problems:
+        raise ValueError('Invalid content catalog:\n  ' + '\n  '.join(problems))
+
+def parse_suggestions(value):
+    """Suggestions as a tuple, from a comma-joined string or a list"""
+    items = value.split(',') if isinstance(value, str) else value
+    return tuple(item.strip() for item in items if item.strip())
+
+def freeze_content(value):
+    """Read-only copy of nested dicts and lists, as mapping proxies and tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze_content(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze_content(item) for item in value)
+    return value
+
+def thaw_content(value):
+    """Plain dicts and lists again from freeze_content output, for JSON"""
+    if isinstance(value, MappingProxyType):
+        return {key: thaw_content(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw_content(item) for item in value]
+    return value
+
+class ContentCatalog:
+    """Pre-parsed, immutable view of the content tables, built once at import"""
+    
+    def __init__(self, domains, project_suggestions, learning_resources):
+        validate_content_tables(domains, project_suggestions, learning_resources)
+        self.domains = freeze_content(domains)
+        self.suggestions = MappingProxyType({
+            (prediction, key): parse_suggestions(project_suggestions[prediction][key])
+            for prediction in PREDICTION_KEYS for key in domains
+        })
+        self.top_suggestions = MappingProxyType({key: value[:5] for key, value in self.suggestions.items()})
+        self.resources = MappingProxyType({key: freeze_content(learning_resources[key]) for key in domains})
+        self.top_resources = MappingProxyType({key: value[:6] for key, value in self.resources.items()})
+    
+    def resolve_domain(self, domain_key):
+        """The domain key itself if known, otherwise the default domain"""
+        domain_key = str(domain_key)
+        return domain_key if domain_key in self.domains else '1'
+    
+    def to_dict(self):
+        """Catalog file contents for the current tables"""
+        return {
+            'version': CATALOG_VERSION,
+            'domains': thaw_content(self.domains),
+            'project_suggestions': {
+                prediction: {key: list(self.suggestions[(prediction, key)]) for key in self.domains}
+                for prediction in PREDICTION_KEYS
+            },
+            'learning_resources': {key: thaw_content(value) for key, value in self.resources.items()}
+        }
+
+if CATALOG_PATH:
+    DOMAINS, PROJECT_SUGGESTIONS, LEARNING_RESOURCES = load_content_tables(CATALOG_PATH)
+    print(f"✓ Content catalog loaded from {CATALOG_PATH}", file=sys.stderr)
+
+CATALOG = ContentCatalog(DOMAINS, PROJECT_SUGGESTIONS, LEARNING_RESOURCES)
+
 def get_level_description(overall_score):
     """Get level description based on overall score (0-100%)"""
     if overall_score >= 60:
@@ -276,327 +468,3278 @@ def calculate_overall_score(dsa_level, problem_count, project_count, github_qual
     
     return min(100, round(overall_score, 1))
 
-@app.route('/')
-def home():
-    """Home page"""
-    return render_template('index.html', 
-                         domains=DOMAINS, 
-                         company=COMPANY_INFO)
+# Assessment inputs as (default, min, max); shared by every scoring path
+INPUT_FIELDS = ('dsa_level', 'problem_count', 'project_count', 'github_quality')
+INPUT_BOUNDS = {
+    'dsa_level': (5, 1, 10),
+    'problem_count': (50, 0, 500),
+    'project_count': (3, 0, 50),
+    'github_quality': (5, 1, 10)
+}
 
-@app.route('/about')
-def about():
-    """About page"""
-    team_members = [
-        {
-            'name': 'Swathi',
-            'role': 'Team Lead',
-            'skills': 'Project Management, System Architecture, Leadership',
-            'bio': 'Oversees project execution and team coordination. Ensures seamless integration of all system components.',
-            'avatar': 'SW',
-            'color': '#8b5cf6'
-        },
-        {
-            'name': 'Santhosh',
-            'role': 'Creative Lead',
-            'skills': 'UI/UX Design, Brand Identity, Visual Design',
-            'bio': 'Designs intuitive user interfaces and creates engaging visual experiences. Focuses on user-centered design.',
-            'avatar': 'SA',
-            'color': '#10b981'
-        },
-        {
-            'name': 'Vishwa',
-            'role': 'Tech Lead',
-            'skills': 'Full-Stack Development, Technical Strategy, Code Quality',
-            'bio': 'Leads technical development and ensures code quality. Implements best practices and mentors team members.',
-            'avatar': 'VI',
-            'color': '#3b82f6'
-        }
-    ]
-    return render_template('about.html', 
-                         team=team_members, 
-                         company=COMPANY_INFO)
+# Level bands for vectorized scoring, in the same order as get_level_description
+LEVEL_THRESHOLDS = np.array([40, 60])
+LEVEL_BANDS = [get_level_description(score) for score in (0, 40, 60)]
+LEVEL_NAMES = np.array([band['level'] for band in LEVEL_BANDS])
+READINESS_LABELS = np.array([band['readiness'] for band in LEVEL_BANDS])
 
-@app.route('/assessment', methods=['GET', 'POST'])
-def assessment():
-    """Assessment page"""
-    if request.method == 'POST':
+MAX_BATCH_ROWS = int(os.environ.get('PRS_MAX_BATCH_ROWS', 50000))
+INPUT_VALUE_LIMIT = 2.0 ** 63  # anything larger cannot be an int64, so it is rejected, not clamped
+
+def parse_input_value(field, value):
+    """One clamped input: finite numbers and numeric strings (fractions truncate), else ValueError"""
+    default, low, high = INPUT_BOUNDS[field]
+    if value is None or value == '':
+        return default
+    if isinstance(value, bool) or not isinstance(value, (numbers.Real, str)):
+        raise ValueError(f'{field} must be a number, not {type(value).__name__}')
+    try:
+        number = float(value)
+    except (ValueError, OverflowError):
+        raise ValueError(f'{field} must be a finite number') from None
+    if not math.isfinite(number) or abs(number) >= INPUT_VALUE_LIMIT:
+        raise ValueError(f'{field} must be a finite number')
+    return max(low, min(high, int(number)))
+
+def parse_input_column(field, values):
+    """parse_input_value over a column, converting int/float/str columns in one step"""
+    default, low, high = INPUT_BOUNDS[field]
+    values = [default if value is None or value == '' else value for value in values]
+    if set(map(type, values)) <= {int, float, str}:
+        # NumPy parses strings with float(), so this accepts exactly what parse_input_value does
         try:
-            dsa_level = int(request.form.get('dsa_level', 5))
-            problem_count = int(request.form.get('problem_count', 50))
-            project_count = int(request.form.get('project_count', 3))
-            github_quality = int(request.form.get('github_quality', 5))
-            domain_focus = request.form.get('domain_focus', '1')
-            
-            dsa_level = max(1, min(10, dsa_level))
-            problem_count = max(0, min(500, problem_count))
-            project_count = max(0, min(50, project_count))
-            github_quality = max(1, min(10, github_quality))
-            
-            if domain_focus not in DOMAINS:
-                domain_focus = '1'
-            
-            overall_score = calculate_overall_score(dsa_level, problem_count, project_count, github_quality)
-            is_ready = 1 if overall_score >= 60 else 0
-            level_info = get_level_description(overall_score)
-            
-            session['assessment_data'] = {
-                'dsa_level': dsa_level,
-                'problem_count': problem_count,
-                'project_count': project_count,
-                'github_quality': github_quality,
-                'domain_focus': domain_focus,
-                'prediction': is_ready,
-                'overall_score': overall_score,
-                'level_info': level_info,
-                'domain_name': DOMAINS[domain_focus]['name'],
-                'domain_info': DOMAINS[domain_focus]
-            }
-            
-            return redirect(url_for('results'))
-            
-        except Exception as e:
-            print(f"Error during assessment: {e}")
-            print(traceback.format_exc())
-            return render_template('assessment.html', 
-                                 domains=DOMAINS, 
-                                 company=COMPANY_INFO,
-                                 error=f"Please check your inputs and try again. Error: {str(e)}")
+            array = np.array(values, dtype=np.float64)
+        except (ValueError, OverflowError):
+            array = None
+        if array is not None and np.isfinite(array).all() and (np.abs(array) < INPUT_VALUE_LIMIT).all():
+            return np.clip(array.astype(np.int64), low, high)
+    # Anything else goes value by value, which also names the field in the error
+    return np.fromiter((parse_input_value(field, value) for value in values), dtype=np.int64, count=len(values))
+
+def clamp_inputs(source):
+    """Parse and clamp assessment inputs from a form or JSON mapping"""
+    inputs = {field: parse_input_value(field, source.get(field)) for field in INPUT_FIELDS}
     
-    return render_template('assessment.html', 
-                         domains=DOMAINS, 
-                         company=COMPANY_INFO)
+    domain_focus = str(source.get('domain_focus', '1'))
+    if domain_focus not in DOMAINS:
+        domain_focus = '1'
+    inputs['domain_focus'] = domain_focus
+    
+    return inputs
 
-@app.route('/results')
-def results():
-    """Results page"""
-    try:
-        if 'assessment_data' not in session:
-            return redirect(url_for('assessment'))
-        
-        assessment_data = session['assessment_data']
-        domain_key = str(assessment_data['domain_focus'])
-        prediction = assessment_data['prediction']
-        overall_score = assessment_data['overall_score']
-        
-        suggestions_key = str(prediction)
-        suggestions_str = PROJECT_SUGGESTIONS.get(suggestions_key, {}).get(domain_key, 'No suggestions available')
-        
-        if suggestions_str == 'No suggestions available':
-            suggestions_str = PROJECT_SUGGESTIONS.get('0', {}).get(domain_key, 'Personal Portfolio, To-Do List App, Weather App')
-        
-        suggestions = [s.strip() for s in suggestions_str.split(',')]
-        resources = LEARNING_RESOURCES.get(domain_key, [])
-        domain_info = DOMAINS.get(domain_key, DOMAINS['1'])
-        
-        return render_template('results.html',
-                             assessment_data=assessment_data,
-                             suggestions=suggestions[:5],
-                             resources=resources[:6],
-                             domain=domain_info,
-                             domain_key=domain_key,
-                             company=COMPANY_INFO,
-                             overall_score=overall_score)
+def clamp_input_arrays(rows):
+    """Column-wise parse and clamp of many assessment rows into NumPy arrays"""
+    columns = {field: parse_input_column(field, [row.get(field) for row in rows]) for field in INPUT_FIELDS}
     
-    except Exception as e:
-        print(f"Error in results route: {e}")
-        print(traceback.format_exc())
-        return render_template('500.html', 
-                             error=str(e),
-                             company=COMPANY_INFO), 500
+    domains = np.array([str(row.get('domain_focus') or '1') for row in rows])
+    columns['domain_focus'] = np.where(np.isin(domains, list(DOMAINS)), domains, '1')
+    
+    return columns
 
-@app.route('/dashboard')
-def dashboard():
-    """Dashboard page"""
-    try:
-        if 'assessment_data' not in session:
-            return redirect(url_for('assessment'))
-        
-        assessment_data = session['assessment_data']
-        overall_score = assessment_data['overall_score']
-        
-        max_values = {
-            'dsa_level': 10,
-            'problem_count': 200,
-            'project_count': 10,
-            'github_quality': 10
+def calculate_overall_scores(dsa_level, problem_count, project_count, github_quality):
+    """Vectorized calculate_overall_score over arrays of inputs"""
+    dsa_percentage = (np.asarray(dsa_level) / 10) * 100
+    problems_percentage = np.minimum(100, (np.asarray(problem_count) / 200) * 100)
+    projects_percentage = np.minimum(100, (np.asarray(project_count) / 10) * 100)
+    github_percentage = (np.asarray(github_quality) / 10) * 100
+    
+    overall_score = (
+        dsa_percentage * 0.35 +
+        problems_percentage * 0.25 +
+        projects_percentage * 0.25 +
+        github_percentage * 0.15
+    )
+    
+    return np.minimum(100, np.round(overall_score, 1))
+
+def get_level_indices(overall_scores):
+    """Index into LEVEL_BANDS for each score (0=Beginner, 1=Intermediate, 2=Advanced)"""
+    return np.searchsorted(LEVEL_THRESHOLDS, overall_scores, side='right')
+
+# Feature order the model was trained on
+MODEL_FEATURES = INPUT_FIELDS + ('domain_focus',)
+PREDICT_BUFFER_ROWS = int(os.environ.get('PRS_PREDICT_BUFFER_ROWS', 256))
+
+# Hot reload: PRS_MODEL_WATCH_SECONDS > 0 polls the model file's mtime/size
+# and reloads it when it changes (replace it with an atomic rename); POST
+# /api/model/reload with PRS_ADMIN_TOKEN triggers the same in one worker.
+MODEL_WATCH_SECONDS = float(os.environ.get('PRS_MODEL_WATCH_SECONDS', 0))
+ADMIN_TOKEN = os.environ.get('PRS_ADMIN_TOKEN', '')
+# Canned profiles a candidate model must score sensibly in every domain
+# before it is swapped in: (dsa, problems, projects, github, expected readiness)
+MODEL_VALIDATION_PROFILES = (
+    (1, 0, 0, 1, 0),
+    (3, 30, 1, 3, None),
+    (5, 100, 3, 5, None),
+    (7, 200, 6, 7, None),
+    (10, 500, 50, 10, 1)
+)
+
+def admin_authorized():
+    """True when admin endpoints are enabled and the request carries the token"""
+    token = request.headers.get('X-Admin-Token', '')
+    return bool(ADMIN_TOKEN) and secrets.compare_digest(token.encode(), ADMIN_TOKEN.encode())
+
+class ReadinessPredictor:
+    """Readiness inference around PRS.pkl, with a score-based fallback"""
+    
+    def __init__(self, model=None, buffer_rows=PREDICT_BUFFER_ROWS):
+        # (model, ready class, version), replaced in one assignment so a reload never
+        # blocks requests and a prediction always uses a consistent model
+        self._active = (model, model.classes_[-1] if model is not None else None, None)
+        self.buffer_rows = buffer_rows
+        self._buffer = np.zeros((buffer_rows, len(MODEL_FEATURES)), dtype=np.float64)
+        self._lock = threading.Lock()
+        self._loaded = threading.Event()
+        self._loaded.set()
+        self._reload_lock = threading.Lock()
+        self._seen_signature = None
+        self._watch = None
+        self._watch_pid = None
+        self.swap_listeners = []
+        self.stats = {
+            'model_calls': 0,
+            'model_rows': 0,
+            'model_seconds': 0.0,
+            'fallback_calls': 0,
+            'fallback_rows': 0,
+            'fallback_seconds': 0.0,
+            'load_seconds': None,
+            'warmup_ms': None,
+            'reloads': 0,
+            'reload_failures': 0,
+            'last_reload': None
         }
+    
+    @property
+    def model(self):
+        return self._active[0]
+    
+    @property
+    def ready_class(self):
+        return self._active[1]
+    
+    @property
+    def version(self):
+        return self._active[2]
+    
+    def load_in_background(self, path=MODEL_PATH):
+        """Unpickle (importing scikit-learn) and warm up the model off the import path; predictions wait for it"""
+        self._loaded.clear()
         
-        skill_data = {}
-        
-        dsa_percentage = min(100, int((assessment_data['dsa_level'] / max_values['dsa_level']) * 100))
-        skill_data['dsa_level'] = {
-            'value': assessment_data['dsa_level'],
-            'percentage': dsa_percentage,
-            'max': max_values['dsa_level'],
-            'label': 'DSA Proficiency',
-            'color': '#8b5cf6',
-            'level': 'Beginner' if dsa_percentage < 40 else 'Intermediate' if dsa_percentage < 70 else 'Advanced'
-        }
+        def load():
+            start = time.perf_counter()
+            try:
+                model, version = load_model(path)
+                self._active = (model, model.classes_[-1] if model is not None else None, version)
+                self.warm_up()
+            finally:
+                self.stats['load_seconds'] = round(time.perf_counter() - start, 3)
+                self._loaded.set()
         
-        prob_percentage = min(100, int((assessment_data['problem_count'] / max_values['problem_count']) * 100))
-        skill_data['problem_count'] = {
-            'value': assessment_data['problem_count'],
-            'percentage': prob_percentage,
-            'max': max_values['problem_count'],
-            'label': 'Problems Solved',
-            'color': '#10b981',
-            'level': 'Beginner' if prob_percentage < 40 else 'Intermediate' if prob_percentage < 70 else 'Advanced'
-        }
+        threading.Thread(target=load, name='model-loader', daemon=True).start()
+    
+    @property
+    def loaded(self):
+        return self._loaded.is_set()
+    
+    def wait_until_loaded(self):
+        self._loaded.wait()
+    
+    def warm_up(self):
+        """Run one dummy prediction so the first request skips sklearn's lazy setup"""
+        start = time.perf_counter()
+        self._predict(np.array([[5, 50, 3, 5, 1]], dtype=np.float64))
+        self.stats['warmup_ms'] = round((time.perf_counter() - start) * 1000, 3)
+    
+    def reload(self, path=MODEL_PATH):
+        """Load, warm up and validate path in the background, then swap it in; False if one is already running"""
+        if not self._reload_lock.acquire(blocking=False):
+            return False
+        threading.Thread(target=self._reload, args=(path,), name='model-reloader', daemon=True).start()
+        return True
+    
+    def _reload(self, path):
+        start = time.perf_counter()
+        report = {'path': path}
+        try:
+            self.wait_until_loaded()
+            model, version = read_model(path)
+            report['load_seconds'] = round(time.perf_counter() - start, 3)
+            if self.version is not None and version['sha256'] == self.version['sha256']:
+                # Touched or rewritten with the same content: adopt the new signature only
+                self._active = self._active[:2] + (version,)
+                report['unchanged'] = True
+                return
+            
+            ready_class = model.classes_[-1]
+            warm_start = time.perf_counter()
+            model.predict(np.array([[5, 50, 3, 5, 1]], dtype=np.float64))
+            report['warmup_ms'] = round((time.perf_counter() - warm_start) * 1000, 3)
+            validate_start = time.perf_counter()
+            report.update(self.validate(model, ready_class))
+            report['validation_ms'] = round((time.perf_counter() - validate_start) * 1000, 3)
+            
+            swap_start = time.perf_counter()
+            self._active = (model, ready_class, version)
+            report['swap_us'] = round((time.perf_counter() - swap_start) * 1e6, 3)
+            report['seconds_to_swap'] = round(time.perf_counter() - start, 3)
+            self.stats['reloads'] += 1
+            print(f"✓ Reloaded the model {version['sha256'][:12]} in {time.perf_counter() - start:.3f}s",
+                  file=sys.stderr)
+            for listener in self.swap_listeners:
+                listener(self)
+        except Exception as e:
+            self.stats['reload_failures'] += 1
+            report['error'] = str(e)
+            print(f"⚠ Warning: Could not reload the model from {path}: {e}", file=sys.stderr)
+        finally:
+            report['total_seconds'] = round(time.perf_counter() - start, 3)
+            self.stats['last_reload'] = report
+            self._reload_lock.release()
+    
+    def validate(self, model, ready_class):
+        """Check a candidate on MODEL_VALIDATION_PROFILES, raising ValueError if it fails"""
+        rows = np.array([profile[:4] + (float(domain_key),)
+                         for profile in MODEL_VALIDATION_PROFILES for domain_key in DOMAINS], dtype=np.float64)
+        classes = np.asarray(model.predict(rows))
+        if classes.shape != (len(rows),) or not np.isin(classes, model.classes_).all():
+            raise ValueError(f'predict returned {classes.shape} values outside classes_')
         
-        proj_percentage = min(100, int((assessment_data['project_count'] / max_values['project_count']) * 100))
-        skill_data['project_count'] = {
-            'value': assessment_data['project_count'],
-            'percentage': proj_percentage,
-            'max': max_values['project_count'],
-            'label': 'Projects Completed',
-            'color': '#3b82f6',
-            'level': 'Beginner' if proj_percentage < 40 else 'Intermediate' if proj_percentage < 70 else 'Advanced'
-        }
+        predictions = (classes == ready_class).astype(np.int64)
+        expected = [profile[4] for profile in MODEL_VALIDATION_PROFILES for _ in DOMAINS]
+        failures = sum(1 for prediction, wanted in zip(predictions.tolist(), expected)
+                       if wanted is not None and prediction != wanted)
+        if failures:
+            raise ValueError(f'{failures} canned profiles scored the wrong way round')
         
-        git_percentage = min(100, int((assessment_data['github_quality'] / max_values['github_quality']) * 100))
-        skill_data['github_quality'] = {
-            'value': assessment_data['github_quality'],
-            'percentage': git_percentage,
-            'max': max_values['github_quality'],
-            'label': 'GitHub Quality',
-            'color': '#ef4444',
-            'level': 'Beginner' if git_percentage < 40 else 'Intermediate' if git_percentage < 70 else 'Advanced'
+        return {
+            'validation_rows': len(rows),
+            'agreement_with_previous': round(float((predictions == self._predict(rows)).mean()), 3)
         }
+    
+    def watch(self, path=MODEL_PATH, interval=MODEL_WATCH_SECONDS):
+        """Poll path every interval seconds and reload it when its mtime or size changes"""
+        if self._watch_pid == os.getpid():
+            return
+        self._watch = (path, interval)
+        self._watch_pid = os.getpid()
+        threading.Thread(target=self._run_watch, args=(path, interval), name='model-watcher', daemon=True).start()
+    
+    def _run_watch(self, path, interval):
+        while True:
+            time.sleep(interval)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            signature = [stat.st_mtime_ns, stat.st_size]
+            current = self.version['signature'] if self.version is not None else None
+            # A file that failed to reload is retried only once it changes again
+            if signature not in (current, self._seen_signature) and self.reload(path):
+                self._seen_signature = signature
+    
+    def after_fork(self):
+        """Threads do not survive fork: reset the locks and restart the watcher"""
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._seen_signature = None
+        if self._watch is not None:
+            self.watch(*self._watch)
+    
+    def predict_one(self, dsa_level, problem_count, project_count, github_quality, domain_focus):
+        """Predict readiness (0/1) for a single clamped assessment"""
+        return int(self.predict_batch([[dsa_level, problem_count, project_count,
+                                        github_quality, domain_focus]])[0])
+    
+    def predict_batch(self, rows):
+        """Predict readiness (0/1) for an (n, 5) batch of clamped assessments"""
+        if not self._loaded.is_set():
+            self._loaded.wait()
+        return self._predict(np.asarray(rows, dtype=np.float64))
+    
+    def _predict(self, rows):
+        if len(rows) == 0:
+            return np.zeros(0, dtype=np.int64)
+        model, ready_class, _ = self._active
+        if model is None:
+            return self._fallback(rows)
         
-        improvement_tips = []
-        
-        if assessment_data['dsa_level'] < 6:
-            improvement_tips.append(f'Improve DSA skills: Current {assessment_data["dsa_level"]}/10 (Target: 7+)')
-        
-        if assessment_data['problem_count'] < 100:
-            improvement_tips.append(f'Solve more problems: Current {assessment_data["problem_count"]} (Target: 150+)')
-        
-        if assessment_data['project_count'] < 3:
-            improvement_tips.append(f'Build more projects: Current {assessment_data["project_count"]} (Target: 5+)')
-        
-        if assessment_data['github_quality'] < 6:
-            improvement_tips.append(f'Improve GitHub profile: Current {assessment_data["github_quality"]}/10 (Target: 7+)')
-        
-        if not improvement_tips:
-            if overall_score >= 60:
-                improvement_tips.append('Prepare for technical interviews with mock sessions')
-                improvement_tips.append('Contribute to open-source projects')
-                improvement_tips.append('Build advanced projects to showcase expertise')
+        start = time.perf_counter()
+        try:
+            if len(rows) <= self.buffer_rows:
+                with self._lock:
+                    view = self._buffer[:len(rows)]
+                    view[...] = rows
+                    classes = model.predict(view)
             else:
-                improvement_tips.append('Focus on building a strong foundation with basic projects')
-                improvement_tips.append('Solve at least 100 coding problems regularly')
-                improvement_tips.append('Complete 3-5 meaningful projects for your portfolio')
+                classes = model.predict(rows)
+        except Exception as e:
+            app.logger.warning('Model prediction failed, using overall score: %s', e)
+            return self._fallback(rows)
         
-        return render_template('dashboard.html',
-                             assessment_data=assessment_data,
-                             skill_data=skill_data,
-                             improvement_tips=improvement_tips,
-                             overall_score=int(overall_score),
-                             company=COMPANY_INFO)
+        self._count('model', len(rows), time.perf_counter() - start)
+        return (classes == ready_class).astype(np.int64)
     
-    except Exception as e:
-        print(f"Error in dashboard route: {e}")
-        print(traceback.format_exc())
-        return render_template('500.html', 
-                             error=str(e),
-                             company=COMPANY_INFO), 500
+    def _fallback(self, rows):
+        """Readiness from calculate_overall_score when the model is unavailable"""
+        start = time.perf_counter()
+        scores = calculate_overall_scores(rows[:, 0], rows[:, 1], rows[:, 2], rows[:, 3])
+        predictions = (scores >= 60).astype(np.int64)
+        self._count('fallback', len(rows), time.perf_counter() - start)
+        return predictions
+    
+    def _count(self, kind, rows, seconds):
+        """Add one call to the model_* or fallback_* counters; requests predict from many threads"""
+        with self._lock:
+            self.stats[f'{kind}_calls'] += 1
+            self.stats[f'{kind}_rows'] += rows
+            self.stats[f'{kind}_seconds'] += seconds
 
-@app.route('/projects')
-def projects():
-    """Project suggestions page"""
+predictor = ReadinessPredictor()
+predictor.load_in_background()
+# A process forked mid-load would never see the loader thread finish
+os.register_at_fork(before=predictor.wait_until_loaded, after_in_child=predictor.after_fork)
+if MODEL_WATCH_SECONDS > 0:
+    predictor.watch()
+
+# Micro-batching window for concurrent single-row predictions (0 disables it)
+BATCH_WINDOW_MS = float(os.environ.get('PRS_BATCH_WINDOW_MS', 0))
+BATCH_MAX_ROWS = int(os.environ.get('PRS_BATCH_MAX_ROWS', PREDICT_BUFFER_ROWS))
+# A request waiting longer than this on the batching thread predicts its own row
+BATCH_TIMEOUT_MS = float(os.environ.get('PRS_BATCH_TIMEOUT_MS', 1000))
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+class PredictionBatcher:
+    """Coalesces concurrent single-row predictions into one predict_batch call"""
+    
+    def __init__(self, predictor, window_ms=BATCH_WINDOW_MS, max_rows=BATCH_MAX_ROWS,
+                 timeout_ms=BATCH_TIMEOUT_MS):
+        self.predictor = predictor
+        self.window = window_ms / 1000
+        self.max_rows = max_rows
+        self.timeout = timeout_ms / 1000
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker_pid = None
+        self.stats = {
+            'batches': 0,
+            'rows': 0,
+            'max_batch_size': 0,
+            'max_queue_depth': 0,
+            'wait_seconds': 0.0,
+            'max_wait_seconds': 0.0,
+            'timeouts': 0,
+            'batch_size_buckets': {str(size): 0 for size in BATCH_SIZE_BUCKETS + ('+Inf',)}
+        }
+    
+    @property
+    def enabled(self):
+        return self.window > 0
+    
+    def predict_one(self, dsa_level, problem_count, project_count, github_quality, domain_focus):
+        """Predict readiness (0/1), sharing a model call with concurrent requests"""
+        row = [dsa_level, problem_count, project_count, github_quality, domain_focus]
+        if not self.enabled:
+            return self.predictor.predict_one(*row)
+        
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((row, future, time.perf_counter()))
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            # A stuck or backed-up batching thread must not hang the request; it skips cancelled rows
+            future.cancel()
+            with self._lock:
+                self.stats['timeouts'] += 1
+            return int(self.predictor.predict_batch([row])[0])
+    
+    def _ensure_worker(self):
+        """Start the batching thread once per process (threads do not survive fork)"""
+        if self._worker_pid == os.getpid():
+            return
+        with self._lock:
+            if self._worker_pid != os.getpid():
+                threading.Thread(target=self._run, name='prediction-batcher', daemon=True).start()
+                self._worker_pid = os.getpid()
+    
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.perf_counter() + self.window
+            while len(batch) < self.max_rows:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            
+            batch = [item for item in batch if item[1].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            self._record(batch)
+            try:
+                predictions = self.predictor.predict_batch([row for row, _, _ in batch]).tolist()
+            except Exception as e:
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future, _), prediction in zip(batch, predictions):
+                future.set_result(prediction)
+    
+    def _record(self, batch):
+        now = time.perf_counter()
+        size = len(batch)
+        max_wait = now - min(queued_at for _, _, queued_at in batch)
+        stats = self.stats
+        stats['batches'] += 1
+        stats['rows'] += size
+        stats['max_batch_size'] = max(stats['max_batch_size'], size)
+        stats['max_queue_depth'] = max(stats['max_queue_depth'], size + self._queue.qsize())
+        stats['wait_seconds'] += sum(now - queued_at for _, _, queued_at in batch)
+        stats['max_wait_seconds'] = max(stats['max_wait_seconds'], max_wait)
+        bucket = next((str(limit) for limit in BATCH_SIZE_BUCKETS if size <= limit), '+Inf')
+        stats['batch_size_buckets'][bucket] += 1
+    
+    def describe(self):
+        """Configuration, live queue depth and counters for tuning the window"""
+        return {
+            'enabled': self.enabled,
+            'window_ms': self.window * 1000,
+            'max_rows': self.max_rows,
+            'timeout_ms': self.timeout * 1000,
+            'queue_depth': self._queue.qsize(),
+            **self.stats
+        }
+
+prediction_batcher = PredictionBatcher(predictor)
+
+# Optional precomputed table: '' disables it, 'memory' builds it at startup,
+# anything else is a directory of memory-mapped .npy files shared by workers
+LOOKUP_TABLE = os.environ.get('PRS_LOOKUP_TABLE', '')
+LOOKUP_TABLE_VERSION = 1
+
+def input_axis(field, cap=None):
+    """All clamped values of one input, optionally cut at its scoring cap"""
+    _, low, high = INPUT_BOUNDS[field]
+    return np.arange(low, (cap if cap is not None else high) + 1)
+
+def file_sha256(path):
+    """Hex digest of a file, or 'none' if it cannot be read"""
     try:
-        if 'assessment_data' not in session:
-            return redirect(url_for('assessment'))
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return 'none'
+
+class ScoreLookupTable:
+    """Score and readiness prediction for every clamped input, as array lookups"""
+    
+    def __init__(self, score_tenths, predictions, domain_keys):
+        # score_tenths[dsa, problems, projects, github] covers inputs up to the
+        # score caps; predictions[domain, dsa, problems, projects, github] the full range
+        self.score_tenths = score_tenths
+        self.predictions = predictions
+        self.domain_index = {key: i for i, key in enumerate(domain_keys)}
+        self.info = {}
+    
+    @classmethod
+    def build(cls, predictor):
+        """Evaluate the formula and the model over the whole input space"""
+        dsa, problems, projects, github = np.meshgrid(
+            input_axis('dsa_level'), input_axis('problem_count', 200),
+            input_axis('project_count', 10), input_axis('github_quality'), indexing='ij')
+        score_tenths = np.rint(calculate_overall_scores(dsa, problems, projects, github) * 10).astype(np.int16)
         
-        assessment_data = session['assessment_data']
-        domain_key = str(assessment_data['domain_focus'])
-        prediction = assessment_data['prediction']
+        problems, projects, github = [axis.ravel() for axis in np.meshgrid(
+            input_axis('problem_count'), input_axis('project_count'),
+            input_axis('github_quality'), indexing='ij')]
+        domain_keys = list(DOMAINS)
+        predictions = np.empty((len(domain_keys), len(input_axis('dsa_level')),
+                                len(input_axis('problem_count')), len(input_axis('project_count')),
+                                len(input_axis('github_quality'))), dtype=np.int8)
+        rows = np.empty((len(problems), len(MODEL_FEATURES)), dtype=np.float64)
+        rows[:, 1], rows[:, 2], rows[:, 3] = problems, projects, github
+        for d, domain_key in enumerate(domain_keys):
+            rows[:, 4] = float(domain_key)
+            for i, dsa_level in enumerate(input_axis('dsa_level')):
+                rows[:, 0] = dsa_level
+                predictions[d, i] = predictor.predict_batch(rows).reshape(predictions.shape[2:])
         
-        suggestions_key = str(prediction)
-        suggestions_str = PROJECT_SUGGESTIONS.get(suggestions_key, {}).get(domain_key, 'No suggestions available')
+        return cls(score_tenths, predictions, domain_keys)
+    
+    @classmethod
+    def load(cls, directory, model_sha256):
+        """Memory-map a saved table, or None if it is missing or stale"""
+        try:
+            with open(os.path.join(directory, 'lookup_meta.json')) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if (meta.get('version') != LOOKUP_TABLE_VERSION or meta.get('model_sha256') != model_sha256
+                or meta.get('domains') != list(DOMAINS)):
+            return None
         
-        if suggestions_str == 'No suggestions available':
-            suggestions_str = PROJECT_SUGGESTIONS.get('0', {}).get(domain_key, 'Personal Portfolio, To-Do List App, Weather App')
+        score_tenths = np.load(os.path.join(directory, 'lookup_scores.npy'), mmap_mode='r')
+        predictions = np.load(os.path.join(directory, 'lookup_predictions.npy'), mmap_mode='r')
+        return cls(score_tenths, predictions, meta['domains'])
+    
+    def save(self, directory, model_sha256):
+        """Write the table as .npy files, replacing any previous one atomically"""
+        os.makedirs(directory, exist_ok=True)
+        for name, array in (('lookup_scores.npy', self.score_tenths),
+                            ('lookup_predictions.npy', self.predictions)):
+            tmp_path = os.path.join(directory, f'.{name}.{os.getpid()}')
+            np.save(tmp_path, array)
+            os.replace(tmp_path + '.npy', os.path.join(directory, name))
         
-        suggestions = [s.strip() for s in suggestions_str.split(',')]
-        resources = LEARNING_RESOURCES.get(domain_key, [])
-        domain_info = DOMAINS.get(domain_key, DOMAINS['1'])
+        meta = {
+            'version': LOOKUP_TABLE_VERSION,
+            'model_sha256': model_sha256,
+            'domains': list(self.domain_index)
+        }
+        tmp_path = os.path.join(directory, f'.lookup_meta.json.{os.getpid()}')
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, os.path.join(directory, 'lookup_meta.json'))
+    
+    def verify(self, predictor, sample_size=20000, seed=0):
+        """Count table cells that disagree with the formula (all) and the model (sampled)"""
+        score_mismatches = 0
+        for index, score_tenths in np.ndenumerate(self.score_tenths):
+            dsa, problems, projects, github = index
+            expected = calculate_overall_score(dsa + 1, problems, projects, github + 1)
+            score_mismatches += score_tenths / 10 != expected
         
-        return render_template('projects.html',
-                             suggestions=suggestions,
-                             resources=resources,
-                             domain=domain_info,
-                             assessment_data=assessment_data,
-                             company=COMPANY_INFO)
+        rng = np.random.default_rng(seed)
+        indices = [rng.integers(0, size, sample_size) for size in self.predictions.shape]
+        domain_values = np.array([float(key) for key in self.domain_index])[indices[0]]
+        rows = np.column_stack([indices[1] + 1, indices[2], indices[3], indices[4] + 1, domain_values])
+        prediction_mismatches = int((self.predictions[tuple(indices)] != predictor.predict_batch(rows)).sum())
+        
+        return {'score_mismatches': int(score_mismatches), 'prediction_mismatches': prediction_mismatches,
+                'prediction_samples': sample_size}
     
-    except Exception as e:
-        print(f"Error in projects route: {e}")
-        print(traceback.format_exc())
-        return render_template('500.html', 
-                             error=str(e),
-                             company=COMPANY_INFO), 500
+    def covers(self, domain_focus):
+        return domain_focus in self.domain_index
+    
+    def lookup(self, dsa_level, problem_count, project_count, github_quality, domain_focus):
+        """Overall score and prediction for one clamped assessment"""
+        score_tenths = self.score_tenths[dsa_level - 1, min(problem_count, 200),
+                                         min(project_count, 10), github_quality - 1]
+        prediction = self.predictions[self.domain_index[domain_focus], dsa_level - 1,
+                                      problem_count, project_count, github_quality - 1]
+        return int(score_tenths) / 10, int(prediction)
+    
+    def lookup_arrays(self, columns):
+        """Vectorized lookup over clamp_input_arrays output"""
+        dsa = columns['dsa_level'] - 1
+        github = columns['github_quality'] - 1
+        scores = self.score_tenths[dsa, np.minimum(columns['problem_count'], 200),
+                                   np.minimum(columns['project_count'], 10), github] / 10
+        domains = np.array([self.domain_index[key] for key in columns['domain_focus'].tolist()], dtype=np.int64)
+        predictions = self.predictions[domains, dsa, columns['problem_count'],
+                                       columns['project_count'], github].astype(np.int64)
+        return scores, predictions
 
-@app.route('/learning-resources')
-def learning_resources():
-    """Learning resources page"""
+def max_rss_mb():
+    """Peak resident set size of this process in MB"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def init_lookup_table(setting=LOOKUP_TABLE):
+    """Build or memory-map the lookup table according to PRS_LOOKUP_TABLE"""
+    if not setting:
+        return None
+    
+    predictor.wait_until_loaded()
+    start = time.perf_counter()
+    rss_before = max_rss_mb()
+    model_sha256 = predictor.version['sha256'] if predictor.model is not None else 'none'
     try:
-        if 'assessment_data' not in session:
-            return redirect(url_for('assessment'))
+        table = None if setting == 'memory' else ScoreLookupTable.load(setting, model_sha256)
+        source = 'mmap'
+        if table is None:
+            table = ScoreLookupTable.build(predictor)
+            source = 'built'
+            if setting != 'memory':
+                table.save(setting, model_sha256)
+                table = ScoreLookupTable.load(setting, model_sha256)
         
-        assessment_data = session['assessment_data']
-        domain_key = str(assessment_data['domain_focus'])
-        
-        resources = LEARNING_RESOURCES.get(domain_key, [])
-        domain_info = DOMAINS.get(domain_key, DOMAINS['1'])
-        
-        return render_template('learning_resources.html',
-                             resources=resources,
-                             domain=domain_info,
-                             assessment_data=assessment_data,
-                             company=COMPANY_INFO)
-    
+        checks = table.verify(predictor)
+        if checks['score_mismatches'] or checks['prediction_mismatches']:
+            print(f"⚠ Warning: Lookup table disagrees with the scoring model: {checks}", file=sys.stderr)
+            return None
     except Exception as e:
-        print(f"Error in learning_resources route: {e}")
-        print(traceback.format_exc())
-        return render_template('500.html', 
-                             error=str(e),
-                             company=COMPANY_INFO), 500
+        print(f"⚠ Warning: Could not prepare the lookup table: {e}", file=sys.stderr)
+        return None
+    
+    table.info = {
+        'source': source,
+        'seconds': round(time.perf_counter() - start, 3),
+        'bytes': int(table.score_tenths.nbytes + table.predictions.nbytes),
+        'rss_increase_mb': round(max_rss_mb() - rss_before, 1),
+        **checks
+    }
+    print(f"✓ Lookup table ready ({source} in {table.info['seconds']}s, "
+          f"{table.info['bytes'] / 1e6:.1f} MB, +{table.info['rss_increase_mb']} MB peak RSS)",
+          file=sys.stderr)
+    return table
 
-@app.route('/reset')
-def reset():
-    """Reset session and start over"""
-    session.clear()
-    return redirect(url_for('assessment'))
+lookup_table = init_lookup_table()
 
-@app.route('/api/health')
-def health_check():
-    """Health check endpoint"""
-    return jsonify({
-        'status': 'healthy', 
-        'service': 'placement-readiness',
-        'version': '1.0.0'
-    })
+def refresh_lookup_table(predictor):
+    """Swap listener: stop serving the previous model's table, then rebuild it"""
+    global lookup_table
+    if LOOKUP_TABLE:
+        lookup_table = None
+        lookup_table = init_lookup_table()
 
-@app.route('/api/assessment-data')
-def get_assessment_data():
-    """API endpoint to get current assessment data"""
-    if 'assessment_data' not in session:
-        return jsonify({'error': 'No assessment data found'}), 404
-    
-    return jsonify(session['assessment_data'])
+predictor.swap_listeners.append(refresh_lookup_table)
 
-# Error handlers
-@app.errorhandler(404)
-def page_not_found(e):
-    return render_template('404.html', company=COMPANY_INFO), 404
+# Per-worker state shared across processes through snapshot files. Each process
+# writes worker-<pid>-<nonce>.json and holds an flock on the matching .lock
+# file for its whole life. PIDs repeat after a restart but locks die with their
+# process, so a snapshot whose lock can be taken belongs to an exited process
+# and is folded into base.json, and merged totals never go backwards.
 
-@app.errorhandler(500)
-def internal_server_error(e):
-    print(f"500 Error: {e}")
-    print(traceback.format_exc())
-    return render_template('500.html', 
-                         error=str(e) if app.debug else 'Internal Server Error',
-                         company=COMPANY_INFO), 500
+class WorkerSnapshots:
+    """Snapshot files for one kind of per-worker state, merged across processes"""
+    
+    def __init__(self, directory, snapshot_class):
+        self.directory = directory
+        self.snapshot_class = snapshot_class
+        self._lock = threading.Lock()
+        self._pid = None
+        self._name = None
+        self._lock_file = None
+        self._sync_pid = None
+        os.register_at_fork(after_in_child=self._after_fork)
+    
+    @property
+    def enabled(self):
+        return bool(self.directory)
+    
+    def _after_fork(self):
+        """Drop the parent's identity; closing our copy leaves the parent's lock held"""
+        if self._lock_file is not None:
+            self._lock_file.close()
+        self._lock = threading.Lock()
+        self._pid = self._name = self._lock_file = None
+    
+    def _ensure_process(self):
+        """Take a fresh name and lifetime lock in each process (caller holds the lock)"""
+        if self._pid == os.getpid():
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        name = f'worker-{os.getpid()}-{secrets.token_hex(4)}'
+        self._lock_file = open(os.path.join(self.directory, name + '.lock'), 'w')
+        fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+        self._name = name
+        self._pid = os.getpid()
+    
+    def write(self, data):
+        """Replace this process's snapshot with data (a snapshot_class.to_dict() result)"""
+        with self._lock:
+            self._ensure_process()
+            path = os.path.join(self.directory, self._name + '.json')
+            with open(path + '.tmp', 'w') as f:
+                json.dump(data, f)
+            os.replace(path + '.tmp', path)
+    
+    def collect(self):
+        """Every other process's snapshot merged with base.json, compacting exited ones first"""
+        merged = self.snapshot_class()
+        if not self.directory or not os.path.isdir(self.directory):
+            return merged
+        with open(os.path.join(self.directory, '.lock'), 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            base = self._read('base.json')
+            exited = []
+            for name in os.listdir(self.directory):
+                stem, ext = os.path.splitext(name)
+                if not stem.startswith('worker-') or ext != '.json' or stem == self._name:
+                    continue
+                if self._running(stem):
+                    merged.merge(self._read(name))
+                else:
+                    base.merge(self._read(name))
+                    exited.append(stem)
+            if exited:
+                path = os.path.join(self.directory, 'base.json')
+                with open(path + '.tmp', 'w') as f:
+                    json.dump(base.to_dict(), f)
+                os.replace(path + '.tmp', path)
+                for stem in exited:
+                    for ext in ('.json', '.lock'):
+                        try:
+                            os.remove(os.path.join(self.directory, stem + ext))
+                        except FileNotFoundError:
+                            pass
+        return merged.merge(base)
+    
+    def _running(self, stem):
+        """True while the snapshot's writer holds its lifetime lock"""
+        try:
+            with open(os.path.join(self.directory, stem + '.lock')) as f:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return True
+        except FileNotFoundError:
+            pass  # written before lifetime locks existed
+        return False
+    
+    def _read(self, name):
+        try:
+            with open(os.path.join(self.directory, name)) as f:
+                return self.snapshot_class.from_dict(json.load(f))
+        except FileNotFoundError:
+            return self.snapshot_class()
+    
+    def sync_every(self, interval, sync):
+        """Call sync() from a daemon thread every interval seconds, and once more at exit"""
+        if self._sync_pid == os.getpid():
+            return
+        with self._lock:
+            if self._sync_pid != os.getpid():
+                threading.Thread(target=self._run_sync, args=(interval, sync),
+                                 name='snapshot-sync', daemon=True).start()
+                self._sync_pid = os.getpid()
+                atexit.register(sync)
+    
+    def _run_sync(self, interval, sync):
+        while True:
+            time.sleep(interval)
+            sync()
+
+# Request instrumentation: phase timings (session cookie, scoring, template
+# render) and response sizes, aggregated into per-thread histograms so the
+# request path takes no locks. PRS_METRICS=0 skips installing the hooks.
+# With several workers, set PRS_METRICS_DIR so each worker writes snapshots
+# that /metrics merges (like the cohort statistics).
+METRICS_ENABLED = os.environ.get('PRS_METRICS', '1') != '0'
+METRICS_DIR = os.environ.get('PRS_METRICS_DIR', '')
+METRICS_PERSIST_SECONDS = float(os.environ.get('PRS_METRICS_PERSIST_SECONDS', 10))
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                   0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+METRIC_DEFINITIONS = {
+    'prs_request_duration_seconds': ('histogram', ('endpoint',), 'Time from session open to session save'),
+    'prs_request_phase_seconds': ('histogram', ('endpoint', 'phase'), 'Time spent per request phase'),
+    'prs_response_size_bytes': ('histogram', ('endpoint',), 'Response body size'),
+    'prs_requests_total': ('counter', ('endpoint', 'method', 'status'), 'Requests served'),
+    'prs_admission_wait_seconds': ('histogram', ('route_class',), 'Time admitted requests waited for a slot'),
+    'prs_admission_shed_total': ('counter', ('route_class', 'reason'), 'Requests answered 503 by admission control')
+}
+METRIC_BUCKETS = {
+    'prs_request_duration_seconds': LATENCY_BUCKETS,
+    'prs_request_phase_seconds': LATENCY_BUCKETS,
+    'prs_response_size_bytes': SIZE_BUCKETS,
+    'prs_admission_wait_seconds': LATENCY_BUCKETS
+}
+
+class MetricsShard:
+    """One thread's histograms and counters, keyed by (metric, *label values); only that thread writes"""
+    
+    __slots__ = ('histograms', 'counters')
+    
+    def __init__(self):
+        self.histograms = {}
+        self.counters = {}
+    
+    def observe(self, key, bounds, value):
+        """Histogram counts are one slot per bucket plus +Inf, then the sum"""
+        counts = self.histograms.get(key)
+        if counts is None:
+            counts = self.histograms[key] = [0] * (len(bounds) + 2)
+        counts[bisect.bisect_left(bounds, value)] += 1
+        counts[-1] += value
+    
+    def increment(self, key):
+        self.counters[key] = self.counters.get(key, 0) + 1
+    
+    def merge(self, other):
+        for key, counts in list(other.histograms.items()):
+            mine = self.histograms.get(key)
+            if mine is None:
+                self.histograms[key] = list(counts)
+            else:
+                for index, count in enumerate(counts):
+                    mine[index] += count
+        for key, count in list(other.counters.items()):
+            self.counters[key] = self.counters.get(key, 0) + count
+        return self
+    
+    def to_dict(self):
+        return {
+            'histograms': [[list(key), counts] for key, counts in self.histograms.items()],
+            'counters': [[list(key), count] for key, count in self.counters.items()]
+        }
+    
+    @classmethod
+    def from_dict(cls, data):
+        shard = cls()
+        shard.histograms = {tuple(key): counts for key, counts in data['histograms']}
+        shard.counters = {tuple(key): count for key, count in data['counters']}
+        return shard
+
+class RequestMetrics:
+    """Per-request phase timers feeding per-thread shards, rendered as Prometheus text"""
+    
+    def __init__(self, directory=METRICS_DIR, persist_seconds=METRICS_PERSIST_SECONDS):
+        self.snapshots = WorkerSnapshots(directory, MetricsShard)
+        self.persist_seconds = persist_seconds
+        self._local = threading.local()
+        # Live threads' shards; an exited thread's counts fold into _retired, so
+        # per-request threads (or a recycling pool) cannot grow this without bound
+        self._shards = {}
+        self._retired = MetricsShard()
+        self._lock = threading.Lock()
+    
+    def _shard(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = MetricsShard()
+            with self._lock:
+                self._retire_exited()
+                self._shards[threading.current_thread()] = shard
+            if self.snapshots.enabled:
+                self.snapshots.sync_every(self.persist_seconds, self.persist)
+        return shard
+    
+    def start_request(self, request):
+        """Begin a request record (called from TimedSessionInterface.open_session)"""
+        local = self._local
+        local.start = time.perf_counter()
+        local.request = request
+        local.phases = {}
+    
+    def add_phase(self, name, seconds):
+        """Accumulate time for a phase of the current request (no-op outside one)"""
+        phases = getattr(self._local, 'phases', None)
+        if phases is not None:
+            phases[name] = phases.get(name, 0.0) + seconds
+    
+    def finish_request(self, response):
+        """Close the record once the session cookie has been written"""
+        local = self._local
+        phases = getattr(local, 'phases', None)
+        if phases is None:
+            return
+        local.phases = None
+        size = None if response.is_streamed else sum(map(len, response.response))
+        self.record(local.request.endpoint or 'none', local.request.method, response.status_code,
+                    size, time.perf_counter() - local.start, phases)
+    
+    def record(self, endpoint, method, status, size, seconds, phases):
+        shard = self._shard()
+        shard.observe(('prs_request_duration_seconds', endpoint), LATENCY_BUCKETS, seconds)
+        for phase, phase_seconds in phases.items():
+            shard.observe(('prs_request_phase_seconds', endpoint, phase), LATENCY_BUCKETS, phase_seconds)
+        if size is not None:
+            shard.observe(('prs_response_size_bytes', endpoint), SIZE_BUCKETS, size)
+        shard.increment(('prs_requests_total', endpoint, method, status))
+    
+    def record_admission(self, route_class, waited, shed_reason=None):
+        """Count an admission decision (AdmissionController runs outside the session bracket)"""
+        shard = self._shard()
+        if shed_reason is None:
+            shard.observe(('prs_admission_wait_seconds', route_class), LATENCY_BUCKETS, waited)
+        else:
+            shard.increment(('prs_admission_shed_total', route_class, shed_reason))
+    
+    def render_started(self, sender, template, context, **extra):
+        self._local.render_start = time.perf_counter()
+    
+    def render_finished(self, sender, template, context, **extra):
+        self.add_phase('render', time.perf_counter() - self._local.render_start)
+    
+    def _retire_exited(self):
+        """Fold the shards of exited threads into the retired totals (caller holds the lock)"""
+        for thread in [thread for thread in self._shards if not thread.is_alive()]:
+            self._retired.merge(self._shards.pop(thread))
+    
+    def local_totals(self):
+        with self._lock:
+            self._retire_exited()
+            totals = MetricsShard().merge(self._retired)
+            shards = list(self._shards.values())
+        for shard in shards:
+            totals.merge(shard)
+        return totals
+    
+    def persist(self):
+        """Write this worker's totals to its snapshot file (runs off the request path)"""
+        try:
+            self.snapshots.write(self.local_totals().to_dict())
+        except OSError as e:
+            app.logger.warning('Could not save request metrics: %s', e)
+    
+    def collect(self):
+        """Totals across this worker and, in multi-process mode, every other snapshot"""
+        totals = self.local_totals()
+        try:
+            return totals.merge(self.snapshots.collect())
+        except (OSError, ValueError) as e:
+            app.logger.warning('Could not load request metrics: %s', e)
+            return totals
+    
+    def render_prometheus(self):
+        """Prometheus text exposition format (version 0.0.4)"""
+        totals = self.collect()
+        lines = []
+        for metric, (kind, label_names, help_text) in METRIC_DEFINITIONS.items():
+            lines.append(f'# HELP {metric} {help_text}')
+            lines.append(f'# TYPE {metric} {kind}')
+            if kind == 'counter':
+                for key, count in sorted(totals.counters.items()):
+                    if key[0] == metric:
+                        lines.append(f'{metric}{{{format_labels(label_names, key[1:])}}} {count}')
+                continue
+            bounds = METRIC_BUCKETS[metric]
+            for key, counts in sorted(totals.histograms.items()):
+                if key[0] != metric:
+                    continue
+                label_text = format_labels(label_names, key[1:])
+                cumulative = 0
+                for bound, count in zip(bounds + ('+Inf',), counts[:-1]):
+                    cumulative += count
+                    lines.append(f'{metric}_bucket{{{label_text},le="{bound}"}} {cumulative}')
+                lines.append(f'{metric}_sum{{{label_text}}} {counts[-1]}')
+                lines.append(f'{metric}_count{{{label_text}}} {cumulative}')
+        return '\n'.join(lines) + '\n'
+
+def format_labels(names, values):
+    return ','.join(f'{name}="{value}"' for name, value in zip(names, values))
+
+class TimedSessionInterface(SecureCookieSessionInterface):
+    """Signed cookie sessions that also bracket the whole request, hooks included, for RequestMetrics"""
+    
+    def open_session(self, app, request):
+        request_metrics.start_request(request)
+        start = time.perf_counter()
+        try:
+            return super().open_session(app, request)
+        finally:
+            request_metrics.add_phase('session', time.perf_counter() - start)
+    
+    def save_session(self, app, session, response):
+        start = time.perf_counter()
+        try:
+            return super().save_session(app, session, response)
+        finally:
+            request_metrics.add_phase('session', time.perf_counter() - start)
+            request_metrics.finish_request(response)
+
+def timed_phase(name):
+    """Report a function's run time as a phase of the current request"""
+    def decorator(fn):
+        if not METRICS_ENABLED:
+            return fn
+        
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                request_metrics.add_phase(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+request_metrics = RequestMetrics()
+
+if METRICS_ENABLED:
+    app.session_interface = TimedSessionInterface()
+    before_render_template.connect(request_metrics.render_started, app)
+    template_rendered.connect(request_metrics.render_finished, app)
+
+# Admission control, off unless PRS_ADMISSION_MAX_INFLIGHT is set. Each worker
+# runs at most that many expensive requests at once; cheap requests (GETs of
+# health, cached pages, the assessment form, assets) get
+# PRS_ADMISSION_CHEAP_RESERVE extra slots, so they
+# stay fast while expensive ones queue. An expensive request that cannot start
+# within PRS_ADMISSION_QUEUE_MS (counting time queued upstream, from a proxy's
+# X-Request-Start header) gets an immediate 503 with Retry-After instead.
+# Limits only bite where a worker serves requests concurrently: gunicorn with
+# --threads above the limit, or asgi.py with PRS_ASGI_THREADS above it.
+ADMISSION_MAX_INFLIGHT = int(os.environ.get('PRS_ADMISSION_MAX_INFLIGHT', 0))
+ADMISSION_CHEAP_RESERVE = int(os.environ.get('PRS_ADMISSION_CHEAP_RESERVE', 8))
+ADMISSION_QUEUE_MS = float(os.environ.get('PRS_ADMISSION_QUEUE_MS', 250))
+# Cheap only for GET/HEAD: POST /assessment runs the model and writes the store
+ADMISSION_CHEAP_ENDPOINTS = frozenset(('home', 'about', 'assessment', 'results', 'projects', 'learning_resources',
+                                       'reset', 'static', 'asset', 'health_check', 'metrics', 'model_stats'))
+ADMISSION_CHEAP_METHODS = frozenset(('GET', 'HEAD'))
+ADMISSION_SHED_BODY = b'{"error":"Server busy, please retry shortly"}\n'
+
+def request_queue_seconds(environ):
+    """Time a request spent queued before this worker, from X-Request-Start (0 if absent)"""
+    value = environ.get('HTTP_X_REQUEST_START', '')
+    try:
+        started = float(value[2:] if value.startswith('t=') else value)
+    except ValueError:
+        return 0.0
+    # Proxies send seconds (nginx $msec), milliseconds or microseconds since the epoch
+    if started > 1e14:
+        started /= 1e6
+    elif started > 1e11:
+        started /= 1e3
+    return max(0.0, time.time() - started)
+
+class AdmissionController:
+    """WSGI middleware (outside Flask, so shedding is cheap) bounding concurrent expensive requests"""
+    
+    def __init__(self, wsgi_app, max_inflight=ADMISSION_MAX_INFLIGHT,
+                 cheap_reserve=ADMISSION_CHEAP_RESERVE, queue_ms=ADMISSION_QUEUE_MS):
+        self.wsgi_app = wsgi_app
+        self.max_inflight = max_inflight
+        self.cheap_reserve = cheap_reserve
+        self.queue_seconds = queue_ms / 1000
+        self._condition = threading.Condition()
+        self.inflight = 0
+        self.expensive = 0
+        self.waiting = 0
+        self.latency = 0.01
+        self.stats = {'admitted': Counter(), 'shed': Counter(), 'max_inflight_seen': 0}
+    
+    @property
+    def enabled(self):
+        return self.max_inflight > 0
+    
+    def __call__(self, environ, start_response):
+        route_class = 'cheap' if self.is_cheap(environ) else 'expensive'
+        waited, shed_reason = self._admit(route_class, request_queue_seconds(environ))
+        if METRICS_ENABLED:
+            request_metrics.record_admission(route_class, waited, shed_reason)
+        if shed_reason is not None:
+            return self._shed(start_response)
+        
+        start = time.perf_counter()
+        try:
+            body = self.wsgi_app(environ, start_response)
+        except BaseException:
+            self._release(route_class, start)
+            raise
+        # Streamed bodies keep their slot until the server closes them
+        return ClosingIterator(body, functools.partial(self._release, route_class, start))
+    
+    @staticmethod
+    def is_cheap(environ):
+        """Whether the request is a GET/HEAD of a cheap endpoint (unmatched URLs count as expensive)"""
+        if environ.get('REQUEST_METHOD', 'GET') not in ADMISSION_CHEAP_METHODS:
+            return False
+        try:
+            endpoint, _ = app.url_map.bind_to_environ(environ).match()
+        except HTTPException:
+            return False
+        return endpoint in ADMISSION_CHEAP_ENDPOINTS
+    
+    def _admit(self, route_class, queued):
+        """(seconds waited, None) once admitted, or (0, reason) when shed"""
+        with self._condition:
+            waited = 0.0
+            if route_class == 'cheap':
+                if self.inflight >= self.max_inflight + self.cheap_reserve:
+                    return self._shed_reason(route_class, 'concurrency')
+            else:
+                budget = self.queue_seconds - queued
+                if budget <= 0:
+                    return self._shed_reason(route_class, 'queue_time')
+                if self.expensive >= self.max_inflight:
+                    # Recent request times predict the wait; shed now rather than after waiting the budget out
+                    if (self.waiting + 1) * self.latency / self.max_inflight > budget:
+                        return self._shed_reason(route_class, 'predicted_wait')
+                    start = time.perf_counter()
+                    self.waiting += 1
+                    try:
+                        admitted = self._condition.wait_for(lambda: self.expensive < self.max_inflight, budget)
+                    finally:
+                        self.waiting -= 1
+                    if not admitted:
+                        return self._shed_reason(route_class, 'queue_time')
+                    waited = time.perf_counter() - start
+                self.expensive += 1
+            
+            self.inflight += 1
+            self.stats['admitted'][route_class] += 1
+            self.stats['max_inflight_seen'] = max(self.stats['max_inflight_seen'], self.inflight)
+            return waited, None
+    
+    def _shed_reason(self, route_class, reason):
+        self.stats['shed'][f'{route_class}:{reason}'] += 1
+        return 0.0, reason
+    
+    def _release(self, route_class, start):
+        elapsed = time.perf_counter() - start
+        with self._condition:
+            self.inflight -= 1
+            if route_class == 'expensive':
+                self.expensive -= 1
+                self.latency += 0.2 * (elapsed - self.latency)
+                self._condition.notify()
+    
+    def _shed(self, start_response):
+        backlog = (self.waiting + self.expensive) * self.latency / self.max_inflight
+        start_response('503 SERVICE UNAVAILABLE', [
+            ('Content-Type', 'application/json'),
+            ('Content-Length', str(len(ADMISSION_SHED_BODY))),
+            ('Retry-After', str(max(1, math.ceil(backlog)))),
+            ('Cache-Control', 'no-store')
+        ])
+        return [ADMISSION_SHED_BODY]
+    
+    def describe(self):
+        """Limits, live occupancy and this worker's counters"""
+        if not self.enabled:
+            return {'enabled': False}
+        return {
+            'enabled': True,
+            'max_inflight': self.max_inflight,
+            'cheap_reserve': self.cheap_reserve,
+            'queue_ms': self.queue_seconds * 1000,
+            'inflight': self.inflight,
+            'expensive_inflight': self.expensive,
+            'waiting': self.waiting,
+            'latency_ewma_ms': round(self.latency * 1000, 3),
+            **self.stats
+        }
+
+admission_controller = AdmissionController(app.wsgi_app)
+
+if admission_controller.enabled:
+    app.wsgi_app = admission_controller
+
+@timed_phase('score')
+def score_inputs(inputs):
+    """Overall score and readiness prediction for one clamp_inputs result"""
+    fields = [inputs[field] for field in MODEL_FEATURES]
+    if lookup_table is not None and lookup_table.covers(inputs['domain_focus']):
+        return lookup_table.lookup(*fields)
+    
+    overall_score = calculate_overall_score(*fields[:4])
+    return overall_score, prediction_batcher.predict_one(*fields)
+
+@timed_phase('score')
+def score_input_arrays(columns):
+    """Overall scores and readiness predictions for clamp_input_arrays output"""
+    if lookup_table is not None and all(lookup_table.covers(key) for key in DOMAINS):
+        return lookup_table.lookup_arrays(columns)
+    
+    scores = calculate_overall_scores(columns['dsa_level'], columns['problem_count'],
+                                      columns['project_count'], columns['github_quality'])
+    predictions = predictor.predict_batch(np.column_stack(
+        [columns[field] for field in MODEL_FEATURES]).astype(np.float64))
+    return scores, predictions
+
+# Server-side assessment records; the signed cookie only carries the record ID.
+# An empty PRS_STORE_PATH keeps records in the per-worker LRU only.
+ASSESSMENT_STORE_PATH = os.environ.get('PRS_STORE_PATH',
+                                       os.path.join(app.instance_path, 'assessments.sqlite3'))
+ASSESSMENT_CACHE_SIZE = int(os.environ.get('PRS_STORE_CACHE_SIZE', 4096))
+ASSESSMENT_TTL_DAYS = float(os.environ.get('PRS_STORE_TTL_DAYS', 30))
+ASSESSMENT_RECORD_FIELDS = MODEL_FEATURES + ('overall_score', 'prediction')
+
+class AssessmentStore:
+    """Compact assessment records (raw inputs and score) keyed by an opaque ID"""
+    
+    PRUNE_EVERY = 1000
+    
+    def __init__(self, path=ASSESSMENT_STORE_PATH, cache_size=ASSESSMENT_CACHE_SIZE,
+                 ttl_days=ASSESSMENT_TTL_DAYS):
+        self.path = path
+        self.cache_size = cache_size
+        self.ttl_seconds = ttl_days * 86400
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._saves = 0
+        self._generation = 0
+    
+    def _connection(self):
+        """One SQLite connection per thread, reopened after a fork"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('''CREATE TABLE IF NOT EXISTS assessments (
+                id TEXT PRIMARY KEY,
+                dsa_level INTEGER NOT NULL,
+                problem_count INTEGER NOT NULL,
+                project_count INTEGER NOT NULL,
+                github_quality INTEGER NOT NULL,
+                domain_focus TEXT NOT NULL,
+                overall_score REAL NOT NULL,
+                prediction INTEGER NOT NULL,
+                created_at REAL NOT NULL
+            )''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_assessments_created_at ON assessments (created_at)')
+            conn.execute('''CREATE TABLE IF NOT EXISTS store_generation (
+                id INTEGER PRIMARY KEY CHECK (id = 0),
+                generation INTEGER NOT NULL
+            )''')
+            conn.execute('INSERT OR IGNORE INTO store_generation VALUES (0, 0)')
+            conn.commit()
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+            self._local.data_version = None
+        return conn
+    
+    def _check_generation(self):
+        """Drop the cached records once another worker has rescored the store"""
+        conn = self._connection()
+        # data_version only moves when another connection commits, so most reads skip the query
+        data_version = conn.execute('PRAGMA data_version').fetchone()[0]
+        if data_version == self._local.data_version:
+            return
+        self._local.data_version = data_version
+        generation = conn.execute('SELECT generation FROM store_generation WHERE id = 0').fetchone()[0]
+        with self._lock:
+            if generation != self._generation:
+                self._cache.clear()
+                self._generation = generation
+    
+    def _remember(self, assessment_id, record):
+        with self._lock:
+            self._cache[assessment_id] = record
+            self._cache.move_to_end(assessment_id)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+    
+    def save(self, record):
+        """Store a record and return its new opaque ID"""
+        assessment_id = secrets.token_urlsafe(16)
+        record = tuple(record[field] for field in ASSESSMENT_RECORD_FIELDS)
+        if self.path:
+            conn = self._connection()
+            with conn:
+                conn.execute('INSERT INTO assessments VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                             (assessment_id,) + record + (time.time(),))
+            self._saves += 1
+            if self._saves % self.PRUNE_EVERY == 0:
+                self.prune()
+        self._remember(assessment_id, record)
+        return assessment_id
+    
+    def get(self, assessment_id):
+        """The stored record as a dict, or None if it is unknown or expired"""
+        if self.path:
+            self._check_generation()
+        with self._lock:
+            record = self._cache.get(assessment_id)
+            if record is not None:
+                self._cache.move_to_end(assessment_id)
+        
+        if record is None and self.path:
+            row = self._connection().execute(
+                f'SELECT {", ".join(ASSESSMENT_RECORD_FIELDS)} FROM assessments WHERE id = ?',
+                (assessment_id,)).fetchone()
+            if row is not None:
+                record = tuple(row)
+                self._remember(assessment_id, record)
+        
+        return dict(zip(ASSESSMENT_RECORD_FIELDS, record)) if record is not None else None
+    
+    def delete(self, assessment_id):
+        with self._lock:
+            self._cache.pop(assessment_id, None)
+        if self.path:
+            conn = self._connection()
+            with conn:
+                conn.execute('DELETE FROM assessments WHERE id = ?', (assessment_id,))
+    
+    def prune(self):
+        """Drop records older than the retention window"""
+        conn = self._connection()
+        with conn:
+            conn.execute('DELETE FROM assessments WHERE created_at < ?', (time.time() - self.ttl_seconds,))
+    
+    def export_rows(self, chunk_rows=1000):
+        """Row count and an iterator of row chunks (rowid, inputs..., overall_score, prediction), oldest first"""
+        conn = self._connection()
+        max_rowid, count = conn.execute('SELECT MAX(rowid), COUNT(*) FROM assessments').fetchone()
+        cursor = conn.execute(f'SELECT rowid, {", ".join(ASSESSMENT_RECORD_FIELDS)} FROM assessments '
+                              'WHERE rowid <= ? ORDER BY rowid', (max_rowid or 0,))
+        return count, iter(functools.partial(cursor.fetchmany, chunk_rows), [])
+    
+    def update_scores(self, rows):
+        """Set (overall_score, prediction, rowid) rows in one transaction and drop every worker's cached records"""
+        conn = self._connection()
+        with conn:
+            conn.executemany('UPDATE assessments SET overall_score = ?, prediction = ? WHERE rowid = ?', rows)
+            conn.execute('UPDATE store_generation SET generation = generation + 1 WHERE id = 0')
+            generation = conn.execute('SELECT generation FROM store_generation WHERE id = 0').fetchone()[0]
+        with self._lock:
+            self._cache.clear()
+            self._generation = generation
+
+assessment_store = AssessmentStore()
+
+def rehydrate_assessment(record):
+    """Rebuild the full assessment_data dict from a compact record and the static tables"""
+    domain_focus = record['domain_focus'] if record['domain_focus'] in DOMAINS else '1'
+    return {
+        **record,
+        'level_info': get_level_description(record['overall_score']),
+        'domain_name': DOMAINS[domain_focus]['name'],
+        'domain_info': DOMAINS[domain_focus]
+    }
+
+def load_assessment_data():
+    """The current visitor's assessment_data, or None if there is no stored assessment"""
+    assessment_id = session.get('assessment_id')
+    if assessment_id is None:
+        return None
+    record = assessment_store.get(assessment_id)
+    return rehydrate_assessment(record) if record is not None else None
+
+# Skill dimensions shown on the dashboard; tips fire when a value is below tip_below
+SKILL_DIMENSIONS = (
+    {'key': 'dsa_level', 'label': 'DSA Proficiency', 'max': 10, 'color': '#8b5cf6',
+     'tip_below': 6, 'tip': 'Improve DSA skills: Current {value}/10 (Target: 7+)'},
+    {'key': 'problem_count', 'label': 'Problems Solved', 'max': 200, 'color': '#10b981',
+     'tip_below': 100, 'tip': 'Solve more problems: Current {value} (Target: 150+)'},
+    {'key': 'project_count', 'label': 'Projects Completed', 'max': 10, 'color': '#3b82f6',
+     'tip_below': 3, 'tip': 'Build more projects: Current {value} (Target: 5+)'},
+    {'key': 'github_quality', 'label': 'GitHub Quality', 'max': 10, 'color': '#ef4444',
+     'tip_below': 6, 'tip': 'Improve GitHub profile: Current {value}/10 (Target: 7+)'}
+)
+SKILL_MAXES = np.array([dimension['max'] for dimension in SKILL_DIMENSIONS])
+SKILL_TIP_BELOW = np.array([dimension['tip_below'] for dimension in SKILL_DIMENSIONS])
+SKILL_LEVEL_THRESHOLDS = np.array([40, 70])
+SKILL_LEVEL_NAMES = ('Beginner', 'Intermediate', 'Advanced')
+
+# General tips when no dimension is below its target, by readiness
+READY_TIPS = (
+    'Prepare for technical interviews with mock sessions',
+    'Contribute to open-source projects',
+    'Build advanced projects to showcase expertise'
+)
+FOUNDATION_TIPS = (
+    'Focus on building a strong foundation with basic projects',
+    'Solve at least 100 coding problems regularly',
+    'Complete 3-5 meaningful projects for your portfolio'
+)
+
+def compute_skill_breakdown(values):
+    """Percentages, level indices and tip flags for an (n, 4) array of skill values"""
+    values = np.asarray(values)
+    percentages = np.minimum(100, np.trunc((values / SKILL_MAXES) * 100)).astype(np.int64)
+    level_indices = np.searchsorted(SKILL_LEVEL_THRESHOLDS, percentages, side='right')
+    return percentages, level_indices, values < SKILL_TIP_BELOW
+
+def build_dashboards(values, overall_scores):
+    """Skill breakdown and improvement tips for many students in one pass"""
+    values = np.asarray(values)
+    percentages, level_indices, tip_flags = compute_skill_breakdown(values)
+    
+    dashboards = []
+    for row, row_percentages, row_levels, row_tips, overall_score in zip(
+            values.tolist(), percentages.tolist(), level_indices.tolist(),
+            tip_flags.tolist(), np.asarray(overall_scores).tolist()):
+        skill_data = {
+            dimension['key']: {
+                'value': value,
+                'percentage': percentage,
+                'max': dimension['max'],
+                'label': dimension['label'],
+                'color': dimension['color'],
+                'level': SKILL_LEVEL_NAMES[level]
+            }
+            for dimension, value, percentage, level in zip(SKILL_DIMENSIONS, row, row_percentages, row_levels)
+        }
+        improvement_tips = [dimension['tip'].format(value=value)
+                            for dimension, value, flagged in zip(SKILL_DIMENSIONS, row, row_tips) if flagged]
+        if not improvement_tips:
+            improvement_tips = list(READY_TIPS if overall_score >= 60 else FOUNDATION_TIPS)
+        dashboards.append({'skill_data': skill_data, 'improvement_tips': improvement_tips})
+    
+    return dashboards
+
+def build_dashboard(assessment_data):
+    """Skill breakdown and improvement tips for one assessment"""
+    values = [[assessment_data[dimension['key']] for dimension in SKILL_DIMENSIONS]]
+    return build_dashboards(values, [assessment_data['overall_score']])[0]
+
+# Typeahead search over learning resources, domain skills and project ideas.
+# Every prefix of every token maps to sorted document IDs with a match weight,
+# so a query is a few dict lookups and array intersections, never a table
+# scan. Results are boosted for the skill dimensions the student is weakest
+# in and for their own domain.
+SEARCH_KINDS = ('resource', 'skill', 'project')
+SEARCH_MAX_RESULTS = 50
+SEARCH_MAX_QUERY = 100
+SEARCH_MAX_TERMS = 8
+SEARCH_TITLE_WEIGHT = 2
+SEARCH_META_WEIGHT = 1
+SEARCH_EXACT_BONUS = 1
+SEARCH_WEAKNESS_WEIGHT = 3
+SEARCH_DOMAIN_BONUS = 1
+# Words that mark a document as helping with a skill dimension
+SEARCH_DIMENSION_KEYWORDS = {
+    'dsa_level': {'course', 'courses', 'curriculum', 'tutorials', 'learning', 'path', 'training',
+                  'videos', 'documentation', 'algorithms', 'statistics', 'language'},
+    'problem_count': {'practice', 'exercises', 'interactive', 'challenges', 'kaggle', 'problems'},
+    'project_count': {'project', 'projects', 'framework'},
+    'github_quality': {'version', 'control', 'git', 'github', 'ci', 'cd', 'community', 'tools', 'automation'}
+}
+
+def search_tokens(text):
+    return re.findall(r'[a-z0-9#+]+', text.lower())
+
+class SearchIndex:
+    """Edge n-gram inverted index over catalog documents, built once"""
+    
+    def __init__(self, documents):
+        start = time.perf_counter()
+        postings = {}
+        for doc_id, document in enumerate(documents):
+            for weight, text in ((SEARCH_TITLE_WEIGHT, document['title']), (SEARCH_META_WEIGHT, document['meta'])):
+                for token in search_tokens(text):
+                    for end in range(1, len(token) + 1):
+                        prefix = token[:end]
+                        score = weight + (SEARCH_EXACT_BONUS if end == len(token) else 0)
+                        entry = postings.setdefault(prefix, {})
+                        entry[doc_id] = max(entry.get(doc_id, 0), score)
+        self.postings = {
+            prefix: (np.fromiter(sorted(entry), dtype=np.int32, count=len(entry)),
+                     np.array([entry[doc_id] for doc_id in sorted(entry)], dtype=np.float64))
+            for prefix, entry in postings.items()
+        }
+        # The search text is only needed to build the postings
+        self.documents = tuple({key: value for key, value in document.items() if key != 'meta'}
+                               for document in documents)
+        
+        # Personalization depends only on a document's domain and dimensions, so
+        # each document gets one profile code (domain index, dimension bitmask)
+        # and a query scores all profiles at once, then gathers by code
+        self.domain_index = {}
+        for document in self.documents:
+            self.domain_index.setdefault(document['domain'], len(self.domain_index))
+        self.mask_count = 1 << len(SKILL_DIMENSIONS)
+        self.mask_dimensions = np.array([[mask >> bit & 1 for bit in range(len(SKILL_DIMENSIONS))]
+                                         for mask in range(self.mask_count)], dtype=np.float64)
+        self.profiles = np.array([
+            self.domain_index[document['domain']] * self.mask_count
+            + sum(1 << bit for bit, dimension in enumerate(SKILL_DIMENSIONS)
+                  if dimension['key'] in document['dimensions'])
+            for document in self.documents], dtype=np.int32)
+        self.kinds = np.array([SEARCH_KINDS.index(document['kind']) for document in self.documents], dtype=np.int8)
+        self.info = {
+            'documents': len(self.documents),
+            'prefixes': len(self.postings),
+            'build_ms': round((time.perf_counter() - start) * 1000, 3)
+        }
+    
+    @classmethod
+    def from_catalog(cls, catalog):
+        documents = []
+        for domain_key, domain in catalog.domains.items():
+            for resource in catalog.resources[domain_key]:
+                documents.append(search_document('resource', domain_key, domain, resource['name'], resource['type'],
+                                                 type=resource['type'], url=resource['url']))
+            for skill in domain['skills']:
+                documents.append(search_document('skill', domain_key, domain, skill, 'skill'))
+            for prediction, level in zip(PREDICTION_KEYS, ('beginner', 'advanced')):
+                for title in catalog.suggestions[(prediction, domain_key)]:
+                    documents.append(search_document('project', domain_key, domain, title, f'{level} project',
+                                                     level=level))
+        return cls(documents)
+    
+    def search(self, query, weakness=None, domain_key=None, kinds=None, limit=10):
+        """Best documents matching every query term as a prefix, most relevant first"""
+        candidates = scores = None
+        for token in search_tokens(query)[:SEARCH_MAX_TERMS]:
+            entry = self.postings.get(token)
+            if entry is None:
+                return []
+            ids, weights = entry
+            if candidates is None:
+                candidates, scores = ids, weights
+            else:
+                candidates, left, right = np.intersect1d(candidates, ids, assume_unique=True, return_indices=True)
+                scores = scores[left] + weights[right]
+            if not len(candidates):
+                return []
+        if candidates is None:
+            return []
+        
+        if kinds:
+            allowed = np.zeros(len(SEARCH_KINDS), dtype=bool)
+            allowed[[SEARCH_KINDS.index(kind) for kind in kinds]] = True
+            keep = allowed[self.kinds[candidates]]
+            candidates, scores = candidates[keep], scores[keep]
+        if weakness is not None or domain_key is not None:
+            boosts = np.zeros((len(self.domain_index), self.mask_count))
+            if weakness is not None:
+                boosts += self.mask_dimensions @ weakness * SEARCH_WEAKNESS_WEIGHT
+            if domain_key in self.domain_index:
+                boosts[self.domain_index[domain_key]] += SEARCH_DOMAIN_BONUS
+            scores = scores + boosts.ravel()[self.profiles[candidates]]
+        if len(candidates) > limit:
+            # Keep every candidate tied with the limit-th score so the sort below picks among them
+            cutoff = -np.partition(-scores, limit - 1)[limit - 1]
+            keep = scores >= cutoff
+            candidates, scores = candidates[keep], scores[keep]
+        # Highest score first; ties keep catalog order so results are stable
+        order = np.lexsort((candidates, -scores))[:limit]
+        return [dict(self.documents[doc_id], score=round(score, 3))
+                for doc_id, score in zip(candidates[order].tolist(), scores[order].tolist())]
+
+def search_document(kind, domain_key, domain, title, meta, **fields):
+    """One searchable entry; dimensions are the skill dimensions it helps with"""
+    words = set(search_tokens(f'{title} {meta}'))
+    dimensions = [key for key, keywords in SEARCH_DIMENSION_KEYWORDS.items()
+                  if words & keywords or (kind == 'project' and key == 'project_count')]
+    return {'kind': kind, 'domain': domain_key, 'domain_name': domain['name'], 'title': title,
+            'meta': f"{meta} {domain['name']}", 'dimensions': dimensions, **fields}
+
+def skill_weakness(assessment_data):
+    """How far below full marks each skill dimension is (0-1), in SKILL_DIMENSIONS order"""
+    # Same truncated percentages as compute_skill_breakdown, without array overhead for one row
+    return np.array([1 - min(100, int(assessment_data[dimension['key']] / dimension['max'] * 100)) / 100
+                     for dimension in SKILL_DIMENSIONS])
+
+search_index = SearchIndex.from_catalog(CATALOG)
+
+# Streaming cohort import/export: parse -> clamp -> vectorized scoring -> write,
+# one chunk at a time so memory stays flat regardless of file size
+COHORT_CHUNK_ROWS = int(os.environ.get('PRS_COHORT_CHUNK_ROWS', 5000))
+COHORT_ID_FIELD = 'student_id'
+COHORT_OUTPUT_FIELDS = (COHORT_ID_FIELD,) + MODEL_FEATURES + ('overall_score', 'prediction', 'level',
+                                                             'readiness', 'error')
+COHORT_MIMETYPES = {'csv': 'text/csv', 'ndjson': 'application/x-ndjson'}
+
+def cohort_format(name, default='csv'):
+    """Normalize a format name, mimetype or file name to 'csv' or 'ndjson'"""
+    name = (name or '').lower()
+    if name.endswith(('ndjson', 'jsonl', 'json')):
+        return 'ndjson'
+    if name.endswith('csv'):
+        return 'csv'
+    return default
+
+def iter_decoded_lines(stream, encoding='utf-8'):
+    """Text lines of a binary stream; a line that does not decode yields None"""
+    for raw in stream:
+        try:
+            yield raw.decode(encoding)
+        except UnicodeDecodeError:
+            yield None
+
+def iter_csv_records(lines):
+    """DictReader records, with None in place of undecodable lines and rows the csv module rejects"""
+    undecodable = []
+    
+    def decoded():
+        for line in lines:
+            if line is None:
+                undecodable.append(None)
+            else:
+                yield line
+    
+    reader = csv.DictReader(decoded())
+    while True:
+        try:
+            record = next(reader)
+        except StopIteration:
+            break
+        except csv.Error:
+            record = None
+        # The reader pulls lines only up to the end of this row, so skipped lines came before it
+        yield from undecodable
+        undecodable.clear()
+        yield record
+    yield from undecodable
+
+def iter_cohort_records(lines, fmt):
+    """Records from CSV (with a header row) or NDJSON lines; bad rows and lines yield None"""
+    if fmt == 'csv':
+        yield from iter_csv_records(lines)
+        return
+    for line in lines:
+        if line is None:
+            yield None
+            continue
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield None
+
+def iter_chunks(items, size):
+    """Lists of up to size consecutive items"""
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def score_cohort_chunk(records):
+    """Output rows for one chunk, in input order; rows that fail to parse carry an error"""
+    try:
+        valid = list(range(len(records)))
+        columns = clamp_input_arrays(records)
+        errors = {}
+    except (ValueError, TypeError, AttributeError, OverflowError):
+        # Parse row by row under the same rule and build the columns from the rows that parsed
+        valid, parsed, errors = [], [], {}
+        for i, record in enumerate(records):
+            try:
+                parsed.append(clamp_inputs(record))
+                valid.append(i)
+            except (ValueError, TypeError, AttributeError, OverflowError) as e:
+                errors[i] = str(e) if isinstance(record, dict) else 'Invalid record'
+        columns = {field: np.array([inputs[field] for inputs in parsed], dtype=np.int64) for field in INPUT_FIELDS}
+        columns['domain_focus'] = np.array([inputs['domain_focus'] for inputs in parsed], dtype=str)
+    
+    scores, predictions = score_input_arrays(columns)
+    level_indices = get_level_indices(scores)
+    scored = zip(*[columns[field].tolist() for field in MODEL_FEATURES], scores.tolist(),
+                 predictions.tolist(), LEVEL_NAMES[level_indices].tolist(),
+                 READINESS_LABELS[level_indices].tolist())
+    
+    rows = [None] * len(records)
+    for i, values in zip(valid, scored):
+        rows[i] = {COHORT_ID_FIELD: records[i].get(COHORT_ID_FIELD),
+                   **dict(zip(COHORT_OUTPUT_FIELDS[1:], values))}
+    for i, message in errors.items():
+        record = records[i] if isinstance(records[i], dict) else {}
+        rows[i] = {field: record.get(field) for field in (COHORT_ID_FIELD,) + MODEL_FEATURES}
+        rows[i]['error'] = message
+    return rows
+
+def new_cohort_stats():
+    return {'rows': 0, 'errors': 0, 'chunks': 0, 'started': time.perf_counter()}
+
+def iter_scored_cohort(records, stats, chunk_rows=COHORT_CHUNK_ROWS):
+    """Scored chunks, updating the progress counters in stats as they go"""
+    for chunk in iter_chunks(records, chunk_rows):
+        rows = score_cohort_chunk(chunk)
+        stats['rows'] += len(rows)
+        stats['errors'] += sum(1 for row in rows if row.get('error'))
+        stats['chunks'] += 1
+        yield rows
+
+def iter_cohort_output(scored_chunks, fmt):
+    """Serialized output text, one piece per chunk"""
+    if fmt == 'csv':
+        yield ','.join(COHORT_OUTPUT_FIELDS) + '\r\n'
+    for rows in scored_chunks:
+        if fmt == 'csv':
+            buffer = io.StringIO()
+            csv.DictWriter(buffer, COHORT_OUTPUT_FIELDS).writerows(rows)
+            yield buffer.getvalue()
+        else:
+            yield ''.join(json.dumps({key: value for key, value in row.items() if value is not None}) + '\n'
+                          for row in rows)
+
+def cohort_summary(stats):
+    """Final counters and throughput for a finished cohort run"""
+    elapsed = time.perf_counter() - stats['started']
+    return {
+        'rows': stats['rows'],
+        'errors': stats['errors'],
+        'chunks': stats['chunks'],
+        'seconds': round(elapsed, 3),
+        'rows_per_sec': round(stats['rows'] / elapsed, 1) if elapsed > 0 else None
+    }
+
+# Cohort re-scoring across processes: inputs and results live in memory-mapped
+# .npy files, so workers only receive shard bounds and return row counts
+RESCORE_CHUNK_ROWS = int(os.environ.get('PRS_RESCORE_CHUNK_ROWS', 50000))
+_rescore_arrays = {}
+
+def export_store_arrays(store, directory):
+    """Copy every stored assessment into memory-mapped columns; returns (arrays, count)"""
+    count, chunks = store.export_rows(RESCORE_CHUNK_ROWS)
+    arrays = create_rescore_arrays(directory, count)
+    offset = 0
+    for rows in chunks:
+        block = np.array(rows[:count - offset], dtype=np.float64)
+        end = offset + len(block)
+        arrays['rowids'][offset:end] = block[:, 0]
+        arrays['inputs'][offset:end] = block[:, 1:6]
+        arrays['old_scores'][offset:end] = block[:, 6]
+        arrays['old_predictions'][offset:end] = block[:, 7]
+        offset = end
+        if offset >= count:
+            break
+    for array in arrays.values():
+        array.flush()
+    return arrays, offset
+
+def create_rescore_arrays(directory, count):
+    """Allocate the memory-mapped input/output columns for a re-scoring run"""
+    shapes = {
+        'rowids': ((count,), np.int64),
+        'inputs': ((count, len(MODEL_FEATURES)), np.float64),
+        'old_scores': ((count,), np.float64),
+        'old_predictions': ((count,), np.int8),
+        'scores': ((count,), np.float64),
+        'predictions': ((count,), np.int8)
+    }
+    return {name: np.lib.format.open_memmap(os.path.join(directory, f'{name}.npy'), mode='w+',
+                                            dtype=dtype, shape=shape)
+            for name, (shape, dtype) in shapes.items()}
+
+def _init_rescore_worker(directory):
+    """Attach a pool worker to the shared arrays (the model is loaded with this module)"""
+    _rescore_arrays['inputs'] = np.load(os.path.join(directory, 'inputs.npy'), mmap_mode='r')
+    for name in ('scores', 'predictions'):
+        _rescore_arrays[name] = np.load(os.path.join(directory, f'{name}.npy'), mmap_mode='r+')
+
+def _rescore_shard(bounds):
+    """Score rows [start, end) in place and return how many were scored"""
+    start, end = bounds
+    inputs, scores, predictions = (_rescore_arrays[name] for name in ('inputs', 'scores', 'predictions'))
+    for chunk_start in range(start, end, RESCORE_CHUNK_ROWS):
+        chunk_end = min(end, chunk_start + RESCORE_CHUNK_ROWS)
+        rows = np.asarray(inputs[chunk_start:chunk_end])
+        scores[chunk_start:chunk_end] = calculate_overall_scores(rows[:, 0], rows[:, 1], rows[:, 2], rows[:, 3])
+        predictions[chunk_start:chunk_end] = predictor.predict_batch(rows)
+    scores.flush()
+    predictions.flush()
+    return end - start
+
+def rescore_arrays(directory, count, workers):
+    """Score all rows with a process pool; returns elapsed seconds"""
+    from concurrent.futures import ProcessPoolExecutor  # multiprocessing is only needed here
+    
+    predictor.wait_until_loaded()  # forked workers inherit the loaded model
+    start = time.perf_counter()
+    edges = np.linspace(0, count, workers * 4 + 1, dtype=np.int64)
+    shards = [(int(low), int(high)) for low, high in zip(edges[:-1], edges[1:]) if high > low]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_rescore_worker,
+                             initargs=(directory,)) as pool:
+        scored = sum(pool.map(_rescore_shard, shards))
+    if scored != count:
+        raise RuntimeError(f'Re-scored {scored} of {count} rows')
+    return time.perf_counter() - start
+
+def write_back_scores(store, arrays, count):
+    """Update rows whose score or prediction changed; returns the number updated"""
+    updated = 0
+    for start in range(0, count, RESCORE_CHUNK_ROWS):
+        end = min(count, start + RESCORE_CHUNK_ROWS)
+        changed = ((arrays['scores'][start:end] != arrays['old_scores'][start:end]) |
+                   (arrays['predictions'][start:end] != arrays['old_predictions'][start:end]))
+        rows = zip(arrays['scores'][start:end][changed].tolist(),
+                   arrays['predictions'][start:end][changed].tolist(),
+                   arrays['rowids'][start:end][changed].tolist())
+        store.update_scores(rows)
+        updated += int(changed.sum())
+    return updated
+
+# Background batch writer shared by the assessment history and traffic capture:
+# requests only enqueue, one daemon thread per process writes batches, and at
+# exit the thread is stopped and joined so no dequeued batch is lost.
+BATCH_WRITER_STOP = object()
+
+class BatchWriter:
+    """Queue drained in batches by a per-process daemon thread that calls write(batch)"""
+    
+    def __init__(self, write, name, queue_size, batch_rows, flush_seconds):
+        self.write = write
+        self.name = name
+        self.queue_size = queue_size
+        self.batch_rows = batch_rows
+        self.flush_seconds = flush_seconds
+        self._queue = None
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+    
+    def put(self, item):
+        """Queue an item without blocking; False when the queue is full"""
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            return False
+        return True
+    
+    def _ensure_thread(self):
+        """Start the writer once per process; a forked child starts with an empty queue"""
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                self._queue = queue.Queue(maxsize=self.queue_size)
+                self._thread = threading.Thread(target=self._run, args=(self._queue,), name=self.name, daemon=True)
+                self._thread.start()
+                self._pid = os.getpid()
+                atexit.register(self.stop)
+    
+    def _run(self, items):
+        stop = False
+        while not stop:
+            batch = []
+            item = items.get()
+            deadline = time.monotonic() + self.flush_seconds
+            while True:
+                if item is BATCH_WRITER_STOP:
+                    stop = True
+                    break
+                batch.append(item)
+                remaining = deadline - time.monotonic()
+                if len(batch) >= self.batch_rows or remaining <= 0:
+                    break
+                try:
+                    item = items.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            if batch:
+                self.write(batch)
+    
+    def stop(self, timeout=10):
+        """Write everything queued so far and wait for the thread to finish (runs at exit)"""
+        with self._lock:
+            if self._pid != os.getpid():
+                return
+            self._pid = None
+            items, thread = self._queue, self._thread
+        try:
+            items.put(BATCH_WRITER_STOP, timeout=timeout)
+        except queue.Full:
+            app.logger.warning('%s is still behind after %ss; unwritten items are dropped', self.name, timeout)
+            return
+        thread.join(timeout)
+        # Anything queued by other threads after the stop marker
+        leftovers = []
+        while True:
+            try:
+                leftovers.append(items.get_nowait())
+            except queue.Empty:
+                break
+        if leftovers:
+            self.write(leftovers)
+
+# Append-only assessment history for analytics. Inserts are batched by a
+# background writer; the aggregate endpoints read small summary tables that
+# the writer keeps up to date, never the log itself. An empty path disables it.
+HISTORY_PATH = os.environ.get('PRS_HISTORY_PATH', os.path.join(app.instance_path, 'history.sqlite3'))
+HISTORY_QUEUE_SIZE = int(os.environ.get('PRS_HISTORY_QUEUE_SIZE', 10000))
+HISTORY_BATCH_ROWS = int(os.environ.get('PRS_HISTORY_BATCH_ROWS', 500))
+HISTORY_FLUSH_SECONDS = float(os.environ.get('PRS_HISTORY_FLUSH_SECONDS', 1.0))
+HISTORY_SCORE_BUCKETS = 10
+
+HISTORY_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS assessment_log (
+    id INTEGER PRIMARY KEY,
+    created_at REAL NOT NULL,
+    day TEXT NOT NULL,
+    dsa_level INTEGER NOT NULL,
+    problem_count INTEGER NOT NULL,
+    project_count INTEGER NOT NULL,
+    github_quality INTEGER NOT NULL,
+    domain_focus TEXT NOT NULL,
+    overall_score REAL NOT NULL,
+    prediction INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_log_created_at ON assessment_log (created_at);
+CREATE INDEX IF NOT EXISTS idx_log_domain ON assessment_log (domain_focus, created_at);
+CREATE INDEX IF NOT EXISTS idx_log_prediction ON assessment_log (prediction, created_at);
+CREATE TABLE IF NOT EXISTS score_histogram (
+    domain_focus TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (domain_focus, bucket)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS daily_readiness (
+    day TEXT NOT NULL,
+    domain_focus TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    ready INTEGER NOT NULL,
+    PRIMARY KEY (day, domain_focus)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS weak_dimensions (
+    domain_focus TEXT NOT NULL,
+    dimension TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (domain_focus, dimension)
+) WITHOUT ROWID;
+'''
+
+class AssessmentHistory:
+    """Append-only assessment log with incrementally maintained summary tables"""
+    
+    def __init__(self, path=HISTORY_PATH, queue_size=HISTORY_QUEUE_SIZE,
+                 batch_rows=HISTORY_BATCH_ROWS, flush_seconds=HISTORY_FLUSH_SECONDS):
+        self.path = path
+        self._writer = BatchWriter(self._write, 'history-writer', queue_size, batch_rows, flush_seconds)
+        self._local = threading.local()
+        self.stats = {'queued': 0, 'written': 0, 'dropped': 0, 'batches': 0, 'errors': 0}
+    
+    @property
+    def enabled(self):
+        return bool(self.path)
+    
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.executescript(HISTORY_SCHEMA)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+    
+    def record(self, inputs, overall_score, prediction):
+        """Queue one assessment for the writer; never blocks the request"""
+        if not self.enabled:
+            return
+        row = tuple(inputs[field] for field in MODEL_FEATURES) + (overall_score, prediction, time.time())
+        self.stats['queued' if self._writer.put(row) else 'dropped'] += 1
+    
+    def flush(self):
+        """Write everything queued so far (also runs at exit); the next record restarts the writer"""
+        self._writer.stop()
+    
+    def _write(self, batch):
+        """Append a batch to the log and fold it into the summary tables in one transaction"""
+        rows = np.array([row[:4] for row in batch], dtype=np.int64)
+        _, _, weak_flags = compute_skill_breakdown(rows)
+        
+        log_rows, histogram, readiness, weak = [], Counter(), Counter(), Counter()
+        for row, flags in zip(batch, weak_flags.tolist()):
+            *inputs, overall_score, prediction, created_at = row
+            domain_focus = inputs[4]
+            day = time.strftime('%Y-%m-%d', time.gmtime(created_at))
+            log_rows.append((created_at, day, *inputs, overall_score, prediction))
+            histogram[(domain_focus, min(int(overall_score // 10), HISTORY_SCORE_BUCKETS - 1))] += 1
+            readiness[(day, domain_focus)] += 1
+            if prediction:
+                readiness[(day, domain_focus, 'ready')] += 1
+            for dimension, flagged in zip(SKILL_DIMENSIONS, flags):
+                if flagged:
+                    weak[(domain_focus, dimension['key'])] += 1
+        
+        try:
+            conn = self._connection()
+            with conn:
+                conn.executemany('INSERT INTO assessment_log (created_at, day, dsa_level, problem_count, '
+                                 'project_count, github_quality, domain_focus, overall_score, prediction) '
+                                 'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', log_rows)
+                conn.executemany('INSERT INTO score_histogram VALUES (?, ?, ?) '
+                                 'ON CONFLICT (domain_focus, bucket) DO UPDATE '
+                                 'SET count = count + excluded.count',
+                                 [key + (count,) for key, count in histogram.items()])
+                conn.executemany('INSERT INTO daily_readiness VALUES (?, ?, ?, ?) '
+                                 'ON CONFLICT (day, domain_focus) DO UPDATE '
+                                 'SET total = total + excluded.total, ready = ready + excluded.ready',
+                                 [key + (count, readiness[key + ('ready',)])
+                                  for key, count in readiness.items() if len(key) == 2])
+                conn.executemany('INSERT INTO weak_dimensions VALUES (?, ?, ?) '
+                                 'ON CONFLICT (domain_focus, dimension) DO UPDATE '
+                                 'SET count = count + excluded.count',
+                                 [key + (count,) for key, count in weak.items()])
+            self.stats['written'] += len(batch)
+            self.stats['batches'] += 1
+        except Exception as e:
+            self.stats['errors'] += 1
+            app.logger.error('Could not write assessment history: %s', e)
+    
+    def score_histogram(self, domain_focus=None):
+        """Score counts per 10-point bucket, per domain"""
+        query = 'SELECT domain_focus, bucket, count FROM score_histogram'
+        params = ()
+        if domain_focus:
+            query += ' WHERE domain_focus = ?'
+            params = (domain_focus,)
+        histograms = {}
+        for domain, bucket, count in self._connection().execute(query, params):
+            histograms.setdefault(domain, [0] * HISTORY_SCORE_BUCKETS)[bucket] = count
+        return histograms
+    
+    def readiness_rate(self, days=30, domain_focus=None):
+        """Assessments and readiness rate per UTC day over the last N days"""
+        since = time.strftime('%Y-%m-%d', time.gmtime(time.time() - days * 86400))
+        query = 'SELECT day, SUM(total), SUM(ready) FROM daily_readiness WHERE day >= ?'
+        params = [since]
+        if domain_focus:
+            query += ' AND domain_focus = ?'
+            params.append(domain_focus)
+        query += ' GROUP BY day ORDER BY day'
+        return [{'day': day, 'assessments': total, 'ready': ready, 'readiness_rate': round(ready / total, 4)}
+                for day, total, ready in self._connection().execute(query, params)]
+    
+    def weak_dimensions(self, domain_focus=None):
+        """How often each skill dimension was below its target, most common first"""
+        query = 'SELECT dimension, SUM(count) AS total FROM weak_dimensions'
+        params = ()
+        if domain_focus:
+            query += ' WHERE domain_focus = ?'
+            params = (domain_focus,)
+        query += ' GROUP BY dimension ORDER BY total DESC'
+        labels = {dimension['key']: dimension['label'] for dimension in SKILL_DIMENSIONS}
+        return [{'dimension': dimension, 'label': labels.get(dimension, dimension), 'count': count}
+                for dimension, count in self._connection().execute(query, params)]
+
+assessment_history = AssessmentHistory()
+
+# Live cohort statistics for percentile ranking on /results. Each worker keeps
+# its own submissions in memory; a background thread writes them to a
+# WorkerSnapshots file and reloads the other (and exited) workers' counts.
+COHORT_STATS_DIR = os.environ.get('PRS_STATS_DIR', os.path.join(app.instance_path, 'cohort_stats'))
+COHORT_STATS_PERSIST_SECONDS = float(os.environ.get('PRS_STATS_PERSIST_SECONDS', 60))
+SCORE_BINS = 1001  # overall_score has 0.1 resolution on 0-100
+# Below this many other submissions in a domain /results leaves the percentile out
+COHORT_MIN_PEERS = int(os.environ.get('PRS_STATS_MIN_PEERS', 5))
+
+class ScoreDistribution:
+    """Fixed-bin histogram of overall_score with running mean and variance"""
+    
+    __slots__ = ('counts', 'count', 'mean', 'm2')
+    
+    def __init__(self):
+        self.counts = np.zeros(SCORE_BINS, dtype=np.int64)
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+    
+    def add(self, score):
+        """O(1) update (Welford)"""
+        self.counts[min(SCORE_BINS - 1, max(0, int(round(score * 10))))] += 1
+        self.count += 1
+        delta = score - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (score - self.mean)
+    
+    def merge(self, other):
+        """Fold another distribution in (Chan et al. parallel update)"""
+        if not other.count:
+            return self
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        self.counts += other.counts
+        return self
+    
+    @property
+    def variance(self):
+        return self.m2 / self.count if self.count else 0.0
+    
+    def quantile(self, q):
+        """Score below which a fraction q of assessments fall, in O(bins)"""
+        if not self.count:
+            return None
+        return int(np.searchsorted(np.cumsum(self.counts), q * self.count)) / 10
+    
+    def to_dict(self):
+        nonzero = np.flatnonzero(self.counts)
+        return {'bins': dict(zip(nonzero.tolist(), self.counts[nonzero].tolist())),
+                'count': self.count, 'mean': self.mean, 'm2': self.m2}
+    
+    @classmethod
+    def from_dict(cls, data):
+        distribution = cls()
+        for index, count in data['bins'].items():
+            distribution.counts[int(index)] = count
+        distribution.count, distribution.mean, distribution.m2 = data['count'], data['mean'], data['m2']
+        return distribution
+
+def percentile_rank(distributions, score, exclude=0, min_count=1):
+    """Percent of assessments scoring below score (ties count half), leaving out exclude of them at score, in O(bins)"""
+    index = min(SCORE_BINS - 1, max(0, int(round(score * 10))))
+    below = sum(int(distribution.counts[:index].sum()) for distribution in distributions)
+    equal = sum(int(distribution.counts[index]) for distribution in distributions)
+    total = sum(distribution.count for distribution in distributions)
+    # Another worker may not have synced the submission yet, so never drop more than are there
+    excluded = min(exclude, equal)
+    equal -= excluded
+    total -= excluded
+    if total < max(1, min_count):
+        return None
+    return 100 * (below + 0.5 * equal) / total
+
+class DomainDistributions(dict):
+    """A ScoreDistribution per domain, in the form WorkerSnapshots stores"""
+    
+    def merge(self, other):
+        for domain_focus, distribution in other.items():
+            self.setdefault(domain_focus, ScoreDistribution()).merge(distribution)
+        return self
+    
+    def to_dict(self):
+        return {domain_focus: distribution.to_dict() for domain_focus, distribution in self.items()}
+    
+    @classmethod
+    def from_dict(cls, data):
+        return cls((domain_focus, ScoreDistribution.from_dict(value)) for domain_focus, value in data.items())
+
+class CohortStats:
+    """Per-domain score distributions shared across workers through snapshot files"""
+    
+    def __init__(self, directory=COHORT_STATS_DIR, persist_seconds=COHORT_STATS_PERSIST_SECONDS):
+        self.snapshots = WorkerSnapshots(directory, DomainDistributions)
+        self.persist_seconds = persist_seconds
+        self._lock = threading.Lock()
+        self._pid = None
+        self.local = DomainDistributions()
+        self.others = DomainDistributions()
+    
+    def _ensure_process(self):
+        """Start fresh local counts in each new worker process (caller holds the lock)"""
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self.local = DomainDistributions()
+            if self.snapshots.enabled:
+                # Once per process, so the first percentile already sees the other workers
+                self.others = self._collect()
+                self.snapshots.sync_every(self.persist_seconds, self.sync)
+    
+    def sync(self):
+        """Write this worker's counts and reload everyone else's (runs off the request path)"""
+        with self._lock:
+            data = self.local.to_dict()
+        try:
+            self.snapshots.write(data)
+        except OSError as e:
+            app.logger.warning('Could not save cohort statistics: %s', e)
+        others = self._collect()
+        with self._lock:
+            self.others = others
+    
+    def _collect(self):
+        try:
+            return self.snapshots.collect()
+        except (OSError, ValueError) as e:
+            app.logger.warning('Could not load cohort statistics: %s', e)
+            return DomainDistributions()
+    
+    def add(self, domain_focus, score):
+        with self._lock:
+            self._ensure_process()
+            self.local.setdefault(domain_focus, ScoreDistribution()).add(score)
+    
+    def distributions(self, domain_focus):
+        with self._lock:
+            self._ensure_process()
+            return [part[domain_focus] for part in (self.local, self.others) if domain_focus in part]
+    
+    def percentile(self, domain_focus, score):
+        """A candidate's rank among the other submissions, or None while there are too few"""
+        return percentile_rank(self.distributions(domain_focus), score, exclude=1, min_count=COHORT_MIN_PEERS)
+    
+    def summary(self):
+        """Count, mean, standard deviation and quartiles per domain"""
+        with self._lock:
+            self._ensure_process()
+            merged = DomainDistributions().merge(self.others).merge(self.local)
+        return {
+            domain_focus: {
+                'count': distribution.count,
+                'mean': round(distribution.mean, 2),
+                'std': round(distribution.variance ** 0.5, 2),
+                'p25': distribution.quantile(0.25),
+                'p50': distribution.quantile(0.5),
+                'p75': distribution.quantile(0.75)
+            }
+            for domain_focus, distribution in sorted(merged.items())
+        }
+
+cohort_stats = CohortStats()
+
+# On-demand profiling, off unless PRS_PROFILE_TOKEN is set. Requests must send
+# the token in an X-Profile-Token header. A stack sampler runs in the
+# background of one worker and writes a collapsed-stack file (flamegraph.pl /
+# speedscope input) to PRS_PROFILE_DIR so any worker can serve the result.
+PROFILE_TOKEN = os.environ.get('PRS_PROFILE_TOKEN', '')
+PROFILE_DIR = os.environ.get('PRS_PROFILE_DIR', os.path.join(app.instance_path, 'profiles'))
+PROFILE_MAX_SECONDS = 60
+PROFILE_STATS_LINES = 40
+
+def profile_authorized():
+    """True when profiling is enabled and the request carries the token"""
+    token = request.headers.get('X-Profile-Token', '')
+    return bool(PROFILE_TOKEN) and secrets.compare_digest(token.encode(), PROFILE_TOKEN.encode())
+
+class StackSampler:
+    """Collapsed-stack sampler for this worker, driven by SIGALRM or a polling thread"""
+    
+    _running = threading.Lock()
+    
+    def __init__(self, seconds, interval, mode):
+        self.seconds = seconds
+        self.interval = interval
+        self.mode = mode
+        self.counts = Counter()
+        self.samples = 0
+        self._labels = {}
+    
+    @staticmethod
+    def signal_mode_available():
+        return hasattr(signal, 'setitimer') and threading.current_thread() is threading.main_thread()
+    
+    def _label(self, code):
+        label = self._labels.get(code)
+        if label is None:
+            filename = os.path.join(*code.co_filename.split(os.sep)[-2:])
+            label = self._labels[code] = f'{code.co_name} ({filename}:{code.co_firstlineno})'
+        return label
+    
+    def add_stack(self, frame, thread_name):
+        stack = []
+        while frame is not None:
+            stack.append(self._label(frame.f_code))
+            frame = frame.f_back
+        stack.append(thread_name)
+        self.counts[';'.join(reversed(stack))] += 1
+    
+    def collapsed(self):
+        return ''.join(f'{stack} {count}\n' for stack, count in self.counts.most_common())
+    
+    def start(self, path):
+        """Begin sampling; the result is moved into place at path when done"""
+        if not StackSampler._running.acquire(blocking=False):
+            return False
+        self.path = path
+        self.deadline = time.monotonic() + self.seconds
+        # A signal samples the main thread (a sync worker's request thread) wherever it is;
+        # the poller sees every thread but only runs when the GIL is released, so it favours C calls
+        if self.mode == 'signal':
+            self._previous_handler = signal.signal(signal.SIGALRM, self._on_signal)
+            signal.setitimer(signal.ITIMER_REAL, self.interval, self.interval)
+        else:
+            threading.Thread(target=self._poll, name='stack-sampler', daemon=True).start()
+        return True
+    
+    def _on_signal(self, signum, frame):
+        self.add_stack(frame, 'MainThread')
+        self.samples += 1
+        if time.monotonic() >= self.deadline:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, self._previous_handler)
+            self._finish()
+    
+    def _poll(self):
+        own = threading.get_ident()
+        while time.monotonic() < self.deadline:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident != own:
+                    self.add_stack(frame, names.get(ident, f'thread-{ident}'))
+            self.samples += 1
+            time.sleep(self.interval)
+        self._finish()
+    
+    def _finish(self):
+        try:
+            with open(self.path + '.tmp', 'w') as f:
+                f.write(f'# pid={os.getpid()} mode={self.mode} samples={self.samples} interval={self.interval}s\n')
+                f.write(self.collapsed())
+            os.replace(self.path + '.tmp', self.path)
+        except OSError as e:
+            app.logger.error('Could not write profile %s: %s', self.path, e)
+        finally:
+            StackSampler._running.release()
+
+def profile_path(profile_id):
+    return os.path.join(PROFILE_DIR, f'{profile_id}.collapsed')
+
+# Only one cProfile profiler can be active per process
+_request_profile_lock = threading.Lock()
+
+def start_request_profile():
+    """Run the rest of a ?profile=1 request under cProfile, or answer 409 while another one is"""
+    if request.args.get('profile') == '1' and profile_authorized():
+        if not _request_profile_lock.acquire(blocking=False):
+            return jsonify({'error': 'A profiled request is already running in this worker'}), 409
+        import cProfile
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            _request_profile_lock.release()
+            return jsonify({'error': 'Another profiler is active in this worker'}), 409
+        g.profiler = profiler
+
+def finish_request_profile(response):
+    """Replace the response of a profiled request with its cProfile stats"""
+    profiler = g.get('profiler')
+    if profiler is None:
+        return response
+    profiler.disable()
+    import pstats
+    output = io.StringIO()
+    limit = request.args.get('profile_lines', PROFILE_STATS_LINES, type=int)
+    pstats.Stats(profiler, stream=output).sort_stats('cumulative').print_stats(limit)
+    profiled = app.response_class(output.getvalue(), mimetype='text/plain')
+    profiled.headers['X-Profiled-Status'] = str(response.status_code)
+    profiled.headers['Cache-Control'] = 'no-store'
+    return profiled
+
+def release_request_profile(exc):
+    """Stop the profiler and free the slot, also when the request failed"""
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profiler.disable()
+        _request_profile_lock.release()
+
+if PROFILE_TOKEN:
+    app.before_request(start_request_profile)
+    app.after_request(finish_request_profile)
+    app.teardown_request(release_request_profile)
+
+# Opt-in traffic capture for replay.py, off unless PRS_CAPTURE_PATH is set.
+# Each request becomes one JSON line holding the route, method, whitelisted
+# query/form/JSON fields (never cookies, headers or free text), status and
+# duration. Records are queued on the request path and appended in batches by
+# a background writer; a full queue drops records rather than wait. Clients
+# are linked by a keyed hash of their assessment ID so /results reloads replay
+# against the assessment that produced them.
+CAPTURE_PATH = os.environ.get('PRS_CAPTURE_PATH', '')
+CAPTURE_QUEUE_SIZE = int(os.environ.get('PRS_CAPTURE_QUEUE_SIZE', 10000))
+CAPTURE_BATCH_ROWS = int(os.environ.get('PRS_CAPTURE_BATCH_ROWS', 500))
+CAPTURE_FLUSH_SECONDS = float(os.environ.get('PRS_CAPTURE_FLUSH_SECONDS', 1.0))
+CAPTURE_QUERY_FIELDS = ('dashboard', 'input', 'format', 'domain', 'days')
+CAPTURE_SKIP_ENDPOINTS = {'static', 'asset', 'metrics', 'profile_sample', 'profile_result', 'model_reload',
+                          'catalog_reload'}
+# These read request.stream lazily while the response streams, after this hook runs
+CAPTURE_STREAMED_ENDPOINTS = {'cohort_import'}
+
+def sanitize_fields(source):
+    """Only the assessment fields of a form or JSON object, as plain scalars"""
+    return {field: source[field] for field in MODEL_FEATURES
+            if field in source and isinstance(source[field], (str, int, float))}
+
+class TrafficCapture:
+    """Buffered JSONL request log for offline replay"""
+    
+    def __init__(self, path=CAPTURE_PATH, queue_size=CAPTURE_QUEUE_SIZE,
+                 batch_rows=CAPTURE_BATCH_ROWS, flush_seconds=CAPTURE_FLUSH_SECONDS):
+        self.path = path
+        self._writer = BatchWriter(self._write, 'capture-writer', queue_size, batch_rows, flush_seconds)
+        self.stats = {'queued': 0, 'written': 0, 'dropped': 0, 'batches': 0, 'errors': 0}
+    
+    @property
+    def enabled(self):
+        return bool(self.path)
+    
+    def client_key(self):
+        """Stable pseudonym for the session's assessment, or None before one exists"""
+        # Reading must not mark the session accessed, or every page would gain Vary: Cookie
+        accessed = session.accessed
+        assessment_id = session.get('assessment_id')
+        session.accessed = accessed
+        if assessment_id is None:
+            return None
+        digest = hashlib.sha256(f'{app.secret_key}:{assessment_id}'.encode()).hexdigest()
+        return digest[:16]
+    
+    def start_request(self):
+        g.capture_start = time.perf_counter()
+    
+    def finish_request(self, response):
+        """Queue a sanitized record of the request; never blocks it"""
+        endpoint = request.endpoint
+        if endpoint in CAPTURE_SKIP_ENDPOINTS or 'capture_start' not in g:
+            return response
+        record = {
+            't': round(time.time(), 3),
+            'client': self.client_key(),
+            'method': request.method,
+            'path': request.path,
+            'route': request.url_rule.rule if request.url_rule is not None else None,
+            'status': response.status_code,
+            'duration_ms': round((time.perf_counter() - g.capture_start) * 1000, 3)
+        }
+        query = {key: request.args[key] for key in CAPTURE_QUERY_FIELDS if key in request.args}
+        if query:
+            record['query'] = query
+        if request.method == 'POST' and endpoint not in CAPTURE_STREAMED_ENDPOINTS:
+            if request.mimetype in ('application/x-www-form-urlencoded', 'multipart/form-data'):
+                record['form'] = sanitize_fields(request.form)
+            elif request.is_json:
+                body = request.get_json(silent=True)
+                if isinstance(body, dict):
+                    record['json'] = sanitize_fields(body)
+                elif isinstance(body, list):
+                    record['json'] = [sanitize_fields(row) for row in body if isinstance(row, dict)]
+        if request.method == 'POST' and 'form' not in record and 'json' not in record:
+            # CSV and streamed bodies are not captured; replay.py skips these
+            record['body_bytes'] = request.content_length or 0
+            record['content_type'] = request.mimetype
+        
+        self.stats['queued' if self._writer.put(record) else 'dropped'] += 1
+        return response
+    
+    def flush(self):
+        """Write everything queued so far (also runs at exit); the next request restarts the writer"""
+        self._writer.stop()
+    
+    def _write(self, batch):
+        """Append a batch under an exclusive lock so workers never interleave lines"""
+        data = ''.join(json.dumps(record, separators=(',', ':')) + '\n' for record in batch)
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                f.write(data)
+            self.stats['written'] += len(batch)
+            self.stats['batches'] += 1
+        except OSError as e:
+            self.stats['errors'] += 1
+            app.logger.warning('Could not write captured requests: %s', e)
+
+traffic_capture = TrafficCapture()
+
+if traffic_capture.enabled:
+    app.before_request(traffic_capture.start_request)
+    app.after_request(traffic_capture.finish_request)
+
+def parse_batch_rows():
+    """Read batch rows from a JSON array or a CSV body with a header row"""
+    if request.mimetype in ('text/csv', 'application/csv'):
+        # utf-8-sig drops the byte order mark Excel writes, which would otherwise prefix the first header
+        text = request.get_data().decode('utf-8-sig', errors='replace')
+        return list(csv.DictReader(io.StringIO(text)))
+    
+    rows = request.get_json(silent=True)
+    if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+        raise ValueError('Expected a JSON array of objects or a CSV body')
+    return rows
+
+# Rendered once per worker: these pages depend only on static tables
+PAGE_CACHE_CONTROL = 'public, no-cache'
+PRIVATE_PAGE_CACHE_CONTROL = 'private, no-cache'
+PAGE_ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+class CachedPage:
+    """A rendered page body with its strong ETag and precompressed variants"""
+    
+    def __init__(self, html, status=200):
+        self.status = status
+        self.bodies = {'identity': html.encode('utf-8')}
+        self.bodies['gzip'] = gzip.compress(self.bodies['identity'], compresslevel=9, mtime=0)
+        if brotli is not None:
+            self.bodies['br'] = brotli.compress(self.bodies['identity'])
+        digest = hashlib.sha256(self.bodies['identity']).hexdigest()[:32]
+        self.etags = {encoding: digest if encoding == 'identity' else f'{digest}-{encoding}'
+                      for encoding in self.bodies}
+
+_page_cache = {}
+_fragment_cache = {}
+
+def cached_page_response(key, render_page, status=200, cache_control=PAGE_CACHE_CONTROL):
+    """Serve a page from the per-worker render cache; key must cover every input"""
+    if app.debug:
+        return render_page(), status
+    
+    page = _page_cache.get(key)
+    if page is None:
+        page = _page_cache[key] = CachedPage(render_page(), status)
+    
+    encoding = next((name for name in PAGE_ENCODINGS if request.accept_encodings[name]), 'identity')
+    response = app.response_class(status=page.status, mimetype='text/html')
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.headers['Cache-Control'] = cache_control
+    response.set_etag(page.etags[encoding])
+    
+    if page.status == 200 and request.if_none_match.contains(page.etags[encoding]):
+        response.status_code = 304
+        return response
+    
+    response.set_data(page.bodies[encoding])
+    if encoding != 'identity':
+        response.headers['Content-Encoding'] = encoding
+    return response
+
+def render_fragment(template_name, key, **context):
+    """Render a partial template once per key and reuse the markup"""
+    if app.debug:
+        return Markup(render_template(template_name, **context))
+    
+    cache_key = (template_name,) + key
+    fragment = _fragment_cache.get(cache_key)
+    if fragment is None:
+        fragment = _fragment_cache[cache_key] = Markup(render_template(template_name, **context))
+    return fragment
+
+def reload_catalog(path=CATALOG_PATH):
+    """Swap in the catalog file's tables and drop every page and fragment rendered from the old ones"""
+    global CATALOG, search_index
+    domains, project_suggestions, learning_resources = load_content_tables(path)
+    if list(domains) != list(CATALOG.domains):
+        raise ValueError('Domain keys are model features; restart the app to add or remove domains')
+    catalog = ContentCatalog(domains, project_suggestions, learning_resources)
+    index = SearchIndex.from_catalog(catalog)
+    for table, values in ((DOMAINS, domains), (PROJECT_SUGGESTIONS, project_suggestions),
+                          (LEARNING_RESOURCES, learning_resources)):
+        table.update(values)
+    CATALOG, search_index = catalog, index
+    _page_cache.clear()
+    _fragment_cache.clear()
+    return catalog
+
+# Static asset pipeline: minified, content-hashed copies of static/ with
+# precompressed .gz/.br siblings in static/dist, served from /assets with
+# immutable caching. Built by `flask build-assets` (or by preload() when the
+# manifest is missing or stale); without a manifest, templates fall back to
+# the plain /static URLs.
+ASSET_DIST_DIR = os.path.join(app.static_folder, 'dist')
+ASSET_MANIFEST_PATH = os.path.join(ASSET_DIST_DIR, 'manifest.json')
+ASSET_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+ASSET_COMPRESSIBLE = ('.css', '.js', '.svg', '.json', '.txt', '.html')
+ASSET_SUFFIXES = {'identity': '', 'gzip': '.gz', 'br': '.br'}
+# A '/' after one of these (or at the start) opens a JS regex literal; elsewhere it divides
+JS_REGEX_PRECEDERS = frozenset('(,=:[!&|?{};+-*%<>~^')
+JS_REGEX_KEYWORDS = frozenset(('return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void',
+                               'throw', 'case', 'do', 'else', 'yield', 'await'))
+
+def regex_allowed(code, allowed):
+    """Whether a '/' right after this code opens a regex; allowed carries over for blank code"""
+    code = code.rstrip()
+    if not code:
+        return allowed
+    if code.endswith(('++', '--')):
+        return False
+    word = re.search(r'[A-Za-z_$][\w$]*$', code)
+    if word is not None:
+        return word.group() in JS_REGEX_KEYWORDS
+    return code[-1] in JS_REGEX_PRECEDERS
+
+def regex_literal_end(text, index):
+    """Index just past the regex literal (and its flags) starting at index, or None"""
+    end, in_class = index + 1, False
+    while end < len(text) and text[end] != '\n':
+        char = text[end]
+        if char == '\\':
+            end += 1
+        elif char == '[':
+            in_class = True
+        elif char == ']':
+            in_class = False
+        elif char == '/' and not in_class:
+            end += 1
+            while end < len(text) and text[end].isalpha():
+                end += 1
+            return end
+        end += 1
+    return None
+
+def split_source(text, line_comments=False, template_strings=False, regex_literals=False):
+    """Split CSS/JS into ('code', ...) and ('string', ...) pieces, dropping comments"""
+    quotes = '\'"`' if template_strings else '\'"'
+    pieces = [('code', '')]
+    allowed = True
+    
+    def add_code(code):
+        if pieces[-1][0] == 'code':
+            pieces[-1] = ('code', pieces[-1][1] + code)
+        else:
+            pieces.append(('code', code))
+    
+    code_start = index = 0
+    while index < len(text):
+        char = text[index]
+        if char in quotes:
+            end = index + 1
+            while end < len(text) and text[end] != char:
+                end += 2 if text[end] == '\\' else 1
+            add_code(text[code_start:index])
+            pieces.append(('string', text[index:end + 1]))
+            code_start = index = end + 1
+            allowed = False
+        elif text.startswith('/*', index) or (line_comments and text.startswith('//', index)):
+            end = text.find('*/', index) + 2 if text[index + 1] == '*' else text.find('\n', index)
+            end = len(text) if end < index else end
+            allowed = regex_allowed(text[code_start:index], allowed)
+            add_code(text[code_start:index] + ' ')
+            code_start = index = end
+        elif (char == '/' and regex_literals and regex_allowed(text[code_start:index], allowed)
+              and regex_literal_end(text, index) is not None):
+            # Kept verbatim like a string, so quotes and '//' inside it are left alone
+            end = regex_literal_end(text, index)
+            add_code(text[code_start:index])
+            pieces.append(('string', text[index:end]))
+            code_start = index = end
+            allowed = False
+        else:
+            index += 1
+    add_code(text[code_start:])
+    return pieces
+
+def minify_css(text):
+    out = []
+    for kind, piece in split_source(text):
+        if kind == 'code':
+            piece = re.sub(r'\s+', ' ', piece)
+            piece = re.sub(r' ?([{};,>]) ?', r'\1', piece)
+            piece = piece.replace(': ', ':').replace(';}', '}')
+        out.append(piece)
+    return ''.join(out).strip()
+
+def minify_js(text):
+    """Drop comments, indentation and blank lines; newlines stay for ASI"""
+    out = []
+    for kind, piece in split_source(text, line_comments=True, template_strings=True, regex_literals=True):
+        if kind == 'code':
+            piece = re.sub(r'[ \t]*\n[ \t\n]*', '\n', piece)
+        out.append(piece)
+    return ''.join(out).strip() + '\n'
+
+ASSET_MINIFIERS = {'.css': minify_css, '.js': minify_js}
+
+def build_assets(source_dir=app.static_folder, dist_dir=ASSET_DIST_DIR):
+    """Write fingerprinted (and compressed) copies of every static file plus the manifest"""
+    # Older fingerprinted files are kept so pages cached before a deploy can still load their assets
+    manifest = {}
+    for root, dirs, files in os.walk(source_dir):
+        dirs[:] = sorted(d for d in dirs if os.path.join(root, d) != dist_dir)
+        for filename in sorted(files):
+            source_path = os.path.join(root, filename)
+            name = os.path.relpath(source_path, source_dir).replace(os.sep, '/')
+            stem, ext = os.path.splitext(name)
+            with open(source_path, 'rb') as f:
+                source = f.read()
+            content = source
+            if ext in ASSET_MINIFIERS:
+                content = ASSET_MINIFIERS[ext](source.decode('utf-8')).encode('utf-8')
+            
+            path = f'{stem}.{hashlib.sha256(content).hexdigest()[:12]}{ext}'
+            variants = {'identity': content}
+            if ext in ASSET_COMPRESSIBLE:
+                variants['gzip'] = gzip.compress(content, compresslevel=9, mtime=0)
+                if brotli is not None:
+                    variants['br'] = brotli.compress(content)
+            variants = {encoding: body for encoding, body in variants.items()
+                        if encoding == 'identity' or len(body) < len(content)}
+            
+            os.makedirs(os.path.dirname(os.path.join(dist_dir, path)), exist_ok=True)
+            for encoding, body in variants.items():
+                target = os.path.join(dist_dir, path + ASSET_SUFFIXES[encoding])
+                with open(target + '.tmp', 'wb') as f:
+                    f.write(body)
+                os.replace(target + '.tmp', target)
+            manifest[name] = {
+                'path': path,
+                'encodings': [encoding for encoding in ('br', 'gzip') if encoding in variants],
+                'bytes': {encoding: len(body) for encoding, body in variants.items()},
+                'source_bytes': len(source),
+                'source_sha256': hashlib.sha256(source).hexdigest()
+            }
+    
+    manifest_path = os.path.join(dist_dir, 'manifest.json')
+    with open(manifest_path + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(manifest_path + '.tmp', manifest_path)
+    return manifest
+
+def load_asset_manifest(path=ASSET_MANIFEST_PATH, source_dir=app.static_folder):
+    """The built manifest, or {} when it is missing or any source has changed since"""
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+        for name, entry in manifest.items():
+            if file_sha256(os.path.join(source_dir, name)) != entry['source_sha256']:
+                print(f"⚠ Warning: static/{name} changed since the last asset build; "
+                      f"serving unfingerprinted assets", file=sys.stderr)
+                return {}
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError, KeyError) as e:
+        print(f"⚠ Warning: Could not load the asset manifest: {e}", file=sys.stderr)
+        return {}
+    return manifest
+
+asset_manifest = {}
+asset_paths = {}
+
+def install_asset_manifest(manifest):
+    asset_manifest.clear()
+    asset_manifest.update(manifest)
+    asset_paths.clear()
+    asset_paths.update({entry['path']: entry for entry in manifest.values()})
+
+install_asset_manifest(load_asset_manifest())
+
+@app.template_global()
+def asset_url(filename):
+    """url_for('static', filename=...) that prefers the fingerprinted build"""
+    entry = asset_manifest.get(filename)
+    if entry is None or app.debug:
+        return url_for('static', filename=filename)
+    return url_for('asset', filename=entry['path'])
+
+@app.route('/')
+def home():
+    """Home page"""
+    return cached_page_response('home', lambda: render_template('index.html', 
+                                                                domains=DOMAINS, 
+                                                                company=COMPANY_INFO))
+
+@app.route('/about')
+def about():
+    """About page"""
+    return cached_page_response('about', lambda: render_template('about.html', 
+                                                                 team=TEAM_MEMBERS, 
+                                                                 company=COMPANY_INFO))
+
+@app.route('/assessment', methods=['GET', 'POST'])
+def assessment():
+    """Assessment page"""
+    if request.method == 'POST':
+        try:
+            inputs = clamp_inputs(request.form)
+            overall_score, is_ready = score_inputs(inputs)
+            
+            session.pop('assessment_data', None)
+            session['assessment_id'] = assessment_store.save({
+                **inputs,
+                'prediction': is_ready,
+                'overall_score': overall_score
+            })
+            assessment_history.record(inputs, overall_score, is_ready)
+            cohort_stats.add(inputs['domain_focus'], overall_score)
+            
+            return redirect(url_for('results'))
+            
+        except Exception as e:
+            print(f"Error during assessment: {e}")
+            print(traceback.format_exc())
+            return render_template('assessment.html', 
+                                 domains=DOMAINS, 
+                                 company=COMPANY_INFO,
+                                 error=f"Please check your inputs and try again. Error: {str(e)}")
+    
+    return render_template('assessment.html', 
+                         domains=DOMAINS, 
+                         company=COMPANY_INFO)
+
+@app.route('/results')
+def results():
+    """Results page"""
+    try:
+        assessment_data = load_assessment_data()
+        if assessment_data is None:
+            return redirect(url_for('assessment'))
+        
+        domain_key = CATALOG.resolve_domain(assessment_data['domain_focus'])
+        prediction = assessment_data['prediction']
+        overall_score = assessment_data['overall_score']
+        domain_info = CATALOG.domains[domain_key]
+        
+        domain_fragment = render_fragment('partials/results_domain.html',
+                                          (domain_key, prediction),
+                                          suggestions=CATALOG.top_suggestions[(str(prediction), domain_key)],
+                                          resources=CATALOG.top_resources[domain_key],
+                                          domain=domain_info)
+        
+        percentile = cohort_stats.percentile(domain_key, overall_score)
+        
+        return render_template('results.html',
+                             assessment_data=assessment_data,
+                             domain_fragment=domain_fragment,
+                             percentile=round(percentile) if percentile is not None else None,
+                             domain=domain_info,
+                             domain_key=domain_key,
+                             company=COMPANY_INFO,
+                             overall_score=overall_score)
+    
+    except Exception as e:
+        print(f"Error in results route: {e}")
+        print(traceback.format_exc())
+        return render_template('500.html', 
+                             error=str(e),
+                             company=COMPANY_INFO), 500
+
+@app.route('/dashboard')
+def dashboard():
+    """Dashboard page"""
+    try:
+        assessment_data = load_assessment_data()
+        if assessment_data is None:
+            return redirect(url_for('assessment'))
+        
+        overall_score = assessment_data['overall_score']
+        
+        dashboard_data = build_dashboard(assessment_data)
+        
+        return render_template('dashboard.html',
+                             assessment_data=assessment_data,
+                             skill_data=dashboard_data['skill_data'],
+                             improvement_tips=dashboard_data['improvement_tips'],
+                             overall_score=int(overall_score),
+                             company=COMPANY_INFO)
+    
+    except Exception as e:
+        print(f"Error in dashboard route: {e}")
+        print(traceback.format_exc())
+        return render_template('500.html', 
+                             error=str(e),
+                             company=COMPANY_INFO), 500
+
+@app.route('/projects')
+def projects():
+    """Project suggestions page"""
+    try:
+        assessment_data = load_assessment_data()
+        if assessment_data is None:
+            return redirect(url_for('assessment'))
+        
+        domain_key = CATALOG.resolve_domain(assessment_data['domain_focus'])
+        prediction = assessment_data['prediction']
+        domain_info = CATALOG.domains[domain_key]
+        
+        # The page only varies by domain and prediction
+        return cached_page_response(('projects', domain_key, prediction),
+                                    lambda: render_template('projects.html',
+                                                            suggestions=CATALOG.suggestions[(str(prediction), domain_key)],
+                                                            resources=CATALOG.resources[domain_key],
+                                                            domain=domain_info,
+                                                            assessment_data=assessment_data,
+                                                            company=COMPANY_INFO),
+                                    cache_control=PRIVATE_PAGE_CACHE_CONTROL)
+    
+    except Exception as e:
+        print(f"Error in projects route: {e}")
+        print(traceback.format_exc())
+        return render_template('500.html', 
+                             error=str(e),
+                             company=COMPANY_INFO), 500
+
+@app.route('/learning-resources')
+def learning_resources():
+    """Learning resources page"""
+    try:
+        assessment_data = load_assessment_data()
+        if assessment_data is None:
+            return redirect(url_for('assessment'))
+        
+        domain_key = CATALOG.resolve_domain(assessment_data['domain_focus'])
+        domain_info = CATALOG.domains[domain_key]
+        
+        # The page only varies by domain and prediction
+        return cached_page_response(('learning_resources', domain_key, assessment_data['prediction']),
+                                    lambda: render_template('learning_resources.html',
+                                                            resources=CATALOG.resources[domain_key],
+                                                            domain=domain_info,
+                                                            assessment_data=assessment_data,
+                                                            company=COMPANY_INFO),
+                                    cache_control=PRIVATE_PAGE_CACHE_CONTROL)
+    
+    except Exception as e:
+        print(f"Error in learning_resources route: {e}")
+        print(traceback.format_exc())
+        return render_template('500.html', 
+                             error=str(e),
+                             company=COMPANY_INFO), 500
+
+@app.route('/reset')
+def reset():
+    """Reset session and start over"""
+    if 'assessment_id' in session:
+        assessment_store.delete(session['assessment_id'])
+    session.clear()
+    return redirect(url_for('assessment'))
+
+@app.route('/assets/<path:filename>')
+def asset(filename):
+    """Fingerprinted static asset, precompressed when the client accepts it"""
+    entry = asset_paths.get(filename)
+    if entry is None:
+        abort(404)
+    
+    encoding = next((name for name in entry['encodings'] if request.accept_encodings[name]), 'identity')
+    response = send_from_directory(ASSET_DIST_DIR, filename + ASSET_SUFFIXES[encoding],
+                                   mimetype=mimetypes.guess_type(filename)[0])
+    response.headers['Cache-Control'] = ASSET_CACHE_CONTROL
+    response.headers['Vary'] = 'Accept-Encoding'
+    if encoding != 'identity':
+        response.headers['Content-Encoding'] = encoding
+    return response
+
+@app.route('/api/health')
+def health_check():
+    """Health check endpoint"""
+    model_version = predictor.version
+    return jsonify({
+        'status': 'healthy', 
+        'service': 'placement-readiness',
+        'version': '1.0.0',
+        'model_version': model_version['sha256'][:12] if model_version is not None else None,
+        'model_loaded_at': model_version['loaded_at'] if model_version is not None else None,
+        'pid': os.getpid(),
+        'admission': admission_controller.describe()
+    })
+
+@app.route('/api/assess/batch', methods=['POST'])
+def assess_batch():
+    """Score a whole cohort (JSON array or CSV) in one vectorized pass; ?dashboard=1 adds breakdowns and tips"""
+    start = time.perf_counter()
+    try:
+        rows = parse_batch_rows()
+        if len(rows) > MAX_BATCH_ROWS:
+            return jsonify({'error': f'Batch too large: {len(rows)} rows (max {MAX_BATCH_ROWS})'}), 413
+        columns = clamp_input_arrays(rows)
+    except (ValueError, TypeError) as e:
+        return jsonify({'error': f'Invalid batch: {str(e)}'}), 400
+    
+    scores, predictions = score_input_arrays(columns)
+    level_indices = get_level_indices(scores)
+    
+    results = [
+        {
+            'dsa_level': dsa_level,
+            'problem_count': problem_count,
+            'project_count': project_count,
+            'github_quality': github_quality,
+            'domain_focus': domain_focus,
+            'overall_score': overall_score,
+            'prediction': prediction,
+            'level': level,
+            'readiness': readiness
+        }
+        for dsa_level, problem_count, project_count, github_quality, domain_focus,
+            overall_score, prediction, level, readiness in zip(
+            columns['dsa_level'].tolist(), columns['problem_count'].tolist(),
+            columns['project_count'].tolist(), columns['github_quality'].tolist(),
+            columns['domain_focus'].tolist(), scores.tolist(), predictions.tolist(),
+            LEVEL_NAMES[level_indices].tolist(), READINESS_LABELS[level_indices].tolist())
+    ]
+    
+    if request.args.get('dashboard') == '1':
+        dashboards = build_dashboards(np.column_stack([columns[field] for field in INPUT_FIELDS]), scores)
+        for result, dashboard_data in zip(results, dashboards):
+            result.update(dashboard_data)
+    
+    elapsed = time.perf_counter() - start
+    return jsonify({
+        'count': len(results),
+        'results': results,
+        'elapsed_ms': round(elapsed * 1000, 3),
+        'rows_per_sec': round(len(results) / elapsed, 1) if elapsed > 0 else None
+    })
+
+@app.route('/api/cohort/import', methods=['POST'])
+def cohort_import():
+    """Stream-score a CSV or NDJSON cohort body back in the input format (or ?format=csv|ndjson)"""
+    input_format = cohort_format(request.args.get('input') or request.mimetype)
+    output_format = cohort_format(request.args.get('format'), default=input_format)
+    # Decoded line by line, so one bad byte rejects its row instead of ending the stream
+    lines = iter_decoded_lines(io.BufferedReader(request.stream), encoding='utf-8-sig')
+    
+    def generate():
+        stats = new_cohort_stats()
+        yield from iter_cohort_output(
+            iter_scored_cohort(iter_cohort_records(lines, input_format), stats), output_format)
+        summary = cohort_summary(stats)
+        print(f"✓ Cohort import: {summary}", file=sys.stderr)
+        if output_format == 'ndjson':
+            yield json.dumps({'summary': summary}) + '\n'
+    
+    return app.response_class(stream_with_context(generate()), mimetype=COHORT_MIMETYPES[output_format])
+
+@app.route('/api/check-readiness', methods=['POST'])
+def check_readiness():
+    """Lean JSON scorer for the live preview on the assessment form"""
+    body = request.get_json(silent=True) or {}
+    if not isinstance(body, dict):
+        return jsonify({'error': 'Expected a JSON object'}), 400
+    try:
+        inputs = clamp_inputs(body)
+    except (ValueError, TypeError) as e:
+        return jsonify({'error': f'Invalid input: {str(e)}'}), 400
+    
+    overall_score, prediction = score_inputs(inputs)
+    level_info = get_level_description(overall_score)
+    
+    return jsonify({
+        'overall_score': overall_score,
+        'prediction': prediction,
+        'level': level_info['level'],
+        'readiness': level_info['readiness'],
+        'domain_focus': inputs['domain_focus'],
+        'domain_name': DOMAINS[inputs['domain_focus']]['name']
+    })
+
+@app.route('/api/model/stats')
+def model_stats():
+    """Inference counters for the readiness model"""
+    return jsonify({
+        'model_loaded': predictor.model is not None,
+        'model_loading': not predictor.loaded,
+        'model_version': predictor.version,
+        'predictor': predictor.stats,
+        'batcher': prediction_batcher.describe(),
+        'lookup_table': lookup_table.info if lookup_table is not None else None
+    })
+
+@app.route('/api/model/reload', methods=['POST'])
+def model_reload():
+    """Reload PRS.pkl in this worker without blocking requests (X-Admin-Token)"""
+    if not admin_authorized():
+        return jsonify({'error': 'Not found'}), 404
+    if not predictor.reload():
+        return jsonify({'error': 'A reload is already running in this worker'}), 409
+    return jsonify({
+        'pid': os.getpid(),
+        'model_version': predictor.version,
+        'status': url_for('model_stats')
+    }), 202
+
+@app.route('/api/catalog/reload', methods=['POST'])
+def catalog_reload():
+    """Reload PRS_CATALOG_PATH in this worker and drop its cached pages (X-Admin-Token)"""
+    if not admin_authorized() or not CATALOG_PATH:
+        return jsonify({'error': 'Not found'}), 404
+    try:
+        catalog = reload_catalog(CATALOG_PATH)
+    except (OSError, ValueError, KeyError) as e:
+        return jsonify({'error': f'Could not reload the catalog: {e}'}), 400
+    return jsonify({'pid': os.getpid(), 'domains': len(catalog.domains)})
+
+@app.route('/api/search')
+def search():
+    """Prefix search over resources, domain skills and projects, ranked for the current student"""
+    query = request.args.get('q', '')[:SEARCH_MAX_QUERY]
+    if not search_tokens(query):
+        return jsonify({'error': 'Query parameter q is required'}), 400
+    kinds = request.args.getlist('kind')
+    if any(kind not in SEARCH_KINDS for kind in kinds):
+        return jsonify({'error': f'kind must be one of {", ".join(SEARCH_KINDS)}'}), 400
+    limit = max(1, min(SEARCH_MAX_RESULTS, request.args.get('limit', 10, type=int)))
+    
+    assessment_data = load_assessment_data()
+    weakness = domain_key = None
+    weakest = []
+    if assessment_data is not None:
+        weakness = skill_weakness(assessment_data)
+        domain_key = CATALOG.resolve_domain(assessment_data['domain_focus'])
+        weakest = [SKILL_DIMENSIONS[i]['key'] for i in np.argsort(-weakness, kind='stable')[:2].tolist()
+                   if weakness[i] > 0]
+    
+    return jsonify({
+        'query': query,
+        'personalized': assessment_data is not None,
+        'weakest_dimensions': weakest,
+        'results': search_index.search(query, weakness, domain_key, kinds, limit)
+    })
+
+@app.route('/api/dashboard')
+def get_dashboard_data():
+    """Dashboard skill breakdown and tips for the current assessment as JSON"""
+    assessment_data = load_assessment_data()
+    if assessment_data is None:
+        return jsonify({'error': 'No assessment data found'}), 404
+    
+    return jsonify({
+        'overall_score': assessment_data['overall_score'],
+        'prediction': assessment_data['prediction'],
+        **build_dashboard(assessment_data)
+    })
+
+def requires_history(view):
+    """Answer a JSON 404 instead of running view while the assessment history is disabled"""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if not assessment_history.enabled:
+            return jsonify({'error': 'Assessment history is disabled'}), 404
+        return view(*args, **kwargs)
+    return wrapper
+
+@app.route('/api/analytics/score-histogram')
+@requires_history
+def analytics_score_histogram():
+    """Score histogram (10-point buckets) per domain"""
+    return jsonify({
+        'bucket_width': 100 // HISTORY_SCORE_BUCKETS,
+        'domains': assessment_history.score_histogram(request.args.get('domain'))
+    })
+
+@app.route('/api/analytics/readiness-rate')
+@requires_history
+def analytics_readiness_rate():
+    """Daily readiness rate over the last ?days= days (default 30)"""
+    days = max(1, min(3660, request.args.get('days', 30, type=int)))
+    return jsonify({'days': assessment_history.readiness_rate(days, request.args.get('domain'))})
+
+@app.route('/api/analytics/weak-dimensions')
+@requires_history
+def analytics_weak_dimensions():
+    """Skill dimensions most often below target"""
+    return jsonify({'dimensions': assessment_history.weak_dimensions(request.args.get('domain'))})
+
+@app.route('/api/analytics/cohort-stats')
+def analytics_cohort_stats():
+    """Live score distribution summary per domain, from memory"""
+    return jsonify({'domains': cohort_stats.summary()})
+
+@app.route('/api/profile/sample', methods=['POST'])
+def profile_sample():
+    """Start sampling this worker's stacks for ?seconds= (default 10, ?mode=signal|thread)"""
+    if not profile_authorized():
+        return jsonify({'error': 'Not found'}), 404
+    seconds = max(0.1, min(PROFILE_MAX_SECONDS, request.args.get('seconds', 10, type=float)))
+    interval = max(0.001, request.args.get('interval_ms', 10, type=float) / 1000)
+    mode = request.args.get('mode') or ('signal' if StackSampler.signal_mode_available() else 'thread')
+    if mode not in ('signal', 'thread') or (mode == 'signal' and not StackSampler.signal_mode_available()):
+        return jsonify({'error': f'Sampling mode {mode!r} is not available in this worker'}), 400
+    profile_id = secrets.token_hex(8)
+    
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    if not StackSampler(seconds, interval, mode).start(profile_path(profile_id)):
+        return jsonify({'error': 'A profile is already running in this worker'}), 409
+    return jsonify({
+        'id': profile_id,
+        'pid': os.getpid(),
+        'mode': mode,
+        'seconds': seconds,
+        'interval_ms': interval * 1000,
+        'result': url_for('profile_result', profile_id=profile_id)
+    }), 202
+
+@app.route('/api/profile/sample/<profile_id>')
+def profile_result(profile_id):
+    """Collapsed stacks of a finished sampling run"""
+    if not profile_authorized() or not all(c in '0123456789abcdef' for c in profile_id):
+        return jsonify({'error': 'Not found'}), 404
+    try:
+        with open(profile_path(profile_id)) as f:
+            collapsed = f.read()
+    except FileNotFoundError:
+        return jsonify({'error': 'Profile not found or still running'}), 404
+    return app.response_class(collapsed, mimetype='text/plain', headers={'Cache-Control': 'no-store'})
+
+@app.route('/metrics')
+def metrics():
+    """Request metrics in Prometheus text format"""
+    return app.response_class(request_metrics.render_prometheus(),
+                              mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/assessment-data')
+def get_assessment_data():
+    """API endpoint to get current assessment data"""
+    assessment_data = load_assessment_data()
+    if assessment_data is None:
+        return jsonify({'error': 'No assessment data found'}), 404
+    
+    return jsonify(assessment_data)
+
+# Error handlers
+@app.errorhandler(404)
+def page_not_found(e):
+    return cached_page_response('404', lambda: render_template('404.html', company=COMPANY_INFO), 404)
+
+@app.errorhandler(500)
+def internal_server_error(e):
+    print(f"500 Error: {e}")
+    print(traceback.format_exc())
+    return render_template('500.html', 
+                         error=str(e) if app.debug else 'Internal Server Error',
+                         company=COMPANY_INFO), 500
+
+def preload():
+    """Build assets, load the model and render cached pages in the gunicorn master so workers share them"""
+    start = time.perf_counter()
+    if not asset_manifest:
+        try:
+            install_asset_manifest(build_assets())
+        except OSError as e:
+            print(f"⚠ Warning: Could not build static assets: {e}", file=sys.stderr)
+    predictor.wait_until_loaded()
+    templates = app.jinja_env.list_templates()
+    for name in templates:
+        app.jinja_env.get_template(name)
+    if not app.debug:
+        with app.test_request_context():
+            home()
+            about()
+            page_not_found(None)
+    print(f"✓ Preloaded the model, {len(templates)} templates and cached pages "
+          f"in {time.perf_counter() - start:.3f}s", file=sys.stderr)
+
+@app.cli.command('build-assets')
+def build_assets_command():
+    """Minify, fingerprint and precompress static/ into static/dist"""
+    for name, entry in build_assets().items():
+        sizes = ', '.join(f'{encoding} {size:,}' for encoding, size in entry['bytes'].items())
+        click.echo(f"✓ {name} -> {entry['path']} (source {entry['source_bytes']:,}; {sizes})", err=True)
+
+@app.cli.command('export-catalog')
+@click.argument('path')
+def export_catalog(path):
+    """Write the current content tables to a catalog file for PRS_CATALOG_PATH"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(CATALOG.to_dict(), f, indent=2, ensure_ascii=False)
+    print(f"✓ Wrote {len(CATALOG.domains)} domains to {path}")
+
+def open_cohort_file(path, mode):
+    """Open a cohort file for csv-safe text I/O, with '-' meaning stdin/stdout"""
+    if path == '-':
+        return nullcontext(sys.stdin if mode == 'r' else sys.stdout)
+    return open(path, mode, encoding='utf-8', newline='')
+
+@app.cli.command('score-cohort')
+@click.argument('input_path')
+@click.argument('output_path')
+@click.option('--chunk-rows', default=COHORT_CHUNK_ROWS, show_default=True, help='Rows scored per chunk.')
+def score_cohort(input_path, output_path, chunk_rows):
+    """Score a CSV/NDJSON cohort file in bounded memory ('-' for stdin/stdout)"""
+    input_format = cohort_format(input_path)
+    output_format = cohort_format(output_path, default=input_format)
+    stats = new_cohort_stats()
+    
+    with open_cohort_file(input_path, 'r') as source, open_cohort_file(output_path, 'w') as target:
+        scored = iter_scored_cohort(iter_cohort_records(source, input_format), stats, chunk_rows)
+        for text in iter_cohort_output(scored, output_format):
+            target.write(text)
+            click.echo(f"\r{stats['rows']} rows scored", nl=False, err=True)
+    
+    click.echo(f"\n✓ Cohort scored: {cohort_summary(stats)}", err=True)
+
+@app.cli.command('rescore-assessments')
+@click.option('--workers', default=os.cpu_count() or 1, show_default=True, help='Worker processes.')
+@click.option('--scaling-report', is_flag=True, help='Time 1, 2, 4 ... --workers processes; no write-back.')
+@click.option('--synthetic-rows', default=0, help='Use N random rows instead of the store (implies --scaling-report).')
+def rescore_assessments(workers, scaling_report, synthetic_rows):
+    """Re-score every stored assessment with the current formula and model (not the history or cohort stats)"""
+    if not assessment_store.path and not synthetic_rows:
+        raise click.ClickException('PRS_STORE_PATH is empty; there is no persistent store to re-score')
+    
+    with tempfile.TemporaryDirectory(prefix='prs-rescore-') as directory:
+        if synthetic_rows:
+            scaling_report = True
+            count = synthetic_rows
+            arrays = create_rescore_arrays(directory, count)
+            rng = np.random.default_rng(0)
+            for column, field in enumerate(MODEL_FEATURES):
+                _, low, high = INPUT_BOUNDS.get(field, (None, 1, len(DOMAINS)))
+                arrays['inputs'][:, column] = rng.integers(low, high + 1, count)
+            arrays['inputs'].flush()
+        else:
+            arrays, count = export_store_arrays(assessment_store, directory)
+        click.echo(f"Re-scoring {count} assessments", err=True)
+        if not count:
+            return
+        
+        if scaling_report:
+            worker_counts = sorted({1 << i for i in range(workers.bit_length()) if 1 << i < workers} | {workers})
+            baseline = None
+            for n in worker_counts:
+                elapsed = rescore_arrays(directory, count, n)
+                baseline = baseline or elapsed
+                click.echo(f"  workers={n:<3} {count / elapsed:>12,.0f} rows/s  "
+                           f"({elapsed:.2f}s, speedup {baseline / elapsed:.2f}x)")
+            return
+        
+        elapsed = rescore_arrays(directory, count, workers)
+        updated = write_back_scores(assessment_store, arrays, count)
+        click.echo(f"✓ Re-scored {count} assessments in {elapsed:.2f}s with {workers} workers "
+                   f"({count / elapsed:,.0f} rows/s); {updated} changed", err=True)
 
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
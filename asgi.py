@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+"""ASGI entry point: the Flask app behind a bounded thread pool.
+
+    uvicorn asgi:application --workers 2 --timeout-keep-alive 5
+    gunicorn asgi:application -k uvicorn.workers.UvicornWorker --workers 2
+
+uvicorn parses requests and writes responses on its event loop, so a slow
+client holds a connection rather than a worker. Each request's WSGI call
+(session, scoring and model predict, rendering) runs on one of
+PRS_ASGI_THREADS threads; once they are all busy, further requests wait on
+the event loop instead of spawning threads. Request and response bodies are
+streamed, so /api/cohort/import keeps its bounded memory.
+"""
+import os
+
+from a2wsgi import WSGIMiddleware
+
+from app import app
+
+ASGI_THREADS = int(os.environ.get('PRS_ASGI_THREADS', min(32, (os.cpu_count() or 1) + 4)))
+ASGI_SEND_QUEUE_SIZE = int(os.environ.get('PRS_ASGI_SEND_QUEUE_SIZE', 10))
+
+application = WSGIMiddleware(app, workers=ASGI_THREADS, send_queue_size=ASGI_SEND_QUEUE_SIZE)
@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+"""Benchmark suite for the routes and the scoring core.
+
+Usage:
+    python benchmark.py                          # run everything, JSON to stdout
+    python benchmark.py --output baseline.json   # save a baseline
+    python benchmark.py --compare baseline.json  # flag regressions against it
+    python benchmark.py --filter route:          # only benchmarks whose name matches
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+# Keep benchmark runs from writing to the instance folder
+for name in ('PRS_STORE_PATH', 'PRS_HISTORY_PATH', 'PRS_STATS_DIR'):
+    os.environ.setdefault(name, '')
+
+import numpy as np
+from flask import render_template
+
+import app as prs
+
+SAMPLE_FORM = {
+    'dsa_level': '7',
+    'problem_count': '120',
+    'project_count': '4',
+    'github_quality': '6',
+    'domain_focus': '2'
+}
+SAMPLE_JSON = {key: int(value) for key, value in SAMPLE_FORM.items() if key != 'domain_focus'}
+SAMPLE_JSON['domain_focus'] = '2'
+MIN_SAMPLE_NS = 20000
+SEARCH_CATALOG_SIZES = (1000, 5000, 20000)
+SEARCH_QUERIES = ('p', 'machine lea', 'docker')
+
+
+def percentile(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def calls_per_sample(fn, minimum_ns=MIN_SAMPLE_NS):
+    """Calls to batch into one timing sample so timer overhead stays negligible"""
+    number = 1
+    while True:
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            fn()
+        if time.perf_counter_ns() - start >= minimum_ns or number >= 10000:
+            return number
+        number *= 10
+
+
+def run_benchmark(fn, iterations, warmup):
+    """Latency percentiles (us), throughput and per-call allocations for fn"""
+    for _ in range(warmup):
+        fn()
+
+    number = calls_per_sample(fn)
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            fn()
+        timings.append((time.perf_counter_ns() - start) / number)
+    timings.sort()
+
+    # Allocations are measured in a separate pass so tracing does not skew timings
+    alloc_iterations = max(1, iterations // 10)
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    for _ in range(alloc_iterations):
+        fn()
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    total_seconds = sum(timings) / 1e9
+    return {
+        'iterations': iterations,
+        'calls_per_sample': number,
+        'p50_us': round(percentile(timings, 0.50) / 1000, 2),
+        'p95_us': round(percentile(timings, 0.95) / 1000, 2),
+        'p99_us': round(percentile(timings, 0.99) / 1000, 2),
+        'mean_us': round(sum(timings) / len(timings) / 1000, 2),
+        'ops_per_sec': round(iterations / total_seconds, 1) if total_seconds else None,
+        'alloc_peak_kb': round((peak - before) / 1024, 2),
+        'alloc_retained_bytes_per_call': round((after - before) / alloc_iterations, 1)
+    }
+
+
+def route_benchmarks():
+    """One benchmark per route, driven through Flask's test client"""
+    client = prs.app.test_client()
+    client.post('/assessment', data=SAMPLE_FORM)
+    batch = [dict(SAMPLE_JSON, dsa_level=level % 10 + 1) for level in range(100)]
+
+    return {
+        'route:GET /': lambda: client.get('/'),
+        'route:GET /about': lambda: client.get('/about'),
+        'route:GET /assessment': lambda: client.get('/assessment'),
+        'route:POST /assessment': lambda: client.post('/assessment', data=SAMPLE_FORM),
+        'route:GET /results': lambda: client.get('/results'),
+        'route:GET /dashboard': lambda: client.get('/dashboard'),
+        'route:GET /projects': lambda: client.get('/projects'),
+        'route:GET /learning-resources': lambda: client.get('/learning-resources'),
+        'route:GET /missing (404)': lambda: client.get('/missing'),
+        'route:GET /api/health': lambda: client.get('/api/health'),
+        'route:GET /api/assessment-data': lambda: client.get('/api/assessment-data'),
+        'route:GET /api/dashboard': lambda: client.get('/api/dashboard'),
+        'route:GET /api/model/stats': lambda: client.get('/api/model/stats'),
+        'route:POST /api/check-readiness': lambda: client.post('/api/check-readiness', json=SAMPLE_JSON),
+        'route:POST /api/assess/batch (100 rows)': lambda: client.post('/api/assess/batch', json=batch),
+        'route:GET /api/analytics/cohort-stats': lambda: client.get('/api/analytics/cohort-stats'),
+        'route:GET /metrics': lambda: client.get('/metrics'),
+        'route:GET /api/search?q=data': lambda: client.get('/api/search?q=data')
+    }
+
+
+def core_benchmarks():
+    """Scoring, rendering and session serialization in isolation"""
+    client = prs.app.test_client()
+    client.post('/assessment', data=SAMPLE_FORM)
+    with client.session_transaction() as current_session:
+        assessment_id = current_session['assessment_id']
+    assessment_data = prs.rehydrate_assessment(prs.assessment_store.get(assessment_id))
+    inputs = prs.clamp_inputs(SAMPLE_FORM)
+    rng = np.random.default_rng(0)
+    cohort = [rng.integers(1, 11, 1000), rng.integers(0, 501, 1000),
+              rng.integers(0, 51, 1000), rng.integers(1, 11, 1000)]
+
+    serializer = prs.app.session_interface.get_signing_serializer(prs.app)
+    id_session = {'assessment_id': assessment_id}
+    full_session = {'assessment_data': assessment_data}
+    id_cookie = serializer.dumps(id_session)
+    full_cookie = serializer.dumps(full_session)
+
+    def render_results():
+        with prs.app.test_request_context('/results'):
+            render_template('results.html', assessment_data=assessment_data,
+                            domain_fragment='', domain=prs.CATALOG.domains['2'],
+                            domain_key='2', company=prs.COMPANY_INFO,
+                            overall_score=assessment_data['overall_score'], percentile=50)
+
+    def render_dashboard():
+        with prs.app.test_request_context('/dashboard'):
+            dashboard_data = prs.build_dashboard(assessment_data)
+            render_template('dashboard.html', assessment_data=assessment_data,
+                            skill_data=dashboard_data['skill_data'],
+                            improvement_tips=dashboard_data['improvement_tips'],
+                            overall_score=int(assessment_data['overall_score']),
+                            company=prs.COMPANY_INFO)
+
+    return {
+        'core:calculate_overall_score': lambda: prs.calculate_overall_score(7, 120, 4, 6),
+        'core:get_level_description': lambda: prs.get_level_description(58.5),
+        'core:calculate_overall_scores (1000 rows)': lambda: prs.calculate_overall_scores(*cohort),
+        'core:clamp_inputs': lambda: prs.clamp_inputs(SAMPLE_FORM),
+        'core:score_inputs': lambda: prs.score_inputs(inputs),
+        'core:predictor.predict_one': lambda: prs.predictor.predict_one(7, 120, 4, 6, '2'),
+        'core:build_dashboard': lambda: prs.build_dashboard(assessment_data),
+        'core:cohort_stats.percentile': lambda: prs.cohort_stats.percentile('2', 58.5),
+        'metrics:record (one request)': lambda: prs.request_metrics.record(
+            'benchmark', 'GET', 200, 4096, 0.002, {'session': 0.00003, 'score': 0.0002, 'render': 0.0005}),
+        'render:results.html': render_results,
+        'render:dashboard.html': render_dashboard,
+        'session:dumps (assessment id)': lambda: serializer.dumps(id_session),
+        'session:loads (assessment id)': lambda: serializer.loads(id_cookie),
+        'session:dumps (full assessment_data)': lambda: serializer.dumps(full_session),
+        'session:loads (full assessment_data)': lambda: serializer.loads(full_cookie)
+    }
+
+
+def synthetic_search_index(size, seed=0):
+    """A SearchIndex over size documents whose titles mix the real catalog's words"""
+    rng = np.random.default_rng(seed)
+    words = sorted({word for document in prs.search_index.documents
+                    for word in prs.search_tokens(document['title'])})
+    domain_keys = list(prs.CATALOG.domains)
+    documents = []
+    for index in range(size):
+        domain_key = domain_keys[index % len(domain_keys)]
+        kind = prs.SEARCH_KINDS[index % len(prs.SEARCH_KINDS)]
+        title = ' '.join(rng.choice(words, rng.integers(2, 5)).tolist()) + f' {index}'
+        documents.append(prs.search_document(kind, domain_key, prs.CATALOG.domains[domain_key], title, kind))
+    return prs.SearchIndex(documents)
+
+
+def search_benchmarks(name_filter=''):
+    """Query latency on the real catalog and on synthetic catalogs, built only if a query passes name_filter"""
+    weakness = prs.skill_weakness({'dsa_level': 4, 'problem_count': 30, 'project_count': 2, 'github_quality': 7})
+    indexes = [('catalog', lambda: prs.search_index)]
+    indexes += [(f'{size} docs', lambda size=size: synthetic_search_index(size)) for size in SEARCH_CATALOG_SIZES]
+    benchmarks, index_info = {}, {}
+    for label, build in indexes:
+        queries = {f'search:{query!r} ({label})': query for query in SEARCH_QUERIES}
+        if not any(name_filter in name for name in queries):
+            continue
+        index = build()
+        index_info[label] = index.info
+        for name, query in queries.items():
+            benchmarks[name] = lambda index=index, query=query: index.search(query, weakness, '2', None, 10)
+    return benchmarks, index_info
+
+
+def compare(results, baseline, threshold):
+    """Benchmarks whose p50 or p99 grew by more than threshold over the baseline"""
+    regressions = []
+    for name, current in results['benchmarks'].items():
+        previous = baseline.get('benchmarks', {}).get(name)
+        if previous is None:
+            continue
+        for metric in ('p50_us', 'p99_us'):
+            if previous[metric] and current[metric] > previous[metric] * (1 + threshold):
+                regressions.append({
+                    'benchmark': name,
+                    'metric': metric,
+                    'baseline': previous[metric],
+                    'current': current[metric],
+                    'change': round(current[metric] / previous[metric] - 1, 3)
+                })
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=500, help='timed calls per benchmark')
+    parser.add_argument('--warmup', type=int, default=50, help='untimed calls before timing')
+    parser.add_argument('--filter', default='', help='only run benchmarks whose name contains this')
+    parser.add_argument('--output', help='write results JSON here instead of stdout')
+    parser.add_argument('--compare', help='baseline JSON to check for regressions')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='relative slowdown that counts as a regression (default 0.10)')
+    args = parser.parse_args(argv)
+
+    benchmarks = {**route_benchmarks(), **core_benchmarks()}
+    search, search_index_info = search_benchmarks(args.filter)
+    benchmarks.update(search)
+    results = {
+        'python': sys.version.split()[0],
+        'numpy': np.__version__,
+        'model_loaded': prs.predictor.model is not None,
+        'lookup_table': prs.lookup_table is not None,
+        'search_indexes': search_index_info,
+        'benchmarks': {}
+    }
+    for name, fn in benchmarks.items():
+        if args.filter in name:
+            results['benchmarks'][name] = run_benchmark(fn, args.iterations, args.warmup)
+            print(f"{name:<45} p50 {results['benchmarks'][name]['p50_us']:>10.2f} us", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare) as f:
+            results['regressions'] = compare(results, json.load(f), args.threshold)
+        for regression in results['regressions']:
+            print(f"REGRESSION {regression['benchmark']} {regression['metric']}: "
+                  f"{regression['baseline']} -> {regression['current']} us "
+                  f"(+{regression['change']:.1%})", file=sys.stderr)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+    return 1 if results.get('regressions') else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""gunicorn settings: import the app once in the master and fork workers from it.
+
+With preload_app the model unpickle, template compilation and page caches
+happen once; workers start as forks that share those pages copy-on-write,
+so scale-out and worker restarts skip the import entirely.
+
+PRS_GUNICORN_THREADS > 1 switches to threaded workers. Set it above
+PRS_ADMISSION_MAX_INFLIGHT so excess requests wait in (and are shed by) the
+app's admission control rather than in the listen backlog.
+"""
+import gc
+import os
+import time
+
+timeout = 120
+preload_app = True
+threads = int(os.environ.get('PRS_GUNICORN_THREADS', 1))
+
+
+def when_ready(server):
+    """Runs in the master after the app is imported, before any worker forks"""
+    from app import preload
+    preload()
+    # Keep the garbage collector from touching (and so copying) preloaded objects
+    gc.freeze()
+    server.boot_time = time.monotonic()
+
+
+def post_fork(server, worker):
+    server.log.info(f"Worker {worker.pid} forked {time.monotonic() - server.boot_time:.3f}s after preload")
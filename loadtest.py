@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""HTTP load generator for comparing serving setups.
+
+Opens --connections keep-alive clients that loop over the given requests
+for --duration seconds, optionally alongside --slow-clients that trickle
+their request headers one byte at a time (like stalled mobile clients).
+With --rate the clients send on a fixed schedule instead of back to back,
+and latency counts from each request's scheduled time, so time spent
+waiting for a free connection is included (no coordinated omission).
+
+    python loadtest.py --url http://127.0.0.1:8000 --connections 1000 \
+        --path / --path /api/health --slow-clients 50
+"""
+import argparse
+import asyncio
+import json
+import resource
+import sys
+import time
+from collections import Counter, defaultdict
+from urllib.parse import urlsplit
+
+
+def build_request(method, path, host, body=b''):
+    head = f'{method} {path} HTTP/1.1\r\nHost: {host}\r\nConnection: keep-alive\r\n'
+    if body:
+        head += f'Content-Type: application/json\r\nContent-Length: {len(body)}\r\n'
+    return (head + '\r\n').encode() + body
+
+
+async def read_response(reader):
+    """Status code and whether the server keeps the connection open"""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionResetError('connection closed')
+    status = int(status_line.split()[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    if headers.get('transfer-encoding', '').lower() == 'chunked':
+        while True:
+            size = int((await reader.readline()).split(b';')[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    elif 'content-length' in headers:
+        await reader.readexactly(int(headers['content-length']))
+    else:
+        await reader.read()
+        return status, False
+    return status, headers.get('connection', '').lower() != 'close'
+
+
+class LoadStats:
+    def __init__(self):
+        self.latencies = []
+        self.status_latencies = defaultdict(list)
+        self.statuses = Counter()
+        self.errors = Counter()
+        self.connects = 0
+        self.slow_completed = 0
+
+    def summary(self, elapsed):
+        latencies = sorted(self.latencies)
+
+        def pct(q, values=latencies):
+            return round(values[min(len(values) - 1, int(q * len(values)))] * 1000, 2) if values else None
+
+        by_status = {}
+        for status, values in sorted(self.status_latencies.items()):
+            values.sort()
+            by_status[str(status)] = {'p50_ms': pct(0.50, values), 'p99_ms': pct(0.99, values)}
+
+        total = len(latencies) + sum(self.errors.values())
+        return {
+            'requests': len(latencies),
+            'errors': dict(self.errors),
+            'error_rate': round(sum(self.errors.values()) / total, 4) if total else 0.0,
+            'statuses': {str(status): count for status, count in sorted(self.statuses.items())},
+            'requests_per_sec': round(len(latencies) / elapsed, 1),
+            'p50_ms': pct(0.50),
+            'p95_ms': pct(0.95),
+            'p99_ms': pct(0.99),
+            'max_ms': round(latencies[-1] * 1000, 2) if latencies else None,
+            'latency_by_status': by_status,
+            'connections_opened': self.connects,
+            'slow_clients_completed': self.slow_completed
+        }
+
+
+async def fast_client(index, target, requests, deadline, timeout, stats, interval=0.0, offset=0.0):
+    """Send requests back to back, or one every interval seconds starting offset seconds in"""
+    host, port = target
+    reader = writer = None
+    position = index
+    scheduled = time.perf_counter() + offset
+    while time.monotonic() < deadline:
+        payload = requests[position % len(requests)]
+        position += 1
+        start = time.perf_counter()
+        if interval:
+            if scheduled > start:
+                await asyncio.sleep(scheduled - start)
+            start = scheduled
+            scheduled += interval
+        try:
+            if writer is None:
+                reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+                stats.connects += 1
+            writer.write(payload)
+            status, keep_alive = await asyncio.wait_for(read_response(reader), timeout)
+        except asyncio.TimeoutError:
+            stats.errors['timeout'] += 1
+            keep_alive = False
+        except (OSError, ValueError, IndexError, asyncio.IncompleteReadError) as e:
+            stats.errors[type(e).__name__] += 1
+            keep_alive = False
+            await asyncio.sleep(0.05)
+        else:
+            latency = time.perf_counter() - start
+            stats.latencies.append(latency)
+            stats.status_latencies[status].append(latency)
+            stats.statuses[status] += 1
+        if not keep_alive and writer is not None:
+            writer.close()
+            reader = writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def slow_client(target, payload, interval, deadline, stats):
+    """Send one request a byte at a time, then read the response"""
+    host, port = target
+    while time.monotonic() < deadline:
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+            for offset in range(len(payload)):
+                writer.write(payload[offset:offset + 1])
+                await writer.drain()
+                await asyncio.sleep(interval)
+            await read_response(reader)
+            writer.close()
+            stats.slow_completed += 1
+        except (OSError, ValueError, IndexError, asyncio.IncompleteReadError):
+            await asyncio.sleep(0.05)
+
+
+async def run(args):
+    url = urlsplit(args.url)
+    target = (url.hostname, url.port or 80)
+    host = url.netloc
+    requests = [build_request('GET', path, host) for path in args.path or ['/api/health']]
+    for path, body in args.post or []:
+        requests.append(build_request('POST', path, host, body.encode()))
+
+    stats = LoadStats()
+    start = time.monotonic()
+    deadline = start + args.duration
+    slow_payload = build_request('GET', '/api/health', host)
+    tasks = [slow_client(target, slow_payload, args.slow_interval, deadline, stats)
+             for _ in range(args.slow_clients)]
+    interval = args.connections / args.rate if args.rate else 0.0
+    tasks += [fast_client(index, target, requests, deadline, args.timeout, stats,
+                          interval, index / args.rate if args.rate else 0.0)
+              for index in range(args.connections)]
+    await asyncio.gather(*tasks)
+    return stats.summary(time.monotonic() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', default='http://127.0.0.1:8000')
+    parser.add_argument('--path', action='append', help='GET path (repeatable, default /api/health)')
+    parser.add_argument('--post', nargs=2, action='append', metavar=('PATH', 'JSON'),
+                        help='POST a JSON body (repeatable)')
+    parser.add_argument('--connections', type=int, default=100, help='concurrent keep-alive clients')
+    parser.add_argument('--slow-clients', type=int, default=0, help='clients trickling their headers')
+    parser.add_argument('--slow-interval', type=float, default=0.2, help='seconds between slow client bytes')
+    parser.add_argument('--rate', type=float, help='total requests/second on a fixed schedule (open loop)')
+    parser.add_argument('--duration', type=float, default=20)
+    parser.add_argument('--timeout', type=float, default=30, help='per-request timeout in seconds')
+    args = parser.parse_args(argv)
+
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    wanted = args.connections + args.slow_clients + 64
+    if soft < wanted:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (min(wanted, hard), hard))
+
+    result = asyncio.run(run(args))
+    print(json.dumps({'url': args.url, 'connections': args.connections, 'rate': args.rate,
+                      'slow_clients': args.slow_clients, **result}, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,291 @@
+# -*- coding: utf-8 -*-
+"""Replay captured traffic against the app and report latency per route.
+
+Records come from PRS_CAPTURE_PATH (one JSON request per line). Each captured
+client keeps its cookies and request order, so assessment bursts followed by
+/results reloads replay as they happened. Runs are deterministic: clients are
+dealt round-robin to --concurrency workers, in order of first appearance.
+
+    python replay.py instance/capture.jsonl                       # test client, original pacing
+    python replay.py capture.jsonl --speed 10 --concurrency 32    # 10x faster
+    python replay.py capture.jsonl --url http://127.0.0.1:8000 --rate 200
+    python replay.py capture.jsonl --route /results --speed 0     # as fast as possible
+"""
+import argparse
+import http.client
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from http.cookies import SimpleCookie
+from urllib.parse import urlencode, urlsplit
+
+
+def load_records(path, route_filter=''):
+    """Replayable records in capture order, and how many were skipped"""
+    records, skipped = [], Counter()
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+                route_key(record)
+            except (ValueError, KeyError, TypeError):
+                skipped['malformed'] += 1
+                continue
+            if route_filter not in route_key(record):
+                continue
+            if 'body_bytes' in record:
+                skipped['uncaptured_body'] += 1
+                continue
+            records.append(record)
+    records.sort(key=lambda record: record['t'])
+    return records, skipped
+
+
+def route_key(record):
+    return f"{record['method']} {record.get('route') or record['path']}"
+
+
+def schedule(records, speed, rate):
+    """Send offset in seconds for each record: original gaps / speed, or a fixed rate"""
+    if rate:
+        return [index / rate for index in range(len(records))]
+    if not speed:
+        return [0.0] * len(records)
+    start = records[0]['t'] if records else 0
+    return [(record['t'] - start) / speed for record in records]
+
+
+def assign_workers(records, offsets, concurrency):
+    """Deal clients round-robin to workers; anonymous records count as one-off clients"""
+    workers = [[] for _ in range(concurrency)]
+    client_worker = {}
+    for index, (record, offset) in enumerate(zip(records, offsets)):
+        client = record.get('client') or f'anonymous-{index}'
+        if client not in client_worker:
+            client_worker[client] = len(client_worker) % concurrency
+        workers[client_worker[client]].append((offset, client, record))
+    return workers
+
+
+def request_target(record):
+    path = record['path']
+    if record.get('query'):
+        path += '?' + urlencode(record['query'])
+    return path
+
+
+class TestClientTarget:
+    """In-process Flask test client; one client (cookie jar) per captured client"""
+
+    def __init__(self):
+        # Keep replays out of the instance folder and out of the capture file
+        for name in ('PRS_STORE_PATH', 'PRS_HISTORY_PATH', 'PRS_STATS_DIR'):
+            os.environ.setdefault(name, '')
+        os.environ['PRS_CAPTURE_PATH'] = ''
+        import app as prs
+        prs.preload()
+        self.app = prs.app
+
+    def session(self):
+        return TestClientSession(self.app.test_client())
+
+
+class TestClientSession:
+    def __init__(self, client):
+        self.client = client
+
+    def send(self, record):
+        response = self.client.open(request_target(record), method=record['method'],
+                                    data=record.get('form'), json=record.get('json'))
+        response.close()
+        return response.status_code
+
+    def close(self):
+        pass
+
+
+class HttpTarget:
+    """A running server (gunicorn, uvicorn); one keep-alive connection per captured client"""
+
+    def __init__(self, url, timeout):
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.timeout = timeout
+
+    def session(self):
+        return HttpSession(http.client.HTTPConnection(self.host, self.port, timeout=self.timeout))
+
+
+class HttpSession:
+    def __init__(self, connection):
+        self.connection = connection
+        self.cookies = {}
+
+    def send(self, record):
+        headers = {}
+        body = None
+        if record.get('form') is not None:
+            body = urlencode(record['form'])
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        elif record.get('json') is not None:
+            body = json.dumps(record['json'])
+            headers['Content-Type'] = 'application/json'
+        if self.cookies:
+            headers['Cookie'] = '; '.join(f'{name}={value}' for name, value in self.cookies.items())
+        try:
+            self.connection.request(record['method'], request_target(record), body=body, headers=headers)
+            response = self.connection.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            self.connection.close()
+            raise
+        for header in response.headers.get_all('Set-Cookie') or []:
+            for name, morsel in SimpleCookie(header).items():
+                if morsel.value and morsel['max-age'] != '0':
+                    self.cookies[name] = morsel.value
+                else:
+                    self.cookies.pop(name, None)
+        return response.status
+
+    def close(self):
+        self.connection.close()
+
+
+class RouteStats:
+    def __init__(self):
+        self.latencies = []
+        self.captured = []
+        self.statuses = Counter()
+        self.errors = Counter()
+        self.status_mismatches = 0
+
+    def merge(self, other):
+        self.latencies += other.latencies
+        self.captured += other.captured
+        self.statuses.update(other.statuses)
+        self.errors.update(other.errors)
+        self.status_mismatches += other.status_mismatches
+
+    def summary(self):
+        latencies = sorted(self.latencies)
+        captured = sorted(self.captured)
+        server_errors = sum(count for status, count in self.statuses.items() if status >= 500)
+        failures = server_errors + sum(self.errors.values())
+        total = len(latencies) + sum(self.errors.values())
+        return {
+            'requests': total,
+            'errors': dict(self.errors),
+            'error_rate': round(failures / total, 4) if total else 0.0,
+            'statuses': {str(status): count for status, count in sorted(self.statuses.items())},
+            'status_mismatches': self.status_mismatches,
+            'p50_ms': percentile_ms(latencies, 0.50),
+            'p95_ms': percentile_ms(latencies, 0.95),
+            'p99_ms': percentile_ms(latencies, 0.99),
+            'max_ms': percentile_ms(latencies, 1.0),
+            'captured_p50_ms': percentile_ms(captured, 0.50, scale=1),
+            'captured_p99_ms': percentile_ms(captured, 0.99, scale=1)
+        }
+
+
+def percentile_ms(sorted_values, q, scale=1000):
+    if not sorted_values:
+        return None
+    return round(sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))] * scale, 2)
+
+
+def run_worker(items, target, start, routes, lags):
+    """Send one worker's records on schedule, each client on its own session"""
+    remaining = Counter(client for _, client, _ in items)
+    sessions = {}
+    for offset, client, record in items:
+        delay = start + offset - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        lags.append(max(0.0, -delay))
+
+        stats = routes[route_key(record)]
+        session = sessions.get(client)
+        if session is None:
+            session = sessions[client] = target.session()
+        sent = time.perf_counter()
+        try:
+            status = session.send(record)
+        except Exception as e:
+            stats.errors[type(e).__name__] += 1
+        else:
+            stats.latencies.append(time.perf_counter() - sent)
+            stats.statuses[status] += 1
+            stats.status_mismatches += status != record.get('status', status)
+            if 'duration_ms' in record:
+                stats.captured.append(record['duration_ms'])
+
+        remaining[client] -= 1
+        if not remaining[client]:
+            sessions.pop(client).close()
+
+
+def replay(records, target, offsets, concurrency):
+    workers = assign_workers(records, offsets, concurrency)
+    results = [(defaultdict(RouteStats), []) for _ in workers]
+    start = time.perf_counter() + 0.1
+    threads = [threading.Thread(target=run_worker, args=(items, target, start, routes, lags))
+               for items, (routes, lags) in zip(workers, results)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    routes, lags, overall = defaultdict(RouteStats), [], RouteStats()
+    for worker_routes, worker_lags in results:
+        for name, stats in worker_routes.items():
+            routes[name].merge(stats)
+            overall.merge(stats)
+        lags += worker_lags
+    return {
+        'seconds': round(elapsed, 3),
+        'requests_per_sec': round(len(overall.latencies) / elapsed, 1) if elapsed > 0 else None,
+        'schedule_lag_p99_ms': percentile_ms(sorted(lags), 0.99),
+        'overall': overall.summary(),
+        'routes': {name: routes[name].summary() for name in sorted(routes)}
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('capture', help='JSONL file written with PRS_CAPTURE_PATH')
+    parser.add_argument('--url', help='replay over HTTP against this server instead of the test client')
+    parser.add_argument('--concurrency', type=int, default=8, help='parallel replay workers')
+    parser.add_argument('--speed', type=float, default=1.0,
+                        help='divide the captured gaps by this (0 sends as fast as possible)')
+    parser.add_argument('--rate', type=float, help='send at a fixed requests/second instead')
+    parser.add_argument('--route', default='', help="only replay routes containing this (e.g. 'POST /assessment')")
+    parser.add_argument('--timeout', type=float, default=30, help='per-request timeout for --url')
+    args = parser.parse_args(argv)
+
+    records, skipped = load_records(args.capture, args.route)
+    if not records:
+        print(f'No replayable records in {args.capture}', file=sys.stderr)
+        return 1
+    target = HttpTarget(args.url, args.timeout) if args.url else TestClientTarget()
+    offsets = schedule(records, args.speed, args.rate)
+    result = replay(records, target, offsets, max(1, args.concurrency))
+    print(json.dumps({
+        'capture': args.capture,
+        'target': args.url or 'test-client',
+        'records': len(records),
+        'skipped': dict(skipped),
+        'concurrency': args.concurrency,
+        'speed': None if args.rate else args.speed,
+        'rate': args.rate,
+        **result
+    }, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""Startup report: import costs and time-to-first-byte after boot.
+
+    python startup_report.py                         # import profile + TTFB with gunicorn.conf.py
+    python startup_report.py --gunicorn-args "app:app --timeout 120"
+    python startup_report.py --top 30 --skip-ttfb
+
+The import profile comes from `python -X importtime -c "import app"`. TTFB
+starts gunicorn and polls until GET / and POST /api/check-readiness (which
+needs the model) each return 200, timing both from process start.
+"""
+import argparse
+import json
+import os
+import shlex
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+READINESS_BODY = json.dumps({'dsa_level': 7, 'problem_count': 120, 'project_count': 4,
+                             'github_quality': 6, 'domain_focus': '2'}).encode()
+
+
+def import_profile(top):
+    """Wall time of `import app` plus the costliest top-level imports it pulls in"""
+    code = 'import time; t = time.perf_counter(); import app; print(time.perf_counter() - t)'
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=BASE_DIR,
+                            capture_output=True, text=True, check=True)
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules.append({'module': name.strip(), 'depth': depth,
+                        'self_ms': int(self_us) / 1000, 'cumulative_ms': int(cumulative_us) / 1000})
+    # importtime lists a module after everything it imported
+    app_index = next(index for index, entry in enumerate(modules) if entry['module'] == 'app')
+    app_entry = modules[app_index]
+    first = max((index for index, entry in enumerate(modules[:app_index]) if entry['depth'] == 0), default=-1) + 1
+    children = [entry for entry in modules[first:app_index] if entry['depth'] == 1]
+    children.sort(key=lambda entry: entry['cumulative_ms'], reverse=True)
+    return {
+        'import_app_seconds': round(float(result.stdout.strip().splitlines()[-1]), 3),
+        'import_app_cumulative_ms': app_entry['cumulative_ms'],
+        'top_imports': [{key: entry[key] for key in ('module', 'self_ms', 'cumulative_ms')}
+                        for entry in children[:top]]
+    }
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def first_success(url, body=None, deadline=60.0):
+    """Seconds (monotonic) at which url first answered 200"""
+    limit = time.monotonic() + deadline
+    while time.monotonic() < limit:
+        try:
+            request = urllib.request.Request(url, data=body, headers={'Content-Type': 'application/json'})
+            with urllib.request.urlopen(request, timeout=deadline) as response:
+                response.read(1)
+                if response.status == 200:
+                    return time.monotonic()
+        except OSError:
+            time.sleep(0.01)
+    raise TimeoutError(f'{url} did not answer within {deadline}s')
+
+
+def time_to_first_byte(gunicorn_args, runs):
+    """Boot gunicorn repeatedly and time the first page and the first prediction"""
+    samples = []
+    for _ in range(runs):
+        port = free_port()
+        command = ['gunicorn', '--bind', f'127.0.0.1:{port}'] + shlex.split(gunicorn_args)
+        start = time.monotonic()
+        process = subprocess.Popen(command, cwd=BASE_DIR, stdout=subprocess.DEVNULL,
+                                   stderr=subprocess.DEVNULL, start_new_session=True)
+        try:
+            page = first_success(f'http://127.0.0.1:{port}/') - start
+            prediction = first_success(f'http://127.0.0.1:{port}/api/check-readiness', READINESS_BODY) - start
+        finally:
+            os.killpg(process.pid, signal.SIGTERM)
+            process.wait()
+        samples.append({'first_page_seconds': round(page, 3), 'first_prediction_seconds': round(prediction, 3)})
+    return {
+        'gunicorn_args': gunicorn_args,
+        'runs': samples,
+        'median_first_page_seconds': sorted(s['first_page_seconds'] for s in samples)[len(samples) // 2],
+        'median_first_prediction_seconds': sorted(s['first_prediction_seconds'] for s in samples)[len(samples) // 2]
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--top', type=int, default=15, help='number of top-level imports to list')
+    parser.add_argument('--gunicorn-args', default='--config gunicorn.conf.py app:app',
+                        help='gunicorn arguments for the TTFB measurement (without --bind)')
+    parser.add_argument('--runs', type=int, default=3, help='gunicorn boots to time')
+    parser.add_argument('--skip-ttfb', action='store_true', help='only report import costs')
+    args = parser.parse_args(argv)
+
+    report = import_profile(args.top)
+    if not args.skip_ttfb:
+        report['ttfb'] = time_to_first_byte(args.gunicorn_args, args.runs)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+import os
+
+# Keep the suite out of the instance folder; set before app is imported
+for name in ('PRS_STORE_PATH', 'PRS_HISTORY_PATH', 'PRS_STATS_DIR', 'PRS_METRICS_DIR', 'PRS_CAPTURE_PATH'):
+    os.environ[name] = ''
+# Registers the ?profile=1 hooks; tests that need profiling off patch PROFILE_TOKEN
+os.environ['PRS_PROFILE_TOKEN'] = 'test-profile-token'
+
+import pytest
+
+import app as prs
+
+
+@pytest.fixture(scope='session', autouse=True)
+def loaded_model():
+    prs.predictor.wait_until_loaded()
+    return prs.predictor
+
+
+@pytest.fixture
+def client():
+    return prs.app.test_client()
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+
+import pytest
+from werkzeug.test import Client
+
+import app as prs
+
+
+class BlockingApp:
+    """WSGI app whose /slow route holds its admission slot until released"""
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self, environ, start_response):
+        if environ['PATH_INFO'] == '/slow':
+            self.started.set()
+            self.release.wait(5)
+        start_response('200 OK', [('Content-Type', 'text/plain')])
+        return [b'ok']
+
+
+@pytest.fixture
+def busy():
+    """A controller with one expensive slot, held by a request in another thread"""
+    inner = BlockingApp()
+    controller = prs.AdmissionController(inner, max_inflight=1, cheap_reserve=1, queue_ms=50)
+    client = Client(controller)
+    holder = threading.Thread(target=lambda: client.get('/slow').close())
+    holder.start()
+    assert inner.started.wait(2)
+    yield controller, client
+    inner.release.set()
+    holder.join(5)
+
+
+def test_expensive_request_is_shed_with_retry_after(busy):
+    controller, client = busy
+    start = time.perf_counter()
+    response = client.get('/slow')
+    assert response.status_code == 503
+    assert int(response.headers['Retry-After']) >= 1
+    assert response.get_json() == {'error': 'Server busy, please retry shortly'}
+    assert time.perf_counter() - start < 1
+    assert controller.stats['shed']['expensive:queue_time'] == 1
+
+
+def test_request_queued_upstream_past_its_budget_is_shed_at_once(busy):
+    controller, client = busy
+    response = client.get('/slow', headers={'X-Request-Start': f't={time.time() - 1:.3f}'})
+    assert response.status_code == 503
+    assert controller.waiting == 0
+
+
+def test_cheap_routes_use_the_reserve_while_expensive_ones_are_shed(busy):
+    controller, client = busy
+    assert client.get('/api/health').status_code == 200
+    assert client.get('/api/assess/batch').status_code == 503
+    assert controller.stats['admitted']['cheap'] == 1
+
+
+def test_routes_are_classified_by_method_and_endpoint(busy):
+    controller, client = busy
+    for method, path in (('GET', '/assessment'), ('HEAD', '/assessment'), ('GET', '/projects'),
+                         ('GET', '/learning-resources'), ('GET', '/assets/app.css')):
+        response = client.open(path, method=method)
+        assert response.status_code == 200
+        response.close()
+    assert controller.stats['admitted']['cheap'] == 5
+    assert client.post('/assessment').status_code == 503
+    assert client.get('/no-such-page').status_code == 503
+    assert controller.stats['shed']['expensive:queue_time'] == 2
+
+
+def test_slot_is_released_when_the_body_is_closed():
+    controller = prs.AdmissionController(BlockingApp(), max_inflight=1, cheap_reserve=0, queue_ms=50)
+    client = Client(controller)
+    for _ in range(3):
+        response = client.get('/fast')
+        assert response.status_code == 200
+        assert controller.expensive == 1
+        response.close()
+        assert controller.inflight == 0 and controller.expensive == 0
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+import gzip
+import hashlib
+import json
+
+import pytest
+
+import app as prs
+
+CSS = '''/* theme */
+.card  >  .title {
+    color: red;   /* brand */
+    content: "a  /* not a comment */  b";
+}
+'''
+
+JS = r'''// header
+var half = total / 2 / count;   // division
+var slashes = /\/\//g, quote = /"/, klass = /[/]/;
+if (/^a'b$/.test(name)) { return /x/i }
+var url = `http://example.com/${half}`;
+/* block
+   comment */
+counter++ / 2
+'''
+
+
+def test_minify_css_keeps_strings_and_drops_comments():
+    assert prs.minify_css(CSS) == '.card>.title{color:red;content:"a  /* not a comment */  b"}'
+
+
+def test_minify_js_keeps_regex_literals_and_template_strings():
+    assert prs.minify_js(JS) == (
+        'var half = total / 2 / count;\n'
+        'var slashes = /\\/\\//g, quote = /"/, klass = /[/]/;\n'
+        "if (/^a'b$/.test(name)) { return /x/i }\n"
+        'var url = `http://example.com/${half}`;\n'
+        'counter++ / 2\n')
+
+
+@pytest.fixture
+def built_assets(tmp_path):
+    source, dist = tmp_path / 'static', tmp_path / 'static' / 'dist'
+    (source / 'css').mkdir(parents=True)
+    (source / 'css' / 'site.css').write_text(CSS * 20)
+    (source / 'js').mkdir()
+    (source / 'js' / 'app.js').write_text(JS * 20)
+    manifest = prs.build_assets(str(source), str(dist))
+    return source, dist, manifest
+
+
+def test_build_assets_fingerprints_minified_content(built_assets):
+    source, dist, manifest = built_assets
+    entry = manifest['css/site.css']
+    content = (dist / entry['path']).read_bytes()
+    assert content == prs.minify_css(CSS * 20).encode()
+    assert entry['path'] == f"css/site.{hashlib.sha256(content).hexdigest()[:12]}.css"
+    assert entry['source_sha256'] == hashlib.sha256((source / 'css' / 'site.css').read_bytes()).hexdigest()
+    assert gzip.decompress((dist / (entry['path'] + '.gz')).read_bytes()) == content
+    assert json.loads((dist / 'manifest.json').read_text()) == manifest
+
+
+def test_changed_source_makes_the_manifest_stale(built_assets, capsys):
+    source, dist, manifest = built_assets
+    assert prs.load_asset_manifest(str(dist / 'manifest.json'), str(source)) == manifest
+    (source / 'js' / 'app.js').write_text(JS)
+    assert prs.load_asset_manifest(str(dist / 'manifest.json'), str(source)) == {}
+    assert 'static/js/app.js changed since the last asset build' in capsys.readouterr().err
+
+
+def test_asset_route_negotiates_encoding_and_etag(built_assets, monkeypatch, client):
+    _, dist, manifest = built_assets
+    previous = dict(prs.asset_manifest)
+    monkeypatch.setattr(prs, 'ASSET_DIST_DIR', str(dist))
+    prs.install_asset_manifest(manifest)
+    try:
+        entry = manifest['js/app.js']
+        url = f"/assets/{entry['path']}"
+        etags = set()
+        for accept, expected in (('br, gzip', entry['encodings'][0]), ('gzip', 'gzip'), ('', None)):
+            response = client.get(url, headers={'Accept-Encoding': accept})
+            assert response.status_code == 200
+            assert response.headers.get('Content-Encoding') == expected
+            assert response.headers['Vary'] == 'Accept-Encoding'
+            assert response.headers['Cache-Control'] == prs.ASSET_CACHE_CONTROL
+            etags.add(response.headers['ETag'])
+            cached = client.get(url, headers={'Accept-Encoding': accept, 'If-None-Match': response.headers['ETag']})
+            assert cached.status_code == 304
+        assert len(etags) == 3
+        assert client.get('/assets/js/app.000000000000.js').status_code == 404
+    finally:
+        prs.install_asset_manifest(previous)
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+
+import app as prs
+
+
+@pytest.mark.parametrize('value, expected', [
+    (7, 7), ('7', 7), (5.5, 5), ('5.5', 5), (' 8 ', 8), (None, 5), ('', 5), (0, 1), (99, 10), ('-3', 1)
+])
+def test_parse_input_value_accepts_numbers_and_numeric_strings(value, expected):
+    assert prs.parse_input_value('dsa_level', value) == expected
+
+
+@pytest.mark.parametrize('value', ['abc', 'nan', 'inf', '1e400', float('inf'), 10 ** 30, 10 ** 400,
+                                   True, [1], {'a': 1}])
+def test_parse_input_value_rejects_everything_else(value):
+    with pytest.raises(ValueError):
+        prs.parse_input_value('dsa_level', value)
+
+
+@pytest.mark.parametrize('values', [
+    [7, 3, 10],
+    [5.5, 7.9, 1.0],
+    ['5.5', '7', 3],
+    [5.5, '7', None, ''],
+    [np.int64(4), 2.5, '9'],
+])
+def test_column_and_scalar_parsers_agree(values):
+    column = prs.parse_input_column('dsa_level', values)
+    assert column.tolist() == [prs.parse_input_value('dsa_level', value) for value in values]
+
+
+@pytest.mark.parametrize('values', [[1, 10 ** 30], [1.5, 10 ** 400], [1, 'x'], [1, True], [1, float('nan')]])
+def test_column_rejects_what_the_scalar_parser_rejects(values):
+    with pytest.raises(ValueError):
+        prs.parse_input_column('dsa_level', values)
+
+
+def test_clamp_inputs_matches_clamp_input_arrays():
+    rows = [{'dsa_level': '5.5', 'problem_count': 700, 'project_count': '2', 'github_quality': 3.9,
+             'domain_focus': '9'},
+            {'dsa_level': 7, 'problem_count': '', 'project_count': None, 'github_quality': '10',
+             'domain_focus': 4}]
+    columns = prs.clamp_input_arrays(rows)
+    for i, row in enumerate(rows):
+        assert {field: columns[field][i].item() for field in prs.MODEL_FEATURES} == prs.clamp_inputs(row)
+
+
+def test_batch_scores_match_single_scoring(client):
+    rows = [{'dsa_level': level, 'problem_count': level * 40, 'project_count': level % 6,
+             'github_quality': 11 - level, 'domain_focus': str(level % 8 + 1)} for level in range(1, 11)]
+    response = client.post('/api/assess/batch', json=rows)
+    assert response.status_code == 200
+    for row, result in zip(rows, response.get_json()['results']):
+        assert (result['overall_score'], result['prediction']) == prs.score_inputs(prs.clamp_inputs(row))
+
+
+def test_batch_accepts_csv(client):
+    body = 'dsa_level,problem_count,project_count,github_quality,domain_focus\n7,120,4,6,2\n5.5,,3,5,1\n'
+    response = client.post('/api/assess/batch', data=body, content_type='text/csv')
+    assert response.status_code == 200
+    assert [row['dsa_level'] for row in response.get_json()['results']] == [7, 5]
+
+
+def test_batch_csv_with_a_byte_order_mark(client):
+    body = '\ufeffdsa_level,problem_count,project_count,github_quality,domain_focus\n9,300,6,8,3\n'
+    response = client.post('/api/assess/batch', data=body.encode('utf-8'), content_type='text/csv')
+    assert response.status_code == 200
+    result = response.get_json()['results'][0]
+    assert result['dsa_level'] == 9 and result['domain_focus'] == '3'
+
+
+@pytest.mark.parametrize('rows', [
+    [{'dsa_level': 10 ** 30}],
+    [{'dsa_level': 5.5}, {'dsa_level': '5.5x'}],
+    [{'problem_count': [1, 2]}],
+    [{'github_quality': True}],
+    'not a list',
+    [1, 2, 3],
+])
+def test_invalid_batches_are_400(client, rows):
+    response = client.post('/api/assess/batch', json=rows)
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+
+def test_oversized_batch_is_413(client, monkeypatch):
+    monkeypatch.setattr(prs, 'MAX_BATCH_ROWS', 2)
+    response = client.post('/api/assess/batch', json=[{}, {}, {}])
+    assert response.status_code == 413
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+import copy
+import json
+
+import pytest
+
+import app as prs
+
+SAMPLE_FORM = {'dsa_level': '7', 'problem_count': '120', 'project_count': '4', 'github_quality': '6',
+               'domain_focus': '2'}
+
+
+def test_catalog_is_frozen_all_the_way_down():
+    with pytest.raises(TypeError):
+        prs.CATALOG.domains['1']['name'] = 'Changed'
+    with pytest.raises(TypeError):
+        prs.CATALOG.domains['1']['levels']['beginner'] = 'Changed'
+    with pytest.raises(TypeError):
+        prs.CATALOG.resources['1'][0]['url'] = 'http://example.com'
+    assert isinstance(prs.CATALOG.domains['1']['skills'], tuple)
+
+
+def test_to_dict_round_trips_the_tables():
+    data = json.loads(json.dumps(prs.CATALOG.to_dict()))
+    assert data['domains'] == prs.DOMAINS
+    assert data['learning_resources'] == {key: prs.LEARNING_RESOURCES[key] for key in prs.DOMAINS}
+    prs.ContentCatalog(data['domains'], data['project_suggestions'], data['learning_resources'])
+
+
+def test_non_object_resources_and_domains_are_rejected():
+    resources = copy.deepcopy(prs.LEARNING_RESOURCES)
+    resources['1'][0] = 'name url type'
+    domains = copy.deepcopy(prs.DOMAINS)
+    domains['2'] = 'name skills description levels icon color'
+    with pytest.raises(ValueError) as error:
+        prs.validate_content_tables(domains, prs.PROJECT_SUGGESTIONS, resources)
+    assert 'domain 1 entry 0 is not an object' in str(error.value)
+    assert 'domain 2: expected an object' in str(error.value)
+
+
+def test_pages_render_from_the_frozen_catalog(client):
+    client.post('/assessment', data=SAMPLE_FORM)
+    for path in ('/results', '/projects', '/learning-resources'):
+        response = client.get(path)
+        assert response.status_code == 200
+        assert prs.CATALOG.domains['2']['name'] in response.get_data(as_text=True)
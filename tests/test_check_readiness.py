@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+import app as prs
+
+
+def test_check_readiness_matches_score_inputs(client):
+    body = {'dsa_level': 7, 'problem_count': '120', 'project_count': 4, 'github_quality': 6.5, 'domain_focus': '2'}
+    response = client.post('/api/check-readiness', json=body)
+    assert response.status_code == 200
+    data = response.get_json()
+    assert (data['overall_score'], data['prediction']) == prs.score_inputs(prs.clamp_inputs(body))
+    assert data['domain_name'] == prs.DOMAINS['2']['name']
+
+
+def test_empty_body_uses_defaults(client):
+    response = client.post('/api/check-readiness')
+    assert response.status_code == 200
+    assert response.get_json()['domain_focus'] == '1'
+
+
+@pytest.mark.parametrize('body', [
+    b'[1, 2, 3]',
+    b'"text"',
+    b'{"dsa_level": 1e400}',
+    b'{"dsa_level": 100000000000000000000000000000000}',
+    b'{"dsa_level": "seven"}',
+    b'{"dsa_level": {"nested": 1}}',
+])
+def test_invalid_bodies_are_400(client, body):
+    response = client.post('/api/check-readiness', data=body, content_type='application/json')
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
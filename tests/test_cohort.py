@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+import csv
+import io
+import json
+
+import pytest
+
+import app as prs
+
+MIXED_RECORDS = [
+    {'student_id': 'a', 'dsa_level': 5.5, 'problem_count': 120},
+    {'student_id': 'b', 'dsa_level': '7', 'project_count': '2.5'},
+    {'student_id': 'c', 'dsa_level': 10 ** 30},
+    {'student_id': 'd', 'github_quality': 'ten'},
+    {'student_id': 'e', 'dsa_level': 1e308 * 10},
+    None,
+    ['not', 'a', 'record'],
+    {'student_id': 'f', 'domain_focus': 3},
+]
+
+
+def test_mixed_chunk_keeps_good_rows_and_flags_bad_ones():
+    rows = prs.score_cohort_chunk(MIXED_RECORDS)
+    assert len(rows) == len(MIXED_RECORDS)
+    assert [bool(row.get('error')) for row in rows] == [False, False, True, True, True, True, True, False]
+    assert rows[0]['dsa_level'] == 5 and rows[1]['dsa_level'] == 7 and rows[1]['project_count'] == 2
+    assert rows[7]['domain_focus'] == '3'
+    assert rows[5]['error'] == 'Invalid record'
+
+
+def test_chunk_results_do_not_depend_on_neighbours():
+    alone = [prs.score_cohort_chunk([record])[0] for record in MIXED_RECORDS]
+    assert prs.score_cohort_chunk(MIXED_RECORDS) == alone
+
+
+def test_good_rows_match_single_scoring():
+    record = {'student_id': 'x', 'dsa_level': '8', 'problem_count': 150.0, 'project_count': 5,
+              'github_quality': '7', 'domain_focus': '2'}
+    row = prs.score_cohort_chunk([record])[0]
+    assert (row['overall_score'], row['prediction']) == prs.score_inputs(prs.clamp_inputs(record))
+
+
+def test_all_bad_chunk():
+    rows = prs.score_cohort_chunk([{'dsa_level': 'x'}, None])
+    assert all(row['error'] for row in rows)
+
+
+def test_ndjson_import_streams_every_row_and_a_summary(client):
+    lines = [json.dumps(record) for record in MIXED_RECORDS] + ['{broken json']
+    response = client.post('/api/cohort/import', data='\n'.join(lines) + '\n', content_type='application/x-ndjson')
+    assert response.status_code == 200
+    output = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert output[-1]['summary']['rows'] == len(lines)
+    assert output[-1]['summary']['errors'] == 6
+    assert [row.get('student_id') for row in output[:3]] == ['a', 'b', 'c']
+
+
+@pytest.mark.parametrize('chunk_rows', [1, 2, 1000])
+def test_csv_import_is_independent_of_chunking(client, monkeypatch, chunk_rows):
+    monkeypatch.setattr(prs, 'COHORT_CHUNK_ROWS', chunk_rows)
+    body = ('student_id,dsa_level,problem_count,project_count,github_quality,domain_focus\n'
+            's1,5.5,100,3,5,1\n'
+            's2,7,abc,3,5,2\n'
+            's3,1e400,10,1,1,3\n'
+            's4,9,300,8,9,4\n')
+    response = client.post('/api/cohort/import', data=body, content_type='text/csv')
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert [row['student_id'] for row in rows] == ['s1', 's2', 's3', 's4']
+    assert [bool(row['error']) for row in rows] == [False, True, True, False]
+    assert rows[0]['dsa_level'] == '5'
+
+
+def test_malformed_rows_mid_file_are_rejected_and_the_stream_finishes(client):
+    header = b'student_id,dsa_level,problem_count,project_count,github_quality,domain_focus\n'
+    body = (header + b's1,5,100,3,5,1\n'
+            b's2,7,\xff\xfe,3,5,2\n'
+            b's3,6,' + b'9' * 200 + b',3,5,2\n'
+            b's4,9,300,8,9,4\n')
+    limit = csv.field_size_limit(100)
+    try:
+        response = client.post('/api/cohort/import?format=ndjson', data=body, content_type='text/csv')
+        output = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    finally:
+        csv.field_size_limit(limit)
+    assert [row.get('student_id') for row in output[:-1]] == ['s1', None, None, 's4']
+    assert [bool(row.get('error')) for row in output[:-1]] == [False, True, True, False]
+    assert output[-1]['summary']['rows'] == 4 and output[-1]['summary']['errors'] == 2
+
+
+def test_csv_import_with_a_byte_order_mark(client):
+    body = '﻿student_id,dsa_level,problem_count,project_count,github_quality,domain_focus\ns1,5,100,3,5,1\n'
+    response = client.post('/api/cohort/import', data=body.encode('utf-8'), content_type='text/csv')
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert rows[0]['student_id'] == 's1' and not rows[0]['error']
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+import app as prs
+
+FORM = {'dsa_level': '6', 'problem_count': '150', 'project_count': '2', 'github_quality': '5', 'domain_focus': '2'}
+
+
+@pytest.fixture
+def stats(monkeypatch):
+    stats = prs.CohortStats('')
+    monkeypatch.setattr(prs, 'cohort_stats', stats)
+    return stats
+
+
+def test_percentile_rank_leaves_out_the_candidates_own_submission():
+    distribution = prs.ScoreDistribution()
+    for score in (40.0, 50.0, 60.0, 70.0):
+        distribution.add(score)
+    assert prs.percentile_rank([distribution], 60.0) == 62.5
+    assert prs.percentile_rank([distribution], 60.0, exclude=1) == pytest.approx(200 / 3)
+    # Not synced from another worker yet: nothing at the score to leave out
+    assert prs.percentile_rank([distribution], 65.0, exclude=1) == 75.0
+    assert prs.percentile_rank([distribution], 60.0, exclude=1, min_count=4) is None
+
+
+def test_first_submission_gets_no_percentile(client, stats):
+    client.post('/assessment', data=FORM)
+    page = client.get('/results').get_data(as_text=True)
+    assert 'You scored higher than' not in page
+
+
+def test_percentile_appears_once_the_domain_has_enough_peers(client, stats):
+    for _ in range(prs.COHORT_MIN_PEERS):
+        stats.add('2', 1.0)
+    client.post('/assessment', data=FORM)
+    page = client.get('/results').get_data(as_text=True)
+    assert 'You scored higher than 100% of' in page
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+import itertools
+
+import pytest
+
+import app as prs
+
+# Values either side of every percentage tier (40%/70%) and tip threshold
+DSA_LEVELS = (1, 3, 4, 5, 6, 7, 10)
+PROBLEM_COUNTS = (0, 50, 79, 80, 99, 100, 139, 140, 150, 199, 200, 300, 500)
+PROJECT_COUNTS = (0, 2, 3, 4, 6, 7, 10, 50)
+GITHUB_QUALITIES = (1, 3, 4, 5, 6, 7, 10)
+
+
+def baseline_dashboard(assessment_data):
+    """The hand-written /dashboard logic the skill-dimension table replaced"""
+    overall_score = assessment_data['overall_score']
+    max_values = {'dsa_level': 10, 'problem_count': 200, 'project_count': 10, 'github_quality': 10}
+    labels = {'dsa_level': ('DSA Proficiency', '#8b5cf6'), 'problem_count': ('Problems Solved', '#10b981'),
+              'project_count': ('Projects Completed', '#3b82f6'), 'github_quality': ('GitHub Quality', '#ef4444')}
+    skill_data = {}
+    for key, maximum in max_values.items():
+        percentage = min(100, int((assessment_data[key] / maximum) * 100))
+        skill_data[key] = {
+            'value': assessment_data[key],
+            'percentage': percentage,
+            'max': maximum,
+            'label': labels[key][0],
+            'color': labels[key][1],
+            'level': 'Beginner' if percentage < 40 else 'Intermediate' if percentage < 70 else 'Advanced'
+        }
+
+    improvement_tips = []
+    if assessment_data['dsa_level'] < 6:
+        improvement_tips.append(f'Improve DSA skills: Current {assessment_data["dsa_level"]}/10 (Target: 7+)')
+    if assessment_data['problem_count'] < 100:
+        improvement_tips.append(f'Solve more problems: Current {assessment_data["problem_count"]} (Target: 150+)')
+    if assessment_data['project_count'] < 3:
+        improvement_tips.append(f'Build more projects: Current {assessment_data["project_count"]} (Target: 5+)')
+    if assessment_data['github_quality'] < 6:
+        improvement_tips.append(f'Improve GitHub profile: Current {assessment_data["github_quality"]}/10 (Target: 7+)')
+    if not improvement_tips:
+        if overall_score >= 60:
+            improvement_tips += ['Prepare for technical interviews with mock sessions',
+                                 'Contribute to open-source projects',
+                                 'Build advanced projects to showcase expertise']
+        else:
+            improvement_tips += ['Focus on building a strong foundation with basic projects',
+                                 'Solve at least 100 coding problems regularly',
+                                 'Complete 3-5 meaningful projects for your portfolio']
+    return {'skill_data': skill_data, 'improvement_tips': improvement_tips}
+
+
+def boundary_assessments(domain_focus):
+    for dsa_level, problem_count, project_count, github_quality in itertools.product(
+            DSA_LEVELS, PROBLEM_COUNTS, PROJECT_COUNTS, GITHUB_QUALITIES):
+        yield {'dsa_level': dsa_level, 'problem_count': problem_count, 'project_count': project_count,
+               'github_quality': github_quality, 'domain_focus': domain_focus,
+               'overall_score': prs.calculate_overall_score(dsa_level, problem_count, project_count, github_quality)}
+
+
+@pytest.mark.parametrize('domain_focus', list(prs.DOMAINS))
+def test_build_dashboard_matches_the_baseline(domain_focus):
+    for assessment_data in boundary_assessments(domain_focus):
+        assert prs.build_dashboard(assessment_data) == baseline_dashboard(assessment_data), assessment_data
+
+
+def test_build_dashboards_matches_the_baseline_in_one_pass():
+    assessments = list(boundary_assessments('1'))
+    values = [[data[dimension['key']] for dimension in prs.SKILL_DIMENSIONS] for data in assessments]
+    dashboards = prs.build_dashboards(values, [data['overall_score'] for data in assessments])
+    assert dashboards == [baseline_dashboard(data) for data in assessments]
+
+
+@pytest.mark.parametrize('overall_score', [59.9, 60.0])
+def test_general_tips_switch_at_the_readiness_score(overall_score):
+    assessment_data = {'dsa_level': 6, 'problem_count': 100, 'project_count': 3, 'github_quality': 6,
+                       'overall_score': overall_score}
+    assert prs.build_dashboard(assessment_data) == baseline_dashboard(assessment_data)
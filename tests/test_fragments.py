@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+import json
+
+import pytest
+
+import app as prs
+
+NOT_READY = {'dsa_level': '1', 'problem_count': '0', 'project_count': '0', 'github_quality': '1', 'domain_focus': '2'}
+READY = {'dsa_level': '10', 'problem_count': '500', 'project_count': '50', 'github_quality': '10', 'domain_focus': '2'}
+
+
+def results_page(form):
+    client = prs.app.test_client()
+    client.post('/assessment', data=form)
+    response = client.get('/results')
+    assert response.status_code == 200
+    return response.get_data(as_text=True)
+
+
+def test_results_fragments_are_cached_per_prediction():
+    ready, not_ready = results_page(READY), results_page(NOT_READY)
+    ready_ideas = prs.CATALOG.top_suggestions[('1', '2')]
+    beginner_ideas = prs.CATALOG.top_suggestions[('0', '2')]
+    assert set(ready_ideas) != set(beginner_ideas)
+    assert all(idea in ready for idea in ready_ideas)
+    assert all(idea in not_ready for idea in beginner_ideas)
+    assert not any(idea in not_ready for idea in set(ready_ideas) - set(beginner_ideas))
+    assert ('partials/results_domain.html', '2', 1) in prs._fragment_cache
+    assert ('partials/results_domain.html', '2', 0) in prs._fragment_cache
+
+
+@pytest.fixture
+def catalog_file(tmp_path):
+    original = tmp_path / 'original.json'
+    original.write_text(json.dumps(prs.CATALOG.to_dict()))
+    yield tmp_path / 'catalog.json'
+    prs.reload_catalog(str(original))
+
+
+def test_catalog_reload_drops_cached_fragments(catalog_file):
+    results_page(READY)
+    data = prs.CATALOG.to_dict()
+    data['project_suggestions']['1']['2'] = ['Reloaded capstone idea'] + data['project_suggestions']['1']['2']
+    catalog_file.write_text(json.dumps(data))
+    prs.reload_catalog(str(catalog_file))
+    assert not prs._fragment_cache and not prs._page_cache
+    assert 'Reloaded capstone idea' in results_page(READY)
+    assert prs.search_index.search('capstone')[0]['title'] == 'Reloaded capstone idea'
+
+
+def test_catalog_reload_keeps_the_domain_keys(catalog_file):
+    data = prs.CATALOG.to_dict()
+    del data['domains']['8'], data['learning_resources']['8']
+    catalog_file.write_text(json.dumps(data))
+    with pytest.raises(ValueError):
+        prs.reload_catalog(str(catalog_file))
+    assert '8' in prs.CATALOG.domains
+
+
+def test_catalog_reload_endpoint_needs_the_admin_token(client, monkeypatch, catalog_file):
+    catalog_file.write_text(json.dumps(prs.CATALOG.to_dict()))
+    monkeypatch.setattr(prs, 'ADMIN_TOKEN', 'secret')
+    monkeypatch.setattr(prs, 'CATALOG_PATH', str(catalog_file))
+    assert client.post('/api/catalog/reload').status_code == 404
+    response = client.post('/api/catalog/reload', headers={'X-Admin-Token': 'secret'})
+    assert response.status_code == 200 and response.get_json()['domains'] == len(prs.DOMAINS)
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+import json
+import threading
+import time
+
+import app as prs
+
+INPUTS = {'dsa_level': 6, 'problem_count': 150, 'project_count': 2, 'github_quality': 5, 'domain_focus': 'Web'}
+
+
+def test_stop_writes_the_batch_the_thread_already_dequeued():
+    written = []
+    started = threading.Event()
+
+    def slow_write(batch):
+        started.set()
+        time.sleep(0.2)
+        written.extend(batch)
+
+    writer = prs.BatchWriter(slow_write, 'test-writer', queue_size=100, batch_rows=5, flush_seconds=0.01)
+    for item in range(5):
+        assert writer.put(item)
+    assert started.wait(2)
+    for item in range(5, 12):
+        writer.put(item)
+    writer.stop()
+    assert written == list(range(12))
+
+
+def test_stopped_writer_restarts_on_the_next_put():
+    written = []
+    writer = prs.BatchWriter(written.extend, 'test-writer', queue_size=10, batch_rows=10, flush_seconds=5)
+    writer.put(1)
+    writer.stop()
+    writer.put(2)
+    writer.stop()
+    assert written == [1, 2]
+
+
+def test_history_flush_feeds_the_analytics_endpoints(tmp_path, monkeypatch, client):
+    history = prs.AssessmentHistory(str(tmp_path / 'history.sqlite3'), flush_seconds=5)
+    monkeypatch.setattr(prs, 'assessment_history', history)
+    for _ in range(3):
+        history.record(INPUTS, 72.0, 1)
+    history.flush()
+    assert history.stats['written'] == 3
+    histogram = client.get('/api/analytics/score-histogram').get_json()
+    assert histogram['domains']['Web'][7] == 3
+    days = client.get('/api/analytics/readiness-rate').get_json()['days']
+    assert days[-1]['assessments'] == 3 and days[-1]['readiness_rate'] == 1.0
+
+
+def test_analytics_answer_json_404_while_history_is_disabled(client):
+    assert not prs.assessment_history.enabled
+    for route in ('score-histogram', 'readiness-rate', 'weak-dimensions'):
+        response = client.get(f'/api/analytics/{route}')
+        assert response.status_code == 404
+        assert response.get_json() == {'error': 'Assessment history is disabled'}
+
+
+def test_capture_flush_appends_every_queued_request(tmp_path):
+    capture = prs.TrafficCapture(str(tmp_path / 'capture.jsonl'), flush_seconds=5)
+    for days in range(3):
+        with prs.app.test_request_context(f'/api/analytics/readiness-rate?days={days + 1}'):
+            capture.start_request()
+            capture.finish_request(prs.app.response_class(status=200))
+    capture.flush()
+    records = [json.loads(line) for line in (tmp_path / 'capture.jsonl').read_text().splitlines()]
+    assert [record['query'] for record in records] == [{'days': '1'}, {'days': '2'}, {'days': '3'}]
+    assert capture.stats['written'] == 3
+
+
+def test_capture_leaves_streamed_cohort_uploads_to_the_endpoint(tmp_path):
+    capture = prs.TrafficCapture(str(tmp_path / 'capture.jsonl'), flush_seconds=5)
+    body = ''.join(json.dumps(dict(INPUTS, domain_focus='2', student_id=str(i))) + '\n' for i in range(2))
+    with prs.app.test_request_context('/api/cohort/import', method='POST', data=body,
+                                      content_type='application/json'):
+        capture.start_request()
+        response = capture.finish_request(prs.cohort_import())
+        lines = ''.join(response.response).splitlines()
+    assert json.loads(lines[-1])['summary']['rows'] == 2
+    capture.flush()
+    record = json.loads((tmp_path / 'capture.jsonl').read_text())
+    assert 'json' not in record and record['body_bytes'] == len(body)
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+import gzip
+
+import pytest
+
+import app as prs
+
+NOT_READY = {'dsa_level': '1', 'problem_count': '0', 'project_count': '0', 'github_quality': '1', 'domain_focus': '2'}
+READY = {'dsa_level': '10', 'problem_count': '500', 'project_count': '50', 'github_quality': '10', 'domain_focus': '2'}
+DECODERS = {'br': prs.brotli and prs.brotli.decompress, 'gzip': gzip.decompress, None: bytes}
+
+
+def assessed_client(form):
+    client = prs.app.test_client()
+    client.post('/assessment', data=form)
+    return client
+
+
+@pytest.mark.parametrize('path', ['/', '/about', '/missing'])
+def test_if_none_match_gets_a_304(client, path):
+    response = client.get(path, headers={'Accept-Encoding': 'gzip'})
+    etag = response.headers['ETag']
+    cached = client.get(path, headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+    if response.status_code == 200:
+        assert cached.status_code == 304 and cached.data == b''
+        assert cached.headers['ETag'] == etag
+    else:
+        # Error pages are never answered with 304
+        assert cached.status_code == 404 and cached.data == response.data
+    assert client.get(path, headers={'If-None-Match': etag}).status_code != 304
+
+
+@pytest.mark.parametrize('accept, expected', [('br, gzip', 'br'), ('gzip, deflate', 'gzip'),
+                                              ('', None), ('identity', None), ('deflate', None)])
+def test_accept_encoding_picks_the_matching_variant(client, accept, expected):
+    if expected == 'br' and prs.brotli is None:
+        expected = 'gzip'
+    plain = client.get('/about', headers={'Accept-Encoding': ''})
+    response = client.get('/about', headers={'Accept-Encoding': accept})
+    assert response.status_code == 200
+    assert response.headers.get('Content-Encoding') == expected
+    assert response.headers['Vary'] == 'Accept-Encoding'
+    assert response.headers['Cache-Control'] == prs.PAGE_CACHE_CONTROL
+    assert DECODERS[expected](response.data) == plain.data
+
+
+def test_private_pages_vary_on_the_cookie_too():
+    response = assessed_client(READY).get('/projects', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Cache-Control'] == prs.PRIVATE_PAGE_CACHE_CONTROL
+    assert {'Accept-Encoding', 'Cookie'} <= {value.strip() for value in response.headers['Vary'].split(',')}
+
+
+@pytest.mark.parametrize('path', ['/projects', '/learning-resources'])
+def test_cached_pages_are_separate_per_prediction(path):
+    ready, not_ready = assessed_client(READY), assessed_client(NOT_READY)
+    ready_body = ready.get(path).get_data(as_text=True)
+    not_ready_body = not_ready.get(path).get_data(as_text=True)
+    assert ready_body != not_ready_body
+    assert ready.get(path).get_data(as_text=True) == ready_body
+    other_domain = assessed_client(dict(READY, domain_focus='3')).get(path).get_data(as_text=True)
+    assert prs.DOMAINS['3']['name'] in other_domain and prs.DOMAINS['3']['name'] not in ready_body
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+import threading
+
+import numpy as np
+import pytest
+
+import app as prs
+
+
+def test_counters_add_up_across_threads():
+    predictor = prs.ReadinessPredictor()
+    rows = np.array([[5, 50, 3, 5, 1]] * 3, dtype=np.float64)
+
+    def predict():
+        for _ in range(500):
+            predictor.predict_batch(rows)
+
+    threads = [threading.Thread(target=predict) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert predictor.stats['fallback_calls'] == 8 * 500
+    assert predictor.stats['fallback_rows'] == 8 * 500 * 3
+
+
+@pytest.fixture(scope='module')
+def table(loaded_model):
+    return prs.ScoreLookupTable.build(loaded_model)
+
+
+def test_lookup_table_agrees_with_the_formula_and_model(table):
+    checks = table.verify(prs.predictor, sample_size=5000)
+    assert checks['score_mismatches'] == 0
+    assert checks['prediction_mismatches'] == 0
+
+
+def test_lookup_matches_score_inputs(table, monkeypatch):
+    rng = np.random.default_rng(1)
+    samples = [prs.clamp_inputs({'dsa_level': int(rng.integers(1, 11)), 'problem_count': int(rng.integers(0, 501)),
+                                 'project_count': int(rng.integers(0, 51)), 'github_quality': int(rng.integers(1, 11)),
+                                 'domain_focus': str(rng.choice(list(prs.DOMAINS)))})
+               for _ in range(200)]
+    expected = [prs.score_inputs(inputs) for inputs in samples]
+    monkeypatch.setattr(prs, 'lookup_table', table)
+    assert [prs.score_inputs(inputs) for inputs in samples] == expected
+
+    columns = prs.clamp_input_arrays(samples)
+    scores, predictions = table.lookup_arrays(columns)
+    assert scores.tolist() == [score for score, _ in expected]
+    assert predictions.tolist() == [prediction for _, prediction in expected]
+
+
+def test_saved_table_reloads_only_for_the_same_model(table, tmp_path):
+    table.save(str(tmp_path), 'model-a')
+    loaded = prs.ScoreLookupTable.load(str(tmp_path), 'model-a')
+    assert np.array_equal(loaded.predictions, table.predictions)
+    assert prs.ScoreLookupTable.load(str(tmp_path), 'model-b') is None
+
+
+class StuckPredictor:
+    """Blocks model calls from the batching thread until released"""
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def predict_batch(self, rows):
+        if threading.current_thread().name == 'prediction-batcher':
+            self.release.wait(5)
+        return prs.predictor.predict_batch(rows)
+
+
+def test_batcher_predicts_the_row_itself_when_the_batch_times_out():
+    stuck = StuckPredictor()
+    batcher = prs.PredictionBatcher(stuck, window_ms=1, timeout_ms=50)
+    row = (8, 300, 4, 8, '2')
+    try:
+        assert batcher.predict_one(*row) == prs.predictor.predict_one(*row)
+        assert batcher.stats['timeouts'] == 1
+    finally:
+        stuck.release.set()
+    # The batching thread skips the abandoned row and keeps serving
+    assert batcher.predict_one(*row) == prs.predictor.predict_one(*row)
+    assert batcher.stats['timeouts'] == 1
+
+
+class BrokenModel:
+    def predict(self, rows):
+        raise RuntimeError('model exploded')
+
+
+def test_prediction_failure_is_logged_and_falls_back(caplog, capsys):
+    predictor = prs.ReadinessPredictor()
+    predictor._active = (BrokenModel(), 1, 'broken')
+    rows = np.array([[9, 400, 6, 9, 2]], dtype=np.float64)
+    with caplog.at_level('WARNING', logger=prs.app.logger.name):
+        assert predictor.predict_batch(rows).tolist() == [1]
+    assert 'model exploded' in caplog.text
+    assert predictor.stats['fallback_calls'] == 1
+    assert capsys.readouterr().out == ''
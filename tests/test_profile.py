@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+
+import pytest
+
+import app as prs
+
+TOKEN = {'X-Profile-Token': 'test-profile-token'}
+
+
+@pytest.fixture(autouse=True)
+def profile_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(prs, 'PROFILE_DIR', str(tmp_path))
+
+
+def test_profile_parameter_returns_cprofile_stats(client):
+    response = client.get('/about?profile=1&profile_lines=5', headers=TOKEN)
+    assert response.mimetype == 'text/plain'
+    assert response.headers['X-Profiled-Status'] == '200'
+    assert 'function calls' in response.get_data(as_text=True)
+    assert not prs._request_profile_lock.locked()
+
+
+def test_second_profiled_request_gets_a_409(client):
+    started, release = threading.Event(), threading.Event()
+
+    def slow_view():
+        started.set()
+        release.wait(5)
+        return 'done'
+
+    # A profiled request in flight on another thread, as on a threaded worker
+    holder = threading.Thread(target=lambda: client.get('/about?profile=1', headers=TOKEN))
+    original = prs.app.view_functions['about']
+    prs.app.view_functions['about'] = slow_view
+    try:
+        holder.start()
+        assert started.wait(5)
+        response = prs.app.test_client().get('/api/health?profile=1', headers=TOKEN)
+        assert response.status_code == 409
+        assert prs.app.test_client().get('/api/health').status_code == 200
+    finally:
+        release.set()
+        holder.join(5)
+        prs.app.view_functions['about'] = original
+    assert not prs._request_profile_lock.locked()
+    assert client.get('/api/health?profile=1', headers=TOKEN).headers['X-Profiled-Status'] == '200'
+
+
+def test_profiling_is_gated_by_the_token(client, monkeypatch):
+    for headers in ({}, {'X-Profile-Token': 'wrong'}):
+        assert 'X-Profiled-Status' not in client.get('/about?profile=1', headers=headers).headers
+        assert client.post('/api/profile/sample', headers=headers).status_code == 404
+        assert client.get('/api/profile/sample/0123abcd', headers=headers).status_code == 404
+    monkeypatch.setattr(prs, 'PROFILE_TOKEN', '')
+    assert 'X-Profiled-Status' not in client.get('/about?profile=1', headers=TOKEN).headers
+    assert client.post('/api/profile/sample', headers=TOKEN).status_code == 404
+
+
+def test_sampler_writes_collapsed_stacks(client):
+    response = client.post('/api/profile/sample?seconds=0.2&interval_ms=5&mode=thread', headers=TOKEN)
+    assert response.status_code == 202
+    result = response.get_json()['result']
+    assert client.post('/api/profile/sample?seconds=0.2&mode=thread', headers=TOKEN).status_code == 409
+    for _ in range(50):
+        collapsed = client.get(result, headers=TOKEN)
+        if collapsed.status_code == 200:
+            break
+        time.sleep(0.05)
+    assert collapsed.status_code == 200
+    assert collapsed.get_data(as_text=True).startswith('# pid=')
+    assert client.post('/api/profile/sample?mode=bogus', headers=TOKEN).status_code == 400
+    assert client.get('/api/profile/sample/not-hex', headers=TOKEN).status_code == 404
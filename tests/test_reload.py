@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+import pickle
+
+import numpy as np
+
+import app as prs
+
+
+class ThresholdModel:
+    """Picklable stand-in for the sklearn model: ready from dsa_level >= threshold"""
+
+    classes_ = np.array([0, 1])
+
+    def __init__(self, threshold):
+        self.threshold = threshold
+
+    def predict(self, rows):
+        return (np.asarray(rows)[:, 0] >= self.threshold).astype(np.int64)
+
+
+def write_model(path, model):
+    with open(path, 'wb') as f:
+        pickle.dump(model, f)
+    return str(path)
+
+
+def reload_and_wait(predictor, path):
+    assert predictor.reload(path)
+    with predictor._reload_lock:
+        pass
+    return predictor.stats['last_reload']
+
+
+def test_reload_swaps_the_model_and_notifies_listeners(tmp_path):
+    predictor = prs.ReadinessPredictor()
+    swaps = []
+    predictor.swap_listeners.append(swaps.append)
+    report = reload_and_wait(predictor, write_model(tmp_path / 'model.pkl', ThresholdModel(6)))
+    assert 'error' not in report and predictor.stats['reloads'] == 1
+    assert swaps == [predictor]
+    assert predictor.predict_one(6, 0, 0, 1, '1') == 1 and predictor.predict_one(5, 500, 50, 10, '1') == 0
+
+
+def test_failed_validation_keeps_the_current_model(tmp_path):
+    predictor = prs.ReadinessPredictor()
+    reload_and_wait(predictor, write_model(tmp_path / 'good.pkl', ThresholdModel(6)))
+    good = predictor.model
+    # Calls the weakest canned profile ready, so it must be rejected
+    report = reload_and_wait(predictor, write_model(tmp_path / 'bad.pkl', ThresholdModel(1)))
+    assert 'wrong way round' in report['error']
+    assert predictor.model is good and predictor.stats['reload_failures'] == 1
+
+
+def test_unchanged_content_is_not_swapped_again(tmp_path):
+    predictor = prs.ReadinessPredictor()
+    swaps = []
+    predictor.swap_listeners.append(swaps.append)
+    path = write_model(tmp_path / 'model.pkl', ThresholdModel(6))
+    reload_and_wait(predictor, path)
+    model = predictor.model
+    report = reload_and_wait(predictor, write_model(tmp_path / 'model.pkl', ThresholdModel(6)))
+    assert report['unchanged'] and predictor.model is model and len(swaps) == 1
+
+
+def test_swap_drops_the_previous_lookup_table(monkeypatch):
+    stale, fresh = object(), object()
+    monkeypatch.setattr(prs, 'LOOKUP_TABLE', 'memory')
+    monkeypatch.setattr(prs, 'lookup_table', stale)
+    seen = []
+    monkeypatch.setattr(prs, 'init_lookup_table', lambda: seen.append(prs.lookup_table) or fresh)
+    prs.refresh_lookup_table(prs.predictor)
+    assert seen == [None] and prs.lookup_table is fresh
@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+import app as prs
+
+DOMAIN = {'name': 'Web Development'}
+
+
+def tied_index(count):
+    documents = [prs.search_document('skill', '1', DOMAIN, f'Graphs {index:04d}', 'skill') for index in range(count)]
+    documents[count // 2] = prs.search_document('skill', '2', DOMAIN, 'Graphs boosted', 'skill')
+    return prs.SearchIndex(documents)
+
+
+def test_ties_at_the_limit_keep_catalog_order():
+    index = tied_index(300)
+    results = index.search('graphs', domain_key='2', limit=5)
+    assert [result['title'] for result in results] == ['Graphs boosted'] + [f'Graphs {i:04d}' for i in range(4)]
+
+
+def test_catalog_search_is_deterministic_for_every_limit():
+    everything = prs.search_index.search('a', limit=1000)
+    for limit in (1, 3, 10, 25):
+        assert prs.search_index.search('a', limit=limit) == everything[:limit]
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+import json
+import multiprocessing
+import os
+import threading
+
+import app as prs
+
+fork = multiprocessing.get_context('fork')
+
+
+def counts(stats, domain_focus='1'):
+    return sum(distribution.count for distribution in stats.distributions(domain_focus))
+
+
+def add_and_exit(directory, scores):
+    stats = prs.CohortStats(directory, persist_seconds=3600)
+    for score in scores:
+        stats.add('1', score)
+    stats.sync()
+
+
+def add_and_wait(directory, scores, ready, release):
+    stats = prs.CohortStats(directory, persist_seconds=3600)
+    for score in scores:
+        stats.add('1', score)
+    stats.sync()
+    ready.set()
+    release.wait(10)
+
+
+def run(target, *args):
+    process = fork.Process(target=target, args=args)
+    process.start()
+    return process
+
+
+def test_exited_workers_are_folded_into_base(tmp_path):
+    for scores in ([10.0, 20.0], [30.0]):
+        process = run(add_and_exit, str(tmp_path), scores)
+        process.join(10)
+        assert process.exitcode == 0
+
+    stats = prs.CohortStats(str(tmp_path))
+    assert counts(stats) == 3
+    assert sorted(os.listdir(tmp_path)) == ['.lock', 'base.json']
+
+
+def test_live_workers_are_merged_but_not_compacted(tmp_path):
+    ready, release = fork.Event(), fork.Event()
+    process = run(add_and_wait, str(tmp_path), [50.0, 60.0], ready, release)
+    try:
+        assert ready.wait(10)
+        assert counts(prs.CohortStats(str(tmp_path))) == 2
+        assert any(name.endswith('.json') and name.startswith('worker-') for name in os.listdir(tmp_path))
+    finally:
+        release.set()
+        process.join(10)
+    assert counts(prs.CohortStats(str(tmp_path))) == 2
+    assert 'base.json' in os.listdir(tmp_path)
+
+
+def test_reused_pids_neither_overwrite_nor_pin_old_snapshots(tmp_path):
+    # Left behind by a previous container run: one file under our own PID, one
+    # under PID 1 (alive, but an unrelated process), both in the old naming scheme
+    snapshot = prs.DomainDistributions()
+    snapshot.setdefault('1', prs.ScoreDistribution()).add(40.0)
+    for pid in (os.getpid(), 1):
+        with open(tmp_path / f'worker-{pid}.json', 'w') as f:
+            json.dump(snapshot.to_dict(), f)
+
+    stats = prs.CohortStats(str(tmp_path), persist_seconds=3600)
+    stats.add('1', 70.0)
+    stats.sync()
+    assert counts(stats) == 3
+    assert not (tmp_path / f'worker-{os.getpid()}.json').exists()
+    assert not (tmp_path / 'worker-1.json').exists()
+
+
+def test_request_path_does_not_touch_the_directory(tmp_path):
+    stats = prs.CohortStats(str(tmp_path), persist_seconds=3600)
+    stats.add('1', 55.0)
+    before = sorted(os.listdir(tmp_path))
+    for score in range(100):
+        stats.add('1', float(score))
+    assert sorted(os.listdir(tmp_path)) == before
+    assert counts(stats) == 101
+
+
+def record_and_exit(directory, requests):
+    metrics = prs.RequestMetrics(directory, persist_seconds=3600)
+    for _ in range(requests):
+        metrics.record('home', 'GET', 200, 512, 0.002, {'render': 0.001})
+    metrics.persist()
+
+
+def requests_total(metrics):
+    return sum(count for key, count in metrics.collect().counters.items() if key[0] == 'prs_requests_total')
+
+
+def test_metrics_counters_stay_monotonic_across_worker_restarts(tmp_path):
+    metrics = prs.RequestMetrics(str(tmp_path), persist_seconds=3600)
+    seen = []
+    for requests in (3, 4, 5):
+        process = run(record_and_exit, str(tmp_path), requests)
+        process.join(10)
+        seen.append(requests_total(metrics))
+    assert seen == [3, 7, 12]
+
+    # A leftover snapshot under this process's own PID is counted, not overwritten
+    leftover = prs.MetricsShard()
+    leftover.increment(('prs_requests_total', 'home', 'GET', 200))
+    with open(tmp_path / f'worker-{os.getpid()}.json', 'w') as f:
+        json.dump(leftover.to_dict(), f)
+    metrics.record('home', 'GET', 200, 512, 0.002, {})
+    metrics.persist()
+    assert requests_total(metrics) == 14
+    assert 'prs_requests_total{endpoint="home",method="GET",status="200"} 14' in metrics.render_prometheus()
+
+
+def test_exited_threads_fold_into_the_retired_totals():
+    metrics = prs.RequestMetrics('', persist_seconds=3600)
+    for _ in range(20):
+        thread = threading.Thread(target=metrics.record, args=('home', 'GET', 200, 512, 0.002, {}))
+        thread.start()
+        thread.join()
+    metrics.record('about', 'GET', 200, 256, 0.001, {})
+    assert len(metrics._shards) == 1
+    assert requests_total(metrics) == 21
+    histogram = metrics.collect().histograms[('prs_request_duration_seconds', 'home')]
+    assert sum(histogram[:-1]) == 20
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+import app as prs
+
+RECORD = {'dsa_level': 6, 'problem_count': 150, 'project_count': 2, 'github_quality': 5, 'domain_focus': '2',
+          'overall_score': 0.0, 'prediction': 0}
+
+
+def test_export_and_update_scores_round_trip(tmp_path):
+    store = prs.AssessmentStore(str(tmp_path / 'assessments.sqlite3'))
+    ids = [store.save(dict(RECORD, dsa_level=level)) for level in range(1, 6)]
+    arrays, count = prs.export_store_arrays(store, str(tmp_path))
+    assert count == 5
+    assert arrays['inputs'][:, 0].tolist() == [1, 2, 3, 4, 5]
+
+    rows = arrays['inputs'][:count]
+    arrays['scores'][:] = prs.calculate_overall_scores(rows[:, 0], rows[:, 1], rows[:, 2], rows[:, 3])
+    arrays['predictions'][:] = prs.predictor.predict_batch(rows)
+    assert prs.write_back_scores(store, arrays, count) == 5
+    for index, assessment_id in enumerate(ids):
+        record = store.get(assessment_id)
+        assert record['overall_score'] == arrays['scores'][index]
+        assert record['prediction'] == arrays['predictions'][index]
+
+
+def test_export_rows_of_an_empty_store(tmp_path):
+    count, chunks = prs.AssessmentStore(str(tmp_path / 'assessments.sqlite3')).export_rows()
+    assert count == 0 and list(chunks) == []
+
+
+def test_rescore_in_another_worker_invalidates_the_cache(tmp_path):
+    path = str(tmp_path / 'assessments.sqlite3')
+    rescorer, worker = prs.AssessmentStore(path), prs.AssessmentStore(path)
+    assessment_id = rescorer.save(RECORD)
+    assert worker.get(assessment_id)['overall_score'] == 0.0
+    assert worker.get(assessment_id)['overall_score'] == 0.0
+    rowid = worker._connection().execute('SELECT rowid FROM assessments WHERE id = ?', (assessment_id,)).fetchone()[0]
+    rescorer.update_scores([(81.5, 1, rowid)])
+    record = worker.get(assessment_id)
+    assert record['overall_score'] == 81.5 and record['prediction'] == 1